@@ -1,28 +1,17 @@
 """
 Analyze summons results and show status breakdowns
 """
-import pandas as pd
 from datetime import datetime
 import sys
 
-def parse_balance(val):
-    """Convert balance string to float"""
-    if pd.isna(val) or val == '' or val == '0.00':
-        return 0.0
-    val_str = str(val).replace('$', '').replace(',', '').strip()
-    try:
-        return float(val_str)
-    except:
-        return 0.0
+from summons_record import as_record, load_records, records_frame
 
-def analyze_results(excel_file):
-    """Analyze the results file and show detailed breakdown"""
+def analyze_results(excel_file, results=None):
+    """Analyze the results file (or already-loaded results) and show detailed breakdown"""
 
-    df = pd.read_excel(excel_file)
-
-    # Parse dates and balances
-    df['hearing_date_parsed'] = pd.to_datetime(df['hearing_date'], errors='coerce', format='%m/%d/%Y')
-    df['balance_numeric'] = df['balance_due'].apply(parse_balance)
+    # Dates and balances come back already parsed (hearing_date_parsed, balance_numeric)
+    records = [as_record(r) for r in results] if results is not None else load_records(excel_file)
+    df = records_frame(records)
 
     today = datetime.now()
     past_hearings = df[df['hearing_date_parsed'] < today].copy()
@@ -142,23 +131,23 @@ def analyze_results(excel_file):
     print('=' * 100)
 
 if __name__ == '__main__':
-    # Find the most recent results file
-    import glob
-    import os
-
-    # Go up one directory if we're in AI_Code
-    if os.path.basename(os.getcwd()) == 'AI_Code':
-        os.chdir('..')
-
-    results_files = glob.glob('summons_results_v2_*.xlsx')
-
-    if not results_files:
-        print('ERROR: No results files found!')
-        print('Looking for: summons_results_v2_*.xlsx')
+    from history_store import as_of_arg, load_latest
+
+    # A results file given on the command line, else the latest state of every summons from the
+    # lookup history (a run's export only holds what changed); --as-of 2026-01-31 for an earlier date
+    files = [arg for arg in sys.argv[1:] if arg.endswith(('.xlsx', '.json'))]
+    if files:
+        print(f'\nUsing results file: {files[0]}\n')
+        analyze_results(files[0])
+        sys.exit(0)
+
+    as_of = as_of_arg(sys.argv[sys.argv.index('--as-of') + 1]) if '--as-of' in sys.argv else None
+    latest = load_latest(as_of)
+    if not latest:
+        print('ERROR: The lookup history is empty!')
+        print('Run a lookup, or backfill it: python history_store.py import "../summons_results_v2_*.xlsx"')
         sys.exit(1)
 
-    # Use the most recent file
-    latest_file = max(results_files, key=os.path.getctime)
-
-    print(f'\nFound results file: {latest_file}\n')
-    analyze_results(latest_file)
+    source = f'lookup history (as of {as_of:%Y-%m-%d %H:%M})' if as_of else 'lookup history'
+    print(f'\nUsing {source}: {len(latest)} summons\n')
+    analyze_results(source, latest)
@@ -0,0 +1,162 @@
+"""
+Async batch lookup for NYC DOT summons
+Runs several ticket finder requests at once behind a global adaptive rate limit,
+reusing SummonsLookup.lookup_summons / parse_response for each summons
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from rate_control import AdaptiveRateController
+from retry import CircuitBreaker, RetryPolicy, is_retryable
+from summons_lookup import SummonsLookup, read_summons_from_excel
+
+
+class AsyncSummonsLookup:
+    def __init__(self, concurrency=4, rps=1.0, retry_policy=None):
+        """
+        Args:
+            concurrency: Maximum number of requests in flight at once
+            rps: Global request rate ceiling (requests per second, 0 = unlimited);
+                the controller backs off below it when the server struggles
+            retry_policy: Optional retry.RetryPolicy for transient failures
+        """
+        self.concurrency = max(1, int(concurrency))
+        self.rps = rps
+        min_delay = 1.0 / rps if rps and rps > 0 else 0.0
+        self.controller = AdaptiveRateController(initial_delay=min_delay, min_delay=min_delay)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = CircuitBreaker()
+        # requests.Session is not thread-safe, so each worker thread gets its own
+        self._local = threading.local()
+
+    def _lookup(self):
+        if not hasattr(self._local, 'lookup'):
+            self._local.lookup = SummonsLookup()
+        return self._local.lookup
+
+    def _lookup_summons(self, summons_number):
+        return self._lookup().lookup_summons(summons_number)
+
+    async def _attempt(self, summons, executor):
+        """One paced request, honouring the circuit breaker"""
+        while True:
+            pause, trial = self.breaker.reserve()
+            if pause <= 0:
+                break
+            await asyncio.sleep(pause)
+        pause = self.controller.reserve()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        result = await loop.run_in_executor(executor, self._lookup_summons, summons)
+        self.controller.record_result(result, time.perf_counter() - start)
+        return result, trial
+
+    async def _lookup_one(self, idx, summons, total, executor, semaphore):
+        async with semaphore:
+            for attempt in range(1, self.retry_policy.max_attempts + 1):
+                result, trial = await self._attempt(summons, executor)
+                if not is_retryable(result):
+                    if result.get('status') != 'ERROR':
+                        self.breaker.record_success()
+                    else:
+                        self.breaker.end_trial(trial)
+                    break
+                self.breaker.record_failure(trial)
+                if attempt < self.retry_policy.max_attempts:
+                    await asyncio.sleep(self.retry_policy.backoff(attempt))
+            if attempt > 1:
+                result['attempts'] = attempt
+
+        print(f"[{idx}/{total}] {summons}: {result.get('status')}")
+        return result
+
+    async def lookup_batch_async(self, summons_list):
+        """Look up all summons concurrently; results keep the input order"""
+        total = len(summons_list)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            tasks = [
+                self._lookup_one(idx, summons, total, executor, semaphore)
+                for idx, summons in enumerate(summons_list, 1)
+            ]
+            results = list(await asyncio.gather(*tasks))
+
+            # Summons that still failed transiently get one more round at the end
+            failed = [i for i, r in enumerate(results) if is_retryable(r)]
+            if failed:
+                print(f"\nRequeueing {len(failed)} failed summons...")
+                retried = await asyncio.gather(*[
+                    self._lookup_one(i + 1, results[i]['summons_number'], total, executor, semaphore)
+                    for i in failed
+                ])
+                for i, result in zip(failed, retried):
+                    result['requeued'] = True
+                    results[i] = result
+
+        print(self.controller.summary())
+        return results
+
+    def lookup_batch(self, summons_list):
+        """Synchronous entry point, same return value as SummonsLookup.lookup_batch"""
+        return list(asyncio.run(self.lookup_batch_async(summons_list)))
+
+    def save_results(self, results, output_file='summons_results.xlsx'):
+        return self._lookup().save_results(results, output_file)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Async NYC DOT summons lookup")
+    parser.add_argument("--excel", default="ML TRACKING.xlsx", help="Excel file with summons numbers")
+    parser.add_argument("--column", help="Column containing summons numbers (auto-detected if omitted)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once")
+    parser.add_argument("--rps", type=float, default=1.0, help="Global request rate ceiling (0 = unlimited)")
+    parser.add_argument("--output", help="Output Excel file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("NYC DOT Summons Lookup (async)")
+    print("=" * 50)
+
+    if not os.path.exists(args.excel):
+        print(f"Excel file '{args.excel}' not found.")
+        return
+
+    summons_list = read_summons_from_excel(args.excel, column_name=args.column)
+    if not summons_list:
+        print("No summons numbers provided")
+        return
+
+    print(f"\nLooking up {len(summons_list)} summons "
+          f"(concurrency={args.concurrency}, rps={args.rps})...\n")
+
+    lookup = AsyncSummonsLookup(concurrency=args.concurrency, rps=args.rps)
+    start = datetime.now()
+    results = lookup.lookup_batch(summons_list)
+    elapsed = (datetime.now() - start).total_seconds()
+
+    output_file = args.output or f"summons_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    lookup.save_results(results, output_file)
+
+    print("\n" + "=" * 50)
+    print("SUMMARY")
+    print("=" * 50)
+    print(f"Total processed: {len(results)} in {elapsed:.1f}s")
+    print(f"Successful: {sum(1 for r in results if r.get('status') == 'SUCCESS')}")
+    print(f"Not found: {sum(1 for r in results if r.get('status') == 'NOT_FOUND')}")
+    print(f"Errors: {sum(1 for r in results if r.get('status') == 'ERROR')}")
+
+
+if __name__ == "__main__":
+    main()
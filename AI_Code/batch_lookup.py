@@ -8,26 +8,29 @@ import pandas as pd
 import time
 from datetime import datetime
 import json
+from rate_control import AdaptiveRateController, looks_blocked
+from site_config import SEARCH_HOME_URL, SEARCH_URL
+from tracking_sheet import read_summons
 
 # Read summons from Excel - Column B (index 1), starting from row 5 (index 4)
 print("Reading summons from ML TRACKING.xlsx...")
-df = pd.read_excel('ML TRACKING.xlsx', header=None)
-summons_list = df.iloc[4:, 1].dropna().astype(str).tolist()
+summons_list = read_summons('ML TRACKING.xlsx')
 
 print(f"Found {len(summons_list)} summons to process")
 print(f"First few: {summons_list[:5]}")
 print(f"Last few: {summons_list[-5:]}")
 
 # Setup
-url = 'https://a820-ecbticketfinder.nyc.gov/getViolationbyID.action'
+url = SEARCH_URL
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-    'Referer': 'https://a820-ecbticketfinder.nyc.gov/searchHome.action',
+    'Referer': SEARCH_HOME_URL,
     'Content-Type': 'application/x-www-form-urlencoded'
 }
 
 results = []
 total = len(summons_list)
+controller = AdaptiveRateController(initial_delay=1.5)  # Adapts to how the server is coping
 
 print(f"\nStarting lookup of {total} summons...")
 print("=" * 60)
@@ -41,8 +44,12 @@ for idx, summons in enumerate(summons_list, 1):
 
     print(f"[{idx}/{total}] Processing: {summons}", end='')
 
+    controller.wait()
+    start = time.perf_counter()
     try:
         response = requests.post(url, data=data, headers=headers, timeout=30)
+        throttled = response.status_code == 429 or response.status_code >= 500 or looks_blocked(response.text)
+        controller.record(time.perf_counter() - start, ok=response.status_code == 200, throttled=throttled)
         soup = BeautifulSoup(response.text, 'html.parser')
 
         result = {
@@ -79,6 +86,7 @@ for idx, summons in enumerate(summons_list, 1):
         results.append(result)
 
     except Exception as e:
+        controller.record(time.perf_counter() - start, ok=False, throttled=True)
         print(f" - ERROR: {str(e)}")
         results.append({
             'summons_number': summons,
@@ -87,9 +95,7 @@ for idx, summons in enumerate(summons_list, 1):
             'error': str(e)
         })
 
-    # Rate limiting - be nice to the server
-    if idx < total:
-        time.sleep(1.5)
+print(controller.summary())
 
 # Save results
 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -0,0 +1,403 @@
+"""
+Lookup throughput benchmark across all engines
+Runs each engine against the local stand-in ticket finder (mock_ticketfinder.py)
+with simulated latency, prints a comparison table, writes it as JSON and appends
+it to benchmarks/history.jsonl so regressions show up against earlier runs
+
+    python benchmark.py --count 20 --latency 0.2
+    python benchmark.py --engines http async parse
+
+The parse path times the HTML parsers alone on the fixture pages; every other
+engine is measured end to end (request, wait, parse). Each engine runs in its
+own worker process so its CPU time and peak memory are its own
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from mock_ticketfinder import FIXTURES_DIR, MockSettings, start_mock_server
+
+
+AI_CODE_DIR = Path(__file__).resolve().parent
+HISTORY_PATH = AI_CODE_DIR / "benchmarks" / "history.jsonl"
+
+ENGINES = ['parse', 'http', 'async', 'hybrid', 'batch_lookup', 'selenium', 'selenium_v2', 'run_NOW']
+REGRESSION_THRESHOLD = 0.2  # Flag >20% worse throughput or p95 than the last comparable run
+WORKER_MARKER = 'BENCHMARK_ROWS '  # Prefix of the worker's result line on stdout
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None if empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def peak_rss_mb(children=False):
+    """
+    Peak resident memory of this process (or its largest finished child), None where unsupported
+
+    This is a lifetime peak, which is why every engine runs in a fresh worker process
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def child_cpu_seconds():
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def summarize(engine, path, results, seconds, latencies, cpu, rss):
+    """One row of the comparison table"""
+    # Engines name their statuses differently; anything but an error or unknown page counts
+    ok = sum(1 for r in results if r.get('status') not in ('ERROR', 'UNKNOWN', None))
+    return {
+        'engine': engine,
+        'path': path,
+        'count': len(results),
+        'ok': ok,
+        'errors': len(results) - ok,
+        'seconds': round(seconds, 3),
+        'per_minute': round(len(results) / seconds * 60, 1) if seconds else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        'cpu_s': round(cpu, 3) if cpu is not None else None,
+        'peak_rss_mb': round(rss) if rss is not None else None,
+    }
+
+
+def run_sequential(engine, lookup_fn, summons_list, extra_rss=None):
+    """Time an engine that looks up one summons per call"""
+    results, latencies = [], []
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for summons in summons_list:
+            t0 = time.perf_counter()
+            results.append(lookup_fn(summons))
+            latencies.append(time.perf_counter() - t0)
+    seconds = time.perf_counter() - start
+    rss = peak_rss_mb()
+    if extra_rss is not None:
+        rss = (rss or 0) + (extra_rss() or 0)
+    return summarize(engine, 'end_to_end', results, seconds, latencies, time.process_time() - cpu_start, rss)
+
+
+def bench_parse(iterations=200):
+    """
+    Parse-only path: time each parser backend on every result fixture
+
+    The lxml rows also count pages where its result differs from BeautifulSoup's
+    """
+    from result_parser import lxml_html, parse_result_html
+
+    pages = [p.read_text(encoding='utf-8').replace('{{summons}}', '0703792522')
+             for p in sorted(FIXTURES_DIR.glob('found*.html')) + [FIXTURES_DIR / 'not_found.html']]
+    backends = ['bs4'] + (['lxml'] if lxml_html is not None else [])
+
+    rows, reference = [], None
+    for backend in backends:
+        results, latencies = [], []
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for html in pages:
+                t0 = time.perf_counter()
+                results.append(parse_result_html(html, '0703792522', backend))
+                latencies.append(time.perf_counter() - t0)
+        row = summarize(f'parse_{backend}', 'parse', results, time.perf_counter() - start,
+                        latencies, time.process_time() - cpu_start, peak_rss_mb())
+
+        comparable = [{k: v for k, v in r.items() if k != 'timestamp'} for r in results[:len(pages)]]
+        if reference is None:
+            reference = comparable
+        else:
+            row['mismatches'] = sum(1 for a, b in zip(reference, comparable) if a != b)
+        rows.append(row)
+    return rows
+
+
+def bench_http(summons_list):
+    from summons_lookup import SummonsLookup
+    return run_sequential('http', SummonsLookup().lookup_summons, summons_list)
+
+
+def bench_hybrid(summons_list):
+    from hybrid_lookup import HybridLookup
+    lookup = HybridLookup()
+    try:
+        return run_sequential('hybrid', lookup.lookup_summons, summons_list)
+    finally:
+        lookup.close()
+
+
+def bench_async(summons_list, concurrency=4):
+    from async_lookup import AsyncSummonsLookup
+
+    lookup = AsyncSummonsLookup(concurrency=concurrency, rps=0)
+
+    # Time every request as it runs on the executor threads
+    latencies = []
+    lookup_summons = lookup._lookup_summons
+
+    def timed(summons):
+        t0 = time.perf_counter()
+        try:
+            return lookup_summons(summons)
+        finally:
+            latencies.append(time.perf_counter() - t0)
+
+    lookup._lookup_summons = timed
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = lookup.lookup_batch(summons_list)
+    return summarize('async', 'end_to_end', results, time.perf_counter() - start, latencies,
+                     time.process_time() - cpu_start, peak_rss_mb())
+
+
+def bench_selenium(engine, summons_list):
+    from driver_health import browser_rss_mb
+    if engine == 'selenium':
+        from summons_selenium import SummonsSeleniumLookup
+    else:
+        from summons_selenium_v2 import SummonsSeleniumLookup
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        lookup = SummonsSeleniumLookup(headless=True)
+    try:
+        return run_sequential(engine, lookup.lookup_summons, summons_list,
+                              extra_rss=lambda: browser_rss_mb(lookup.driver))
+    finally:
+        lookup.close()
+
+
+def write_tracking_sheet(path, summons_list):
+    """
+    Minimal ML TRACKING.xlsx layout: summons in column B from row 5
+    (the scripts' tracking_sheet reader dedupes, so they look up repeated numbers once)
+    """
+    import pandas as pd
+    rows = [[None, None]] * 4 + [[None, s] for s in summons_list]
+    pd.DataFrame(rows).to_excel(path, header=False, index=False)
+
+
+def bench_script(engine, script, args, summons_list, base_url, workdir):
+    """Run a top-level script as a subprocess against the stand-in (it reads its own sheet)"""
+    run_dir = Path(workdir) / engine
+    run_dir.mkdir(parents=True, exist_ok=True)
+    # batch_lookup.py reads ./ML TRACKING.xlsx, run_NOW.py reads ../ML TRACKING.xlsx
+    write_tracking_sheet(run_dir / 'ML TRACKING.xlsx', summons_list)
+    write_tracking_sheet(Path(workdir) / 'ML TRACKING.xlsx', summons_list)
+
+    env = dict(os.environ, TICKETFINDER_BASE_URL=base_url, SUMMONS_CACHE_DIR=str(run_dir / 'cache'),
+               PYTHONPATH=str(AI_CODE_DIR) + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    cpu_start = child_cpu_seconds()
+    started = time.time()
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, str(AI_CODE_DIR / script)] + args, cwd=run_dir, env=env,
+                          capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    cpu = child_cpu_seconds() - cpu_start if cpu_start is not None else None
+
+    # run_NOW.py writes its results one level up, like it does from AI_Code
+    results = []
+    outputs = list(run_dir.glob('summons_results*.json')) + list(Path(workdir).glob('summons_results*.json'))
+    for output in outputs:
+        if output.stat().st_mtime >= started:
+            with open(output, 'r') as f:
+                results = json.load(f)
+    if proc.returncode != 0 or not results:
+        return {'engine': engine, 'path': 'end_to_end', 'error': (proc.stderr or proc.stdout)[-300:]}
+
+    latencies = [r['page_ready_ms'] / 1000 for r in results if 'page_ready_ms' in r]
+    return summarize(engine, 'end_to_end', results, seconds, latencies, cpu, peak_rss_mb(children=True))
+
+
+def run_engine(engine, summons_list, base_url, workdir, parse_iterations=200):
+    """Rows for one engine, measured in this process (see run_isolated)"""
+    if engine == 'parse':
+        return bench_parse(parse_iterations)
+    if engine == 'http':
+        return [bench_http(summons_list)]
+    if engine == 'async':
+        return [bench_async(summons_list)]
+    if engine == 'hybrid':
+        return [bench_hybrid(summons_list)]
+    if engine in ('selenium', 'selenium_v2'):
+        return [bench_selenium(engine, summons_list)]
+    if engine == 'batch_lookup':
+        return [bench_script(engine, 'batch_lookup.py', [], summons_list, base_url, workdir)]
+    return [bench_script(engine, 'run_NOW.py', ['--force'], summons_list, base_url, workdir)]
+
+
+def run_isolated(engine, summons_list, base_url, workdir, parse_iterations=200):
+    """Run one engine in a fresh worker process so peak memory and CPU are not shared with others"""
+    summons_file = Path(workdir) / f'{engine}_summons.json'
+    summons_file.write_text(json.dumps(summons_list), encoding='utf-8')
+    env = dict(os.environ, TICKETFINDER_BASE_URL=base_url)
+    proc = subprocess.run([sys.executable, str(Path(__file__).resolve()), '--worker', engine,
+                           '--summons-file', str(summons_file), '--workdir', str(workdir),
+                           '--parse-iterations', str(parse_iterations)],
+                          cwd=AI_CODE_DIR, env=env, capture_output=True, text=True)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(WORKER_MARKER):
+            return json.loads(line[len(WORKER_MARKER):])
+    return [{'engine': engine, 'path': 'end_to_end', 'error': (proc.stderr or proc.stdout or 'worker failed')[-300:]}]
+
+
+def worker_main(args):
+    """--worker: measure one engine and print its rows for run_isolated()"""
+    summons_list = json.loads(Path(args.summons_file).read_text(encoding='utf-8'))
+    try:
+        rows = run_engine(args.worker, summons_list, os.environ['TICKETFINDER_BASE_URL'], args.workdir,
+                          args.parse_iterations)
+    except Exception as e:
+        rows = [{'engine': args.worker, 'path': 'end_to_end', 'error': str(e)[:300]}]
+    print(WORKER_MARKER + json.dumps(rows), flush=True)
+
+
+def run_benchmarks(engines, count=20, latency=0.2, jitter=0.0, parse_iterations=200):
+    settings = MockSettings(latency=latency, jitter=jitter, default_page='found', seed=1)
+    server, base_url = start_mock_server(settings)
+    os.environ['TICKETFINDER_BASE_URL'] = base_url
+
+    # Mix of single-charge, multi-charge and not-found pages
+    fixed = list(settings.summons_pages)
+    summons_list = [fixed[i % 3] if i % 5 == 0 else f'071{i:07d}' for i in range(count)]
+    for number, page in settings.summons_pages.items():
+        if page == 'not_found':
+            summons_list[1::7] = [number] * len(summons_list[1::7])
+
+    rows = []
+    workdir = tempfile.mkdtemp(prefix='summons_bench_')
+    try:
+        for engine in engines:
+            print(f"Running {engine}...", flush=True)
+            rows.extend(run_isolated(engine, summons_list, base_url, workdir, parse_iterations))
+    finally:
+        server.shutdown()
+
+    return {
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'settings': {'count': count, 'latency': latency, 'jitter': jitter},
+        'python': sys.version.split()[0],
+        'mock_stats': settings.stats,
+        'rows': rows,
+    }
+
+
+def format_table(report):
+    columns = [('engine', 14), ('path', 10), ('count', 6), ('errors', 6), ('per_minute', 10),
+               ('p50_ms', 9), ('p95_ms', 9), ('cpu_s', 7), ('peak_rss_mb', 11)]
+    lines = ["  ".join(name.ljust(width) for name, width in columns)]
+    lines.append("-" * len(lines[0]))
+    for row in report['rows']:
+        if 'error' in row:
+            lines.append(f"{row['engine'].ljust(14)}  unavailable: {row['error'].strip().splitlines()[-1][:80]}")
+            continue
+        lines.append("  ".join(str(row.get(name) if row.get(name) is not None else '-').ljust(width)
+                               for name, width in columns))
+        if row.get('mismatches'):
+            lines.append(f"{''.ljust(14)}  [WARNING] {row['mismatches']} page(s) parsed differently from bs4")
+    return "\n".join(lines)
+
+
+def load_history(path=HISTORY_PATH):
+    if not Path(path).exists():
+        return []
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_regressions(report, history):
+    """Rows that are clearly worse than the last run with the same settings"""
+    previous = next((h for h in reversed(history) if h.get('settings') == report['settings']), None)
+    if previous is None:
+        return []
+
+    before = {(r['engine'], r['path']): r for r in previous['rows'] if 'error' not in r}
+    warnings = []
+    for row in report['rows']:
+        old = before.get((row['engine'], row.get('path')))
+        if old is None or 'error' in row:
+            continue
+        if old.get('per_minute') and row.get('per_minute') and \
+                row['per_minute'] < old['per_minute'] * (1 - REGRESSION_THRESHOLD):
+            warnings.append(f"{row['engine']}: {row['per_minute']}/min vs {old['per_minute']}/min on {previous['timestamp']}")
+        if old.get('p95_ms') and row.get('p95_ms') and row['p95_ms'] > old['p95_ms'] * (1 + REGRESSION_THRESHOLD):
+            warnings.append(f"{row['engine']}: p95 {row['p95_ms']}ms vs {old['p95_ms']}ms on {previous['timestamp']}")
+    return warnings
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare lookup engines against the local stand-in ticket finder")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES, help="Engines to run")
+    parser.add_argument("--count", type=int, default=20, help="Summons per end-to-end engine")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated server latency (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency up to this many seconds")
+    parser.add_argument("--parse-iterations", type=int, default=200, help="Passes over the fixture pages for the parse rows")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    parser.add_argument("--no-history", action="store_true", help="Do not append this run to benchmarks/history.jsonl")
+    # Internal: one engine per worker process (see run_isolated)
+    parser.add_argument("--worker", choices=ENGINES, help=argparse.SUPPRESS)
+    parser.add_argument("--summons-file", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.worker:
+        worker_main(args)
+        return
+
+    print("NYC DOT Summons Lookup Benchmark", flush=True)
+    print("=" * 60)
+    report = run_benchmarks(args.engines, count=args.count, latency=args.latency, jitter=args.jitter,
+                            parse_iterations=args.parse_iterations)
+
+    print("\n" + format_table(report))
+
+    history = load_history()
+    regressions = find_regressions(report, history)
+    if regressions:
+        print("\n[WARNING] Slower than the last comparable run:")
+        for warning in regressions:
+            print(f"  {warning}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[OK] Report saved to: {args.json}")
+
+    if not args.no_history:
+        HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(HISTORY_PATH, 'a') as f:
+            f.write(json.dumps(report) + "\n")
+        print(f"[OK] Appended to {HISTORY_PATH.relative_to(AI_CODE_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Change detection - what moved since the last lookup of each summons
+Every fresh result is compared with the previous snapshot of the same summons
+in the lookup history, field by field via hashes, so a run reports (and
+stores) only the deltas: new summons, changed fields (old -> new) and
+summons that are no longer on the sheet
+
+    python change_detect.py ../summons_results_v2_20260201_090000.xlsx
+    python change_detect.py new.json --against old.xlsx --json changes.json
+"""
+
+import argparse
+import hashlib
+import json
+from datetime import datetime, timedelta
+
+from history_store import SKIP_KEYS, HistoryStore
+from scheduler import load_results_file
+from tracking_sheet import summons_key
+from summons_record import as_record, as_result, load_records
+
+
+# Fetch time changes on every lookup without the summons changing
+IGNORED_KEYS = SKIP_KEYS + ('timestamp',)
+
+# Shown first in the report - the ones that usually need action
+KEY_FIELDS = ('status', 'hearing_date', 'hearing_result', 'balance_due', 'status_of_summons_notice')
+
+
+def field_hashes(result):
+    """{field: hash of its value} for the fields that describe the summons (blank fields left out)"""
+    hashes = {}
+    for key, value in as_result(result).items():
+        text = '' if value is None else str(value).strip()
+        if key in IGNORED_KEYS or not text:
+            continue
+        hashes[key] = hashlib.sha1(text.encode('utf-8')).hexdigest()
+    return hashes
+
+
+def record_digest(hashes):
+    """One hash for the whole record, so unchanged summons are skipped without a field diff"""
+    joined = '\n'.join(f'{key}={value}' for key, value in sorted(hashes.items()))
+    return hashlib.sha1(joined.encode('utf-8')).hexdigest()
+
+
+def detect_changes(previous, results, summons_list=None):
+    """
+    Compare fresh results with the previous state of each summons
+
+    Args:
+        previous: Last known results (e.g. HistoryStore.latest())
+        results: This run's results; cached, carried-forward and errored
+            ones were not looked up and count as unchecked
+        summons_list: Every summons on the tracking sheet; previous summons
+            missing from it are reported as gone. Without it (a results file
+            may hold only what changed) nothing is reported as gone
+
+    Returns:
+        {'new': [results], 'changed': [{'summons_number', 'fields': {field: [old, new]}, 'result'}],
+         'disappeared': [previous results], 'unchanged': n, 'unchecked': n}
+    """
+    before = {summons_key(r['summons_number']): r for r in map(as_result, previous) if r.get('summons_number')}
+    report = {'new': [], 'changed': [], 'disappeared': [], 'unchanged': 0, 'unchecked': 0}
+    seen = set()
+
+    for result in results:
+        state = as_record(result).state()
+        result = as_result(result)
+        key = summons_key(result.get('summons_number', ''))
+        seen.add(key)
+        if result.get('from_cache') or state == 'error':
+            report['unchecked'] += 1
+            continue
+
+        old = before.get(key)
+        if old is None:
+            report['new'].append(result)
+            continue
+
+        new_hashes, old_hashes = field_hashes(result), field_hashes(old)
+        if record_digest(new_hashes) == record_digest(old_hashes):
+            report['unchanged'] += 1
+            continue
+
+        fields = {}
+        order = lambda f: KEY_FIELDS.index(f) if f in KEY_FIELDS else len(KEY_FIELDS)
+        for field in sorted(sorted(new_hashes.keys() | old_hashes.keys()), key=order):
+            if new_hashes.get(field) != old_hashes.get(field):
+                fields[field] = [old.get(field), result.get(field)]
+        report['changed'].append({'summons_number': result['summons_number'], 'fields': fields, 'result': result})
+
+    if summons_list is not None:
+        on_sheet = {summons_key(summons) for summons in summons_list} | seen
+        report['disappeared'] = [old for key, old in before.items() if key not in on_sheet]
+    return report
+
+
+def changed_results(report):
+    """The results worth writing downstream: new and changed summons only"""
+    return report['new'] + [change['result'] for change in report['changed']]
+
+
+def has_changes(report):
+    return bool(report['new'] or report['changed'] or report['disappeared'])
+
+
+def print_changes(report):
+    """Compact delta report - nothing is printed for unchanged summons"""
+    print(f"\nChanges since last lookup: {len(report['new'])} new, {len(report['changed'])} changed, "
+          f"{len(report['disappeared'])} gone ({report['unchanged']} unchanged, {report['unchecked']} not checked)")
+    for result in report['new']:
+        print(f"  [NEW]     {result['summons_number']}  {result.get('status', '-')}  "
+              f"hearing {result.get('hearing_date', '-')}  balance {result.get('balance_due', '-')}")
+    for change in report['changed']:
+        fields = '; '.join(f"{field}: {old if old is not None else '-'} -> {new if new is not None else '-'}"
+                           for field, (old, new) in change['fields'].items())
+        print(f"  [CHANGED] {change['summons_number']}  {fields}")
+    for old in report['disappeared']:
+        print(f"  [GONE]    {old['summons_number']}  (last looked up {old.get('timestamp', '-')})")
+
+
+def save_changes(report, path):
+    """Write the deltas as JSON (changes without the full results, to keep it small)"""
+    data = {
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'new': report['new'],
+        'changed': [{'summons_number': c['summons_number'], 'fields': c['fields']} for c in report['changed']],
+        'disappeared': [old['summons_number'] for old in report['disappeared']],
+        'unchanged': report['unchanged'],
+        'unchecked': report['unchecked'],
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Show what changed in a results file since the previous lookup")
+    parser.add_argument("results", help="summons_results_v2_*.xlsx/.json to check")
+    parser.add_argument("--against", help="Compare with this results file instead of the lookup history")
+    parser.add_argument("--json", help="Also write the deltas to this JSON file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = load_records(args.results)
+
+    if args.against:
+        previous = load_results_file(args.against)
+    else:
+        # The file may already be in the history - compare with what was known before it
+        fetched = [r.fetched_at for r in results if r.fetched_at and not r.get('from_cache')]
+        as_of = min(fetched) - timedelta(seconds=1) if fetched else None
+        store = HistoryStore()
+        try:
+            previous = store.latest(as_of=as_of)
+        finally:
+            store.close()
+
+    report = detect_changes(previous, results)
+    print_changes(report)
+    if args.json:
+        save_changes(report, args.json)
+        print(f"\nJSON: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
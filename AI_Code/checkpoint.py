@@ -0,0 +1,148 @@
+"""
+Crash-safe run journal for batch lookups
+Every result is appended to a JSONL file as soon as it is known, so an
+interrupted run can be resumed with --resume instead of starting over
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from site_config import CACHE_DIR
+
+
+DEFAULT_RUNS_DIR = CACHE_DIR / "runs"
+
+
+def summons_list_hash(summons_list):
+    """Fingerprint of the summons list (order included) a run was started for"""
+    return hashlib.sha256("\n".join(map(str, summons_list)).encode("utf-8")).hexdigest()
+
+
+def current_script():
+    """Name of the script running (e.g. 'run_NOW'), so one script never resumes another's journal"""
+    return Path(sys.argv[0]).stem or "interactive"
+
+
+class RunJournal:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.completed = {}
+        self.finished = False
+        self.header = {}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            self._load()
+
+    def _load(self):
+        with self.path.open("r", encoding="utf-8") as f:
+            content = f.read()
+
+        # Last line may be cut off if the process died mid-write; end it so new entries start clean
+        if content and not content.endswith("\n"):
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write("\n")
+
+        for line in content.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("type") == "result":
+                result = entry["result"]
+                if result.get("status") == "ERROR":
+                    self.completed.pop(result["summons_number"], None)
+                else:
+                    self.completed[result["summons_number"]] = result
+            elif entry.get("type") == "start":
+                self.header = entry
+            elif entry.get("type") == "done":
+                self.finished = True
+
+    def _append(self, entry):
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    @classmethod
+    def start(cls, summons_list, runs_dir=DEFAULT_RUNS_DIR, script=None):
+        """Begin a new journal for this run"""
+        runs_dir = Path(runs_dir)
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        journal = cls(runs_dir / f"run_{timestamp}.jsonl")
+        journal.header = {"type": "start", "started": timestamp, "total": len(summons_list),
+                          "script": script or current_script(), "summons_hash": summons_list_hash(summons_list)}
+        journal._append(journal.header)
+        return journal
+
+    def matches(self, summons_list, script=None):
+        """True if this journal was started by the same script for the same summons list"""
+        return (self.header.get("script") == (script or current_script()) and
+                self.header.get("summons_hash") == summons_list_hash(summons_list))
+
+    @classmethod
+    def latest_unfinished(cls, summons_list, runs_dir=DEFAULT_RUNS_DIR, script=None):
+        """Most recent unfinished journal of this script and summons list, or None"""
+        runs_dir = Path(runs_dir)
+        for path in sorted(runs_dir.glob("run_*.jsonl"), reverse=True):
+            journal = cls(path)
+            if not journal.finished and journal.matches(summons_list, script):
+                return journal
+        return None
+
+    @classmethod
+    def resume_or_start(cls, summons_list, resume=False, runs_dir=DEFAULT_RUNS_DIR, script=None):
+        """Pick up the latest interrupted run of this script/list when resume=True, else start fresh"""
+        if resume:
+            journal = cls.latest_unfinished(summons_list, runs_dir, script)
+            if journal is not None:
+                print(f"Resuming {journal.path.name}: {len(journal.completed)} summons already done")
+                return journal
+            print("No interrupted run of this script for this summons list, starting a new one")
+        return cls.start(summons_list, runs_dir, script)
+
+    def record(self, result):
+        """Append one result; ERROR results are kept but retried on resume"""
+        self._append({"type": "result", "result": result})
+        with self._lock:
+            if result.get("status") == "ERROR":
+                self.completed.pop(result["summons_number"], None)
+            else:
+                self.completed[result["summons_number"]] = result
+
+    def pending(self, summons_list):
+        """Summons from the list that still need a lookup in this run"""
+        return [s for s in summons_list if s not in self.completed]
+
+    def results_for(self, summons_list, fresh=()):
+        """
+        Rebuild results in sheet order from the journal
+
+        Args:
+            fresh: Results from this session, used for summons that only errored
+        """
+        fresh_by_number = {r['summons_number']: r for r in fresh}
+        results = []
+        for idx, summons in enumerate(summons_list, 1):
+            result = dict(self.completed.get(summons) or fresh_by_number.get(summons) or {
+                'summons_number': summons, 'status': 'ERROR', 'error': 'No result recorded'
+            })
+            result['row_number'] = idx + 4
+            results.append(result)
+        return results
+
+    def finish(self):
+        """Mark the run complete so --resume will not pick it up again"""
+        self._append({"type": "done", "finished": datetime.now().strftime('%Y%m%d_%H%M%S')})
+        self.finished = True
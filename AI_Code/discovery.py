@@ -0,0 +1,276 @@
+"""
+Bulk discovery - find every summons for a respondent, permittee or address
+One search returns a paginated list covering dozens of summons, instead of one
+request per number from column B; it also catches summons we never recorded.
+Everything found is upserted into the local results store (result_cache.py)
+
+Experimental: the search field names are not hard-coded but read from the
+live searchHome form at startup; if the form has no field for the search, or
+the site answers with the search page again, it stops with an error instead
+of reporting zero summons
+
+    python discovery.py --permittee 12787
+    python discovery.py --respondent "DEBOE CONSTRUCTION CORP" --excel "ML TRACKING.xlsx"
+"""
+
+import argparse
+import re
+import sys
+import time
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from rate_control import AdaptiveRateController, looks_blocked
+from result_cache import ResultCache
+from result_parser import has_result_sections, parse_result_html
+from session_reuse import SUMMONS_FIELD
+from site_config import SEARCH_HOME_URL
+from summons_lookup import SummonsLookup
+
+
+# search kind -> words that identify its input (name or id) on the live search form
+SEARCH_TYPES = {
+    'respondent': ('respondent',),
+    'permittee': ('permittee', 'permit'),
+    'address': ('address', 'street'),
+}
+
+
+class DiscoveryUnavailable(Exception):
+    """The ticket finder does not offer (or did not accept) this kind of search"""
+
+SUMMONS_RE = re.compile(r'^0?\d{9}$')
+NEXT_LINK_TEXT = ('next', 'next >', 'next >>', '>', '>>', '›', '»')
+
+
+def _key(header):
+    return header.replace(':', '').strip().lower().replace(' ', '_').replace('/', '_')
+
+
+def read_search_forms(html):
+    """
+    Every form on the search page with what a browser would submit
+
+    Returns:
+        [{'action', 'defaults': {name: value}, 'text_fields': [(name, id)], 'choices': {name: [values]}}]
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    forms = []
+    for form in soup.find_all('form'):
+        info = {'action': form.get('action', ''), 'defaults': {}, 'text_fields': [], 'choices': {}}
+        for tag in form.find_all(['input', 'select', 'textarea']):
+            name = tag.get('name')
+            if not name:
+                continue
+            kind = (tag.get('type') or 'text').lower()
+            if tag.name == 'select':
+                option = tag.find('option', selected=True) or tag.find('option')
+                info['defaults'][name] = option.get('value', option.get_text(strip=True)) if option else ''
+                info['choices'][name] = [o.get('value', o.get_text(strip=True)) for o in tag.find_all('option')]
+            elif kind in ('radio', 'checkbox'):
+                info['choices'].setdefault(name, []).append(tag.get('value', 'on'))
+                if tag.has_attr('checked'):
+                    info['defaults'][name] = tag.get('value', 'on')
+            elif kind == 'submit':
+                if 'search' in tag.get('value', '').lower():
+                    info['defaults'][name] = tag.get('value', '')
+            elif kind == 'hidden':
+                info['defaults'][name] = tag.get('value', '')
+            elif kind not in ('button', 'reset', 'image', 'file'):
+                info['text_fields'].append((name, tag.get('id', '')))
+        forms.append(info)
+    return forms
+
+
+def build_search(forms, kind, value):
+    """
+    (action, POST data) for a discovery search, from the live form
+
+    Raises:
+        DiscoveryUnavailable: no form has an input for this kind of search
+    """
+    words = SEARCH_TYPES[kind]
+    matches = lambda text: any(word in str(text).lower() for word in words)
+    for form in forms:
+        field = next((name for name, id_ in form['text_fields'] if matches(name) or matches(id_)), None)
+        if field is None:
+            continue
+        data = dict(form['defaults'])
+        data[field] = str(value).strip()
+        # Search-type selectors (radio buttons / drop-downs) switched to this kind
+        for name, values in form['choices'].items():
+            chosen = next((v for v in values if matches(v)), None)
+            if chosen is not None:
+                data[name] = chosen
+        return form['action'], data
+
+    fields = sorted({name for form in forms for name, _ in form['text_fields']})
+    raise DiscoveryUnavailable(f"The search page has no {kind} field (text fields on the page: "
+                               f"{', '.join(fields) or 'none'})")
+
+
+def parse_list_page(html):
+    """
+    Summons rows from a search result list
+
+    Returns:
+        (rows, next_href) - rows are dicts keyed by the table headers, always
+        with 'summons_number'; next_href is the pagination link or None
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = []
+    for table in soup.find_all('table'):
+        headers = []
+        for tr in table.find_all('tr'):
+            header_cells = tr.find_all('th')
+            if header_cells:
+                headers = [_key(th.get_text(strip=True)) for th in header_cells]
+                continue
+            cells = [td.get_text(strip=True) for td in tr.find_all('td')]
+            number = next((c for c in cells if SUMMONS_RE.match(c)), None)
+            if number is None:
+                continue
+            row = {h: v for h, v in zip(headers, cells) if h and v}
+            row['summons_number'] = number
+            rows.append(row)
+
+    next_href = None
+    for link in soup.find_all('a', href=True):
+        if link.get_text(strip=True).lower() in NEXT_LINK_TEXT:
+            next_href = link['href']
+            break
+    return rows, next_href
+
+
+class DiscoveryLookup:
+    def __init__(self, delay=2, max_pages=50, timeout=30):
+        """
+        Args:
+            delay: Starting seconds between page requests (adapts to server health)
+            max_pages: Stop following pagination after this many pages
+            timeout: Seconds to wait for each response
+        """
+        self.http = SummonsLookup()
+        self.controller = AdaptiveRateController(initial_delay=delay)
+        self.max_pages = max_pages
+        self.timeout = timeout
+
+    def _request(self, method, url, **kwargs):
+        self.controller.wait()
+        start = time.perf_counter()
+        response = self.http.session.request(method, url, timeout=self.timeout, **kwargs)
+        latency = time.perf_counter() - start
+        throttled = response.status_code == 429 or response.status_code >= 500 or looks_blocked(response.text)
+        self.controller.record(latency, ok=response.status_code == 200, throttled=throttled)
+        return response
+
+    def search(self, kind, value):
+        """
+        Run one discovery search and walk its pages
+
+        Returns:
+            (rows, results) - list rows for every summons found, plus full
+            results when the site answered with a single summons detail page
+
+        Raises:
+            DiscoveryUnavailable: the search form has no field for this kind of
+                search, or the site ignored the search and showed the form again
+        """
+        home = self._request('GET', SEARCH_HOME_URL)
+        if home.status_code != 200:
+            raise DiscoveryUnavailable(f"Search page returned HTTP {home.status_code}")
+        action, data = build_search(read_search_forms(home.text), kind, value)
+        response = self._request('POST', urljoin(home.url, action or self.http.search_url), data=data)
+
+        rows, results, seen = [], [], set()
+        visited = set()
+        for page in range(1, self.max_pages + 1):
+            if response.status_code != 200:
+                print(f"[ERROR] HTTP {response.status_code} on page {page}")
+                break
+            if looks_blocked(response.text):
+                print(f"[ERROR] Blocked by server on page {page}")
+                break
+
+            if has_result_sections(response.text):
+                # Only one match - the site went straight to its detail page
+                result = parse_result_html(response.text, None)
+                number = result.get('summons_notice_number', '').split('.')[0]
+                if number:
+                    result['summons_number'] = number
+                    results.append(result)
+                    rows.append({'summons_number': number})
+                break
+
+            page_rows, next_href = parse_list_page(response.text)
+            if page == 1 and not page_rows and f'name="{SUMMONS_FIELD}"' in response.text:
+                raise DiscoveryUnavailable(f"The site answered with the search page again - "
+                                           f"it did not accept the {kind} search")
+            new_rows = [r for r in page_rows if r['summons_number'] not in seen]
+            seen.update(r['summons_number'] for r in new_rows)
+            rows.extend(new_rows)
+            print(f"  page {page}: {len(new_rows)} summons")
+
+            if not next_href or not new_rows:
+                break
+            next_url = urljoin(response.url, next_href)
+            if next_url in visited:
+                break
+            visited.add(next_url)
+            response = self._request('GET', next_url)
+
+        return rows, results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Find all summons for a respondent, permittee or address (experimental)")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--respondent", help="Respondent name as it appears on the summons")
+    group.add_argument("--permittee", help="Permittee number (e.g. 12787)")
+    group.add_argument("--address", help="Inspection address")
+    parser.add_argument("--excel", help="Tracking sheet to compare against (summons in column B from row 5)")
+    parser.add_argument("--max-pages", type=int, default=50, help="Stop after this many result pages")
+    parser.add_argument("--delay", type=float, default=2, help="Starting seconds between page requests")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    kind = next(k for k in SEARCH_TYPES if getattr(args, k))
+    value = getattr(args, kind)
+
+    print("NYC DOT Summons Discovery", flush=True)
+    print("=" * 60)
+    print(f"Searching by {kind}: {value}")
+
+    lookup = DiscoveryLookup(delay=args.delay, max_pages=args.max_pages)
+    try:
+        rows, results = lookup.search(kind, value)
+    except (DiscoveryUnavailable, requests.RequestException) as e:
+        print(f"[ERROR] Discovery search failed: {e}")
+        sys.exit(1)
+    print(f"\nFound {len(rows)} summons")
+    print(lookup.controller.summary())
+
+    cache = ResultCache()
+    try:
+        first_time = cache.record_discovered(rows, f"{kind}={value}")
+        stored = cache.put_many(results)
+    finally:
+        cache.close()
+    print(f"[OK] Stored {len(rows)} discovered summons ({len(first_time)} new), {stored} full result(s)")
+
+    if args.excel:
+        from tracking_sheet import read_summons_from_excel, summons_key
+
+        tracked = {summons_key(s) for s in read_summons_from_excel(args.excel)}
+        untracked = [r['summons_number'] for r in rows if summons_key(r['summons_number']) not in tracked]
+        print(f"\nNot in {args.excel}: {len(untracked)}")
+        for number in untracked:
+            print(f"  {number}")
+
+
+if __name__ == "__main__":
+    main()
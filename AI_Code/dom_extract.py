@@ -0,0 +1,85 @@
+"""
+Single round-trip result extraction for the Selenium engines
+One injected script collects the vioContent / details / infraDetails cell text
+inside the browser and returns it as a small JSON object, instead of hundreds
+of find_element/.text calls or shipping the whole page_source to Python
+"""
+
+from result_parser import NOT_FOUND_MARKER, build_result, has_result_sections
+
+
+# Mirrors result_parser.collect_sections; text() matches BeautifulSoup get_text(strip=True).
+# Works on the live page or on a DOMParser document (see session_reuse.py)
+COLLECT_SECTIONS_FN = """
+function collectSections(doc, marker) {
+    var sections = {not_found: false, case: [], details: [], charges: []};
+    if (doc.documentElement.outerHTML.indexOf(marker) !== -1) {
+        sections.not_found = true;
+        return sections;
+    }
+
+    function text(el) {
+        var parts = [];
+        var walker = doc.createTreeWalker(el, NodeFilter.SHOW_TEXT, null);
+        var node;
+        while ((node = walker.nextNode())) {
+            var t = node.nodeValue.trim();
+            if (t) { parts.push(t); }
+        }
+        return parts.join('');
+    }
+
+    function pairs(table, out) {
+        var rows = table.querySelectorAll('tr');
+        for (var i = 0; i < rows.length; i++) {
+            var cells = rows[i].querySelectorAll('td');
+            if (cells.length >= 2) { out.push([text(cells[0]), text(cells[1])]); }
+        }
+    }
+
+    var caseTable = doc.querySelector('table#vioContent');
+    if (caseTable) { pairs(caseTable, sections.case); }
+
+    var detailTables = doc.querySelectorAll('table#details');
+    for (var d = 0; d < detailTables.length; d++) { pairs(detailTables[d], sections.details); }
+
+    var chargesDiv = doc.querySelector('div#infraDetails');
+    var chargesTable = chargesDiv ? chargesDiv.querySelector('table') : null;
+    if (chargesTable) {
+        var chargeRows = chargesTable.querySelectorAll('tr');
+        for (var r = 1; r < chargeRows.length; r++) {
+            var tds = Array.prototype.slice.call(chargeRows[r].querySelectorAll('td'), 0, 4);
+            sections.charges.push(tds.map(text));
+        }
+    }
+    return sections;
+}
+"""
+
+# With arguments[1] set, also returns the fetched page itself (for the page archive)
+EXTRACT_SECTIONS_JS = COLLECT_SECTIONS_FN + """
+var sections = collectSections(document, arguments[0]);
+if (arguments[1]) { sections.html = document.documentElement.outerHTML; }
+return sections;
+"""
+
+
+def extract_sections_js(driver, keep_html=False):
+    """Collect the result page sections with one execute_script call"""
+    return driver.execute_script(EXTRACT_SECTIONS_JS, NOT_FOUND_MARKER, keep_html)
+
+
+def extract_results_js(driver, summons_number, on_page=None):
+    """
+    Same output as summons_selenium_v2.extract_results, in one WebDriver round trip
+
+    Args:
+        on_page: Optional callback given the fetched page's HTML, e.g. to archive it;
+            called for result and not-found pages, like the page_source path, so
+            throttle and error pages never reach the archive
+    """
+    sections = extract_sections_js(driver, keep_html=on_page is not None)
+    html = sections.pop('html', None)
+    if on_page is not None and has_result_sections(html):
+        on_page(html)
+    return build_result(sections, summons_number)
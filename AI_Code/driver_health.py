@@ -0,0 +1,123 @@
+"""
+Browser health management for long Selenium runs
+Headless Chrome grows steadily over hundreds of page loads; the engines use
+DriverHealth to restart their browser every N lookups, when the browser
+processes pass a memory ceiling, or when the driver has crashed or hung.
+Memory is measured with psutil when it is installed
+"""
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# Error text that means the browser itself is gone or hung, not that the lookup failed
+DEAD_DRIVER_MARKERS = (
+    'invalid session id',
+    'no such window',
+    'session deleted',
+    'chrome not reachable',
+    'disconnected',
+    'connection refused',
+    'max retries exceeded',
+    'timed out receiving message from renderer',
+    'tab crashed',
+)
+
+
+def driver_is_dead(lookup, result=None):
+    """Return True if the lookup's browser has crashed, hung or been closed"""
+    error = (result or {}).get('error', '').lower()
+    if any(marker in error for marker in DEAD_DRIVER_MARKERS):
+        return True
+    try:
+        lookup.driver.current_url
+        return False
+    except Exception:
+        return True
+
+
+def browser_rss_mb(driver):
+    """Resident memory of the driver process and every browser process it started (None without psutil)"""
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except Exception:
+        return None
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+class DriverHealth:
+    def __init__(self, recycle_every=200, max_rss_mb=None, check_every=10):
+        """
+        Args:
+            recycle_every: Restart the browser after this many lookups (None = never)
+            max_rss_mb: Restart when the browser processes use more than this (needs psutil)
+            check_every: Lookups between memory checks
+        """
+        self.recycle_every = recycle_every
+        self.max_rss_mb = max_rss_mb
+        self.check_every = max(1, int(check_every))
+        self.restarts = 0
+        self.drivers = [self._new_entry(1)]
+
+        if max_rss_mb and psutil is None:
+            print("[WARN] psutil not installed - memory ceiling disabled, recycling by lookup count only")
+
+    @staticmethod
+    def _new_entry(number):
+        return {'driver': number, 'lookups': 0, 'peak_rss_mb': None, 'ended': None}
+
+    def _measure(self, driver):
+        rss = browser_rss_mb(driver)
+        current = self.drivers[-1]
+        if rss is not None and (current['peak_rss_mb'] is None or rss > current['peak_rss_mb']):
+            current['peak_rss_mb'] = round(rss)
+        return rss
+
+    def check(self, lookup, result):
+        """
+        Count one lookup and decide whether the browser should be restarted
+
+        Returns:
+            The reason to restart, or None while the browser is healthy
+        """
+        current = self.drivers[-1]
+        current['lookups'] += 1
+
+        if result.get('status') == 'ERROR' and driver_is_dead(lookup, result):
+            return 'crashed or hung'
+
+        if current['lookups'] % self.check_every == 0:
+            rss = self._measure(lookup.driver)
+            if self.max_rss_mb and rss is not None and rss > self.max_rss_mb:
+                return f'memory {rss:.0f} MB over {self.max_rss_mb} MB limit'
+
+        if self.recycle_every and current['lookups'] >= self.recycle_every:
+            return f'{current["lookups"]} lookups'
+        return None
+
+    def recycled(self, reason):
+        """Close the current driver's entry and start counting for its replacement"""
+        self.drivers[-1]['ended'] = reason
+        self.restarts += 1
+        self.drivers.append(self._new_entry(len(self.drivers) + 1))
+
+    def report(self):
+        """Per-driver lookups, peak memory and restart reasons"""
+        lines = [f"Browser health: {self.restarts} restart(s)"]
+        for entry in self.drivers:
+            memory = f"peak {entry['peak_rss_mb']} MB" if entry['peak_rss_mb'] is not None else "memory n/a"
+            ended = f", restarted: {entry['ended']}" if entry['ended'] else ""
+            lines.append(f"  driver {entry['driver']}: {entry['lookups']} lookups, {memory}{ended}")
+        return "\n".join(lines)
@@ -0,0 +1,210 @@
+"""
+Browser driver resolution without the network on the hot path
+The resolved chromedriver / msedgedriver path and version are remembered in
+.summons_cache/drivers.json; webdriver-manager is only asked to download when
+no usable driver can be found locally, or when the browser fails to start and
+no local driver matches the installed browser's major version
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from site_config import CACHE_DIR
+
+
+DRIVER_CACHE_PATH = CACHE_DIR / "drivers.json"
+WDM_DRIVERS_DIR = Path.home() / ".wdm" / "drivers"
+HERE = Path(__file__).resolve().parent
+
+# browser -> (env var override, executable name, webdriver-manager cache folder)
+DRIVERS = {
+    'chrome': ('CHROMEDRIVER_PATH', 'chromedriver', 'chromedriver'),
+    'edge': ('EDGEDRIVER_PATH', 'msedgedriver', 'edgedriver'),
+}
+
+# Where the installed browser's version can be read: Windows registry key, executables elsewhere
+BROWSERS = {
+    'chrome': (r'Software\Google\Chrome\BLBeacon',
+               ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser',
+                '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome')),
+    'edge': (r'Software\Microsoft\Edge\BLBeacon',
+             ('microsoft-edge', 'microsoft-edge-stable',
+              '/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge')),
+}
+
+VERSION_RE = re.compile(r'\d+\.\d+\.\d+\.\d+')
+MAJOR_RE = re.compile(r'(\d+)\.\d+')
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache_path, cache):
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+
+
+def _version_key(path):
+    match = VERSION_RE.search(str(path))
+    return tuple(int(part) for part in match.group(0).split('.')) if match else ()
+
+
+def wdm_driver_dirs():
+    """
+    Folders webdriver-manager may have downloaded into: ~/.wdm, and ./.wdm
+    under the working directory (WDM_LOCAL=1, set by _download_driver) for
+    runs started from AI_Code or the repo root
+    """
+    dirs = [WDM_DRIVERS_DIR]
+    for base in (Path.cwd(), HERE, HERE.parent):
+        path = base / ".wdm" / "drivers"
+        if path not in dirs:
+            dirs.append(path)
+    return dirs
+
+
+def _reported_major(command):
+    """Major version printed by `<command> --version`, or None"""
+    try:
+        output = subprocess.run([command, '--version'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = MAJOR_RE.search(output)
+    return int(match.group(1)) if match else None
+
+
+def browser_major_version(browser='chrome'):
+    """Major version of the installed browser (e.g. 131), or None if it cannot be told"""
+    registry_key, commands = BROWSERS[browser]
+    if sys.platform == 'win32':
+        import winreg
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, registry_key) as key:
+                return int(winreg.QueryValueEx(key, 'version')[0].split('.')[0])
+        except (OSError, ValueError):
+            return None
+    for command in commands:
+        if os.path.isfile(command) or shutil.which(command):
+            major = _reported_major(command)
+            if major is not None:
+                return major
+    return None
+
+
+def find_local_driver(browser='chrome', major=None):
+    """
+    Newest driver already downloaded by webdriver-manager, or one on PATH
+
+    Args:
+        major: Only accept a driver for this browser major version
+    """
+    _, exe_name, wdm_folder = DRIVERS[browser]
+    candidates = [
+        p for folder in wdm_driver_dirs() for p in (folder / wdm_folder).glob('**/*')
+        if p.is_file() and p.name in (exe_name, exe_name + '.exe')
+    ]
+    if major is not None:
+        candidates = [p for p in candidates if _version_key(p)[:1] == (major,)]
+    if candidates:
+        return str(max(candidates, key=_version_key))
+    path = shutil.which(exe_name)
+    if path and major is not None and _reported_major(path) != major:
+        return None
+    return path
+
+
+def _download_driver(browser):
+    os.environ.setdefault('WDM_LOCAL', '1')
+    if browser == 'edge':
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+        return EdgeChromiumDriverManager().install()
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def resolve_driver(browser='chrome', offline=False, refresh=False, cache_path=DRIVER_CACHE_PATH):
+    """
+    Path to the driver executable for a browser
+
+    Order: $CHROMEDRIVER_PATH / $EDGEDRIVER_PATH, the cached path, the local
+    webdriver-manager folder or PATH, and only then a download
+
+    Args:
+        offline: Never download; returns None if nothing is available locally
+        refresh: Ignore the cached entry and only reuse a local driver that
+            matches the installed browser's major version, else download one
+            (e.g. after a browser update broke the old driver)
+    """
+    env_var = DRIVERS[browser][0]
+    if os.environ.get(env_var) and os.path.isfile(os.environ[env_var]):
+        return os.environ[env_var]
+
+    cache = _load_cache(cache_path)
+    entry = cache.get(browser)
+    if entry and not refresh and os.path.isfile(entry.get('path', '')):
+        return entry['path']
+
+    major = browser_major_version(browser) if refresh else None
+    if refresh and major is None and not offline:
+        # Cannot tell which driver fits - webdriver-manager checks the browser itself
+        path = _download_driver(browser)
+    else:
+        path = find_local_driver(browser, major)
+    if path is None and not offline:
+        path = _download_driver(browser)
+    if path is None:
+        return None
+
+    match = VERSION_RE.search(path)
+    cache[browser] = {
+        'path': path,
+        'version': match.group(0) if match else None,
+        'resolved': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    _save_cache(cache_path, cache)
+    return path
+
+
+def forget_driver(browser='chrome', cache_path=DRIVER_CACHE_PATH):
+    """Drop the cached entry so the next start resolves the driver again"""
+    cache = _load_cache(cache_path)
+    if cache.pop(browser, None) is not None:
+        _save_cache(cache_path, cache)
+
+
+def start_with_driver(browser, start, offline=False, cache_path=DRIVER_CACHE_PATH):
+    """
+    Start a browser with the resolved driver; if that fails, resolve again for
+    the installed browser version (downloading a matching driver if needed)
+    and try once more
+
+    Args:
+        start: Callable taking the driver path and returning the WebDriver
+    """
+    path = resolve_driver(browser, offline=offline, cache_path=cache_path)
+    try:
+        return start(path)
+    except Exception as error:
+        forget_driver(browser, cache_path)
+        try:
+            fresh = resolve_driver(browser, offline=offline, refresh=True, cache_path=cache_path)
+        except Exception as resolve_error:
+            print(f"Could not fetch a new {browser} driver: {str(resolve_error)[:100]}")
+            raise error
+        if not fresh or fresh == path:
+            raise error
+        print(f"{browser} failed with {path} - retrying with {fresh}")
+        return start(fresh)
@@ -0,0 +1,240 @@
+"""
+Lookup history - every lookup kept as a snapshot in one SQLite file
+Instead of a new summons_results_v2_<timestamp>.xlsx/.json per run being the
+only record, each fresh result is appended here with its fetch time, so the
+state of any summons can be read as of any date. Excel/JSON are exports:
+
+    python history_store.py import ../summons_results_v2_*.xlsx
+    python history_store.py export latest.xlsx
+    python history_store.py export january.json --as-of 2026-01-31
+    python history_store.py show 0703792522
+"""
+
+import argparse
+import glob
+import json
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from site_config import CACHE_DIR
+from summons_record import as_record, as_result
+
+
+DEFAULT_HISTORY_PATH = CACHE_DIR / "history.sqlite"
+
+# Run bookkeeping and page provenance, not part of the summons' state
+SKIP_KEYS = ('from_cache', 'row_number', 'carried_forward', 'skipped_by_budget',
+             'attempts', 'requeued', 'page_ready_ms', 'source', 'escalation_reason',
+             'archived_page', 'reextracted', 'source_file')
+
+
+def as_of_arg(value):
+    """argparse type for --as-of: 'YYYY-MM-DD' (end of that day) or 'YYYY-MM-DD HH:MM:SS'"""
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            when = datetime.strptime(value.strip(), fmt)
+        except ValueError:
+            continue
+        return when + timedelta(days=1) - timedelta(seconds=1) if fmt == '%Y-%m-%d' else when
+    raise argparse.ArgumentTypeError("use a date like 2026-01-31 or '2026-01-31 18:00:00'")
+
+
+class HistoryStore:
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "id INTEGER PRIMARY KEY, "
+            "summons_number TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL, "
+            "status TEXT NOT NULL, "
+            "hearing_date TEXT, "
+            "hearing_result TEXT, "
+            "balance REAL, "
+            "run_id TEXT, "
+            "record TEXT NOT NULL, "
+            "UNIQUE (summons_number, fetched_at));"
+            "CREATE TABLE IF NOT EXISTS charges ("
+            "snapshot_id INTEGER NOT NULL REFERENCES snapshots (id), "
+            "number INTEGER NOT NULL, "
+            "code TEXT, "
+            "description TEXT);"
+            "CREATE INDEX IF NOT EXISTS snapshots_fetched ON snapshots (fetched_at);"
+            "CREATE INDEX IF NOT EXISTS snapshots_hearing ON snapshots (hearing_date);"
+            "CREATE INDEX IF NOT EXISTS charges_code ON charges (code, snapshot_id);"
+        )
+        self.conn.commit()
+
+    def append(self, results, run_id=None):
+        """
+        Store fresh lookup results as snapshots (one transaction)
+
+        Results served from the cache or carried forward, and lookups that
+        errored, say nothing new about the summons and are skipped; so is a
+        snapshot already stored (same summons and fetch time)
+
+        Returns:
+            Number of snapshots added
+        """
+        added = 0
+        with self.conn:
+            for result in results:
+                record = as_record(result)
+                if not record.summons_number or record.state() == 'error':
+                    continue
+                flat = as_result(result)
+                if flat.get('from_cache'):
+                    continue
+                fetched_at = record.fetched_at.timestamp() if record.fetched_at else time.time()
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO snapshots (summons_number, fetched_at, status, hearing_date, "
+                    "hearing_result, balance, run_id, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (record.summons_number, fetched_at, record.status.value,
+                     record.hearing_date.isoformat() if record.hearing_date else None,
+                     record.hearing_result or None, float(record.balance), run_id,
+                     json.dumps({k: v for k, v in flat.items() if k not in SKIP_KEYS}))
+                )
+                if not cursor.rowcount:
+                    continue
+                self.conn.executemany(
+                    "INSERT INTO charges (snapshot_id, number, code, description) VALUES (?, ?, ?, ?)",
+                    [(cursor.lastrowid, c.number, c.code, c.description) for c in record.charges]
+                )
+                added += 1
+        return added
+
+    def _state_query(self, where='', params=(), as_of=None):
+        """Latest snapshot per summons (as of a time), optionally filtered"""
+        cutoff = as_of.timestamp() if as_of else float('inf')
+        return self.conn.execute(
+            "SELECT s.record FROM snapshots s "
+            "JOIN (SELECT summons_number, MAX(fetched_at) AS fetched_at FROM snapshots "
+            "      WHERE fetched_at <= ? GROUP BY summons_number) latest "
+            "  ON s.summons_number = latest.summons_number AND s.fetched_at = latest.fetched_at "
+            f"{where} ORDER BY s.summons_number",
+            (cutoff,) + tuple(params)
+        ).fetchall()
+
+    def latest(self, summons_numbers=None, as_of=None):
+        """
+        Current state of every summons (flat result dicts)
+
+        Args:
+            summons_numbers: Only these summons
+            as_of: datetime - the state as it was known at that moment
+        """
+        rows = [json.loads(record) for (record,) in self._state_query(as_of=as_of)]
+        if summons_numbers is not None:
+            wanted = {str(s).strip() for s in summons_numbers}
+            rows = [r for r in rows if r['summons_number'] in wanted]
+        return rows
+
+    def with_charge(self, code, as_of=None):
+        """Latest state of the summons whose latest snapshot carries this charge code"""
+        where = "WHERE s.id IN (SELECT snapshot_id FROM charges WHERE code = ?)"
+        return [json.loads(record) for (record,) in self._state_query(where, (code,), as_of)]
+
+    def hearings_between(self, start, end, as_of=None):
+        """Latest state of summons with a hearing between two dates (inclusive)"""
+        where = "WHERE s.hearing_date BETWEEN ? AND ?"
+        return [json.loads(record) for (record,) in
+                self._state_query(where, (start.isoformat(), end.isoformat()), as_of)]
+
+    def history(self, summons_number):
+        """Every snapshot of one summons, oldest first"""
+        rows = self.conn.execute(
+            "SELECT record FROM snapshots WHERE summons_number = ? ORDER BY fetched_at",
+            (str(summons_number).strip(),)
+        ).fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def stats(self):
+        snapshots, summons, first, last = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT summons_number), MIN(fetched_at), MAX(fetched_at) FROM snapshots"
+        ).fetchone()
+        fmt = lambda t: datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S') if t else '-'
+        return {'snapshots': snapshots, 'summons': summons, 'first': fmt(first), 'last': fmt(last)}
+
+    def export(self, path, as_of=None):
+        """Write the latest state (as of a time) to .xlsx or .json; returns the row count"""
+        rows = self.latest(as_of=as_of)
+        if str(path).endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump(rows, f, indent=2)
+        else:
+            pd.DataFrame(rows).to_excel(path, index=False)
+        return len(rows)
+
+    def close(self):
+        self.conn.close()
+
+
+def load_latest(as_of=None):
+    """Latest state of every summons from the history store ([] if it is empty)"""
+    if not DEFAULT_HISTORY_PATH.exists():
+        return []
+    store = HistoryStore()
+    try:
+        return store.latest(as_of=as_of)
+    finally:
+        store.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Summons lookup history")
+    parser.add_argument("--db", default=str(DEFAULT_HISTORY_PATH), help="History database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("import", help="Backfill snapshots from earlier results files")
+    add.add_argument("files", nargs="+", help="summons_results_v2_*.xlsx/.json files (globs allowed)")
+
+    export = commands.add_parser("export", help="Write the latest state of every summons")
+    export.add_argument("output", help="Output .xlsx or .json")
+    export.add_argument("--as-of", type=as_of_arg, help="State as it was known at this date/time")
+
+    show = commands.add_parser("show", help="Every snapshot of one summons")
+    show.add_argument("summons")
+
+    commands.add_parser("stats", help="Snapshot counts")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    store = HistoryStore(args.db)
+    try:
+        if args.command == "import":
+            from scheduler import load_results_file
+            files = sorted({f for pattern in args.files for f in glob.glob(pattern)})
+            if not files:
+                print("No results files found")
+            for path in files:
+                added = store.append(load_results_file(path), run_id=Path(path).stem)
+                print(f"[OK] {path}: {added} new snapshots")
+
+        elif args.command == "export":
+            start = time.perf_counter()
+            count = store.export(args.output, args.as_of)
+            print(f"[OK] {count} summons written to {args.output} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+        elif args.command == "show":
+            for snapshot in store.history(args.summons):
+                print(f"{snapshot.get('timestamp', '-'):<20} {snapshot.get('status', '-'):<10} "
+                      f"hearing {snapshot.get('hearing_date', '-'):<12} {snapshot.get('hearing_result', '-'):<14} "
+                      f"balance {snapshot.get('balance_due', '-')}")
+
+        else:
+            for key, value in store.stats().items():
+                print(f"{key}: {value}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Raw HTML archive of every fetched result page, with offline re-extraction
+Pages are stored compressed (zstd when installed, else gzip) under their SHA-256,
+so an unchanged page fetched again takes no extra space; index.sqlite records
+which summons was fetched when. When the extractor improves, rebuild results
+for old summons from the archive instead of scraping everything again:
+
+    python html_archive.py reextract --workers 4
+    python html_archive.py stats
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from site_config import CACHE_DIR
+
+
+DEFAULT_ARCHIVE_DIR = CACHE_DIR / "html_archive"
+
+
+def _compress(data):
+    """(codec, bytes) - zstd if available, gzip otherwise"""
+    if zstandard is not None:
+        return 'zst', zstandard.ZstdCompressor(level=10).compress(data)
+    return 'gz', gzip.compress(data, compresslevel=6)
+
+
+def _decompress(codec, data):
+    if codec == 'zst':
+        if zstandard is None:
+            raise RuntimeError("Page was archived with zstd - pip install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def object_path(root, digest, codec):
+    return Path(root) / "objects" / digest[:2] / f"{digest}.html.{codec}"
+
+
+def read_page(root, digest, codec):
+    """Decompressed HTML of one archived page"""
+    with open(object_path(root, digest, codec), 'rb') as f:
+        return _decompress(codec, f.read()).decode('utf-8')
+
+
+class HtmlArchive:
+    def __init__(self, root=DEFAULT_ARCHIVE_DIR):
+        self.root = Path(root)
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        # Shared by the browser pool's worker threads
+        self.conn = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "summons_number TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL, "
+            "digest TEXT NOT NULL, "
+            "codec TEXT NOT NULL, "
+            "source TEXT, "
+            "size INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_summons ON pages (summons_number, fetched_at)")
+        self.conn.commit()
+        self._lock = threading.Lock()
+        self.stored = 0
+        self.deduplicated = 0
+
+    def store(self, summons_number, html, source=None, fetched_at=None):
+        """
+        Archive one fetched page
+
+        Returns:
+            The page's SHA-256 digest
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        fetched_at = fetched_at or time.time()
+
+        with self._lock:
+            row = self.conn.execute("SELECT codec FROM pages WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+            if row is not None and object_path(self.root, digest, row[0]).exists():
+                codec = row[0]
+                self.deduplicated += 1
+            else:
+                codec, blob = _compress(data)
+                path = object_path(self.root, digest, codec)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix('.tmp')
+                with open(tmp, 'wb') as f:
+                    f.write(blob)
+                os.replace(tmp, path)
+            self.conn.execute(
+                "INSERT INTO pages (summons_number, fetched_at, digest, codec, source, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (str(summons_number).strip(), fetched_at, digest, codec, source, len(data))
+            )
+            self.conn.commit()
+            self.stored += 1
+        return digest
+
+    def entries(self, summons_numbers=None, latest_only=True):
+        """
+        Index rows as dicts (summons_number, fetched_at, digest, codec, source), oldest first
+
+        Args:
+            summons_numbers: Only these summons (default: everything archived)
+            latest_only: Just the most recent page per summons
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT summons_number, fetched_at, digest, codec, source FROM pages ORDER BY fetched_at"
+            ).fetchall()
+        if summons_numbers is not None:
+            wanted = {str(s).strip() for s in summons_numbers}
+            rows = [r for r in rows if r[0] in wanted]
+        if latest_only:
+            rows = list({r[0]: r for r in rows}.values())
+        keys = ('summons_number', 'fetched_at', 'digest', 'codec', 'source')
+        return [dict(zip(keys, r)) for r in rows]
+
+    def load(self, entry):
+        """HTML for one index entry"""
+        return read_page(self.root, entry['digest'], entry['codec'])
+
+    def stats(self):
+        with self._lock:
+            pages, summons, raw = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT summons_number), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+        files = list((self.root / "objects").glob("*/*.html.*"))
+        return {
+            'pages': pages,
+            'summons': summons,
+            'unique_pages': len(files),
+            'raw_mb': round(raw / 1e6, 2),
+            'stored_mb': round(sum(f.stat().st_size for f in files) / 1e6, 2),
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def archived_pages(entries, root=DEFAULT_ARCHIVE_DIR):
+    """(summons_number, html, extra) for each index entry, as parse_pool.parse_pages expects"""
+    for entry in entries:
+        extra = {
+            # The page's own fetch time, not when it was re-parsed
+            'timestamp': datetime.fromtimestamp(entry['fetched_at']).strftime('%Y-%m-%d %H:%M:%S'),
+            'archived_page': entry['digest'],
+            'reextracted': True,
+        }
+        try:
+            html = read_page(root, entry['digest'], entry['codec'])
+        except Exception as e:
+            html, extra['error'] = None, str(e)
+        yield entry['summons_number'], html, extra
+
+
+def reextract(entries, root=DEFAULT_ARCHIVE_DIR, workers=None):
+    """Results for the given index entries, parsed across CPU cores, in entry order"""
+    from parse_pool import parse_pages
+    return list(parse_pages(archived_pages(entries, root), workers))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Archive of fetched result pages")
+    parser.add_argument("--archive", default=str(DEFAULT_ARCHIVE_DIR), help="Archive directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("reextract", help="Rebuild results from archived pages (no network)")
+    rebuild.add_argument("--summons", nargs="+", help="Only these summons (default: everything archived)")
+    rebuild.add_argument("--all-versions", action="store_true", help="Every archived fetch, not just the latest per summons")
+    rebuild.add_argument("--workers", type=int, help="Parser processes (default: one per CPU core)")
+    rebuild.add_argument("--update-cache", action="store_true", help="Also store the rebuilt results in the result cache")
+
+    commands.add_parser("stats", help="Show archive size")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    archive = HtmlArchive(args.archive)
+
+    if args.command == "stats":
+        for key, value in archive.stats().items():
+            print(f"{key}: {value}")
+        archive.close()
+        return
+
+    entries = archive.entries(args.summons, latest_only=not args.all_versions)
+    archive.close()
+    if not entries:
+        print("Nothing archived yet - run a lookup first")
+        return
+
+    print(f"Re-extracting {len(entries)} archived pages...", flush=True)
+    start = time.perf_counter()
+    results = reextract(entries, args.archive, args.workers)
+    seconds = time.perf_counter() - start
+    print(f"[OK] {len(results)} pages in {seconds:.1f}s ({len(results) / max(seconds, 1e-9):.0f} pages/s)")
+
+    if args.update_cache:
+        from result_cache import ResultCache
+        cache = ResultCache()
+        try:
+            cache.put_many(results, fetched_at=[entry['fetched_at'] for entry in entries])
+        finally:
+            cache.close()
+        print("[OK] Result cache updated (newer cached results kept)")
+
+    import pandas as pd
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    excel_file = f'summons_results_reextract_{timestamp}.xlsx'
+    json_file = f'summons_results_reextract_{timestamp}.json'
+    pd.DataFrame(results).to_excel(excel_file, index=False)
+    with open(json_file, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Excel: {excel_file}")
+    print(f"JSON: {json_file}")
+
+
+if __name__ == "__main__":
+    main()
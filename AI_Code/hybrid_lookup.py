@@ -0,0 +1,162 @@
+"""
+Hybrid NYC DOT summons lookup - HTTP first, browser only when needed
+Each summons is fetched with a single POST and parsed with the v2 extraction
+logic; it is escalated to a Selenium browser only when the response is not a
+usable result page (JS-rendered content, anti-bot page, session error)
+"""
+
+import argparse
+from datetime import datetime
+
+from html_archive import HtmlArchive
+from rate_control import AdaptiveRateController, looks_blocked
+from retry import CircuitBreaker, lookup_with_retry, requeue_errors
+from result_parser import has_result_sections, parse_result_html
+from summons_lookup import SummonsLookup
+
+
+class HybridLookup:
+    def __init__(self, headless=True, timeout=30, archive=None):
+        """
+        Args:
+            headless: Run the fallback browser without a window
+            timeout: Seconds to wait for the HTTP response
+            archive: Optional html_archive.HtmlArchive; every result page is stored in it
+        """
+        self.headless = headless
+        self.timeout = timeout
+        self.archive = archive
+        self.http = SummonsLookup()
+        self._browser = None
+        self.stats = {'http': 0, 'browser': 0}
+
+    @property
+    def browser(self):
+        """Selenium lookup, started the first time a summons needs it"""
+        if self._browser is None:
+            from summons_selenium_v2 import SummonsSeleniumLookup
+            self._browser = SummonsSeleniumLookup(headless=self.headless, archive=self.archive)
+        return self._browser
+
+    def fetch_http(self, summons_number):
+        """
+        Try the lightweight POST
+
+        Returns:
+            (result, None) on a usable result page, or (None, reason) to escalate
+        """
+        try:
+            response = self.http.post_search(summons_number, timeout=self.timeout)
+        except Exception as e:
+            return None, f'HTTP request failed: {str(e)[:100]}'
+
+        if response.status_code != 200:
+            return None, f'HTTP {response.status_code}'
+        if looks_blocked(response.text):
+            return None, 'Blocked by server (captcha or throttle page)'
+        if not has_result_sections(response.text):
+            return None, 'Result sections missing from HTTP response'
+
+        if self.archive is not None:
+            self.archive.store(summons_number, response.text, source='http')
+        return parse_result_html(response.text, summons_number), None
+
+    def lookup_summons(self, summons_number):
+        """Look up one summons, escalating to the browser only if HTTP is not enough"""
+        result, reason = self.fetch_http(summons_number)
+        if result is not None and result.get('status') != 'ERROR':
+            self.stats['http'] += 1
+            result['source'] = 'http'
+            return result
+
+        reason = reason or result.get('error')
+        try:
+            result = self.browser.lookup_summons(summons_number)
+        except Exception as e:
+            result = {
+                'summons_number': summons_number,
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'status': 'ERROR',
+                'error': f'Browser fallback unavailable: {str(e)[:100]}'
+            }
+        self.stats['browser'] += 1
+        result['source'] = 'browser'
+        result['escalation_reason'] = reason
+        return result
+
+    def lookup_batch(self, summons_list, delay=1, controller=None, retry_policy=None):
+        """Look up multiple summons numbers, paced by an adaptive rate controller"""
+        controller = controller or AdaptiveRateController(initial_delay=delay)
+        breaker = CircuitBreaker()
+        results = []
+        total = len(summons_list)
+
+        print(f"\nStarting hybrid lookup of {total} summons...")
+        print("=" * 60)
+
+        for idx, summons in enumerate(summons_list, 1):
+            print(f"[{idx}/{total}] Processing: {summons}", end=' ')
+
+            result = lookup_with_retry(self.lookup_summons, summons, controller, retry_policy, breaker)
+            result['row_number'] = idx + 4
+
+            status = result.get('status')
+            if status == 'SUCCESS':
+                print(f"[FOUND via {result['source']}]")
+            elif status == 'NOT_FOUND':
+                print(f"[NOT FOUND via {result['source']}]")
+            else:
+                print(f"[ERROR] {result.get('error', 'UNKNOWN ERROR')}")
+
+            results.append(result)
+
+        requeue_errors(results, self.lookup_summons, controller, retry_policy, breaker)
+        print(controller.summary())
+        print(f"\nHTTP lookups: {self.stats['http']} | Browser fallbacks: {self.stats['browser']}")
+        return results
+
+    def close(self):
+        """Close the fallback browser if one was started"""
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Hybrid NYC DOT summons lookup (HTTP first, browser fallback)")
+    parser.add_argument("--excel", default="ML TRACKING.xlsx", help="Excel file with summons in column B from row 5")
+    parser.add_argument("--delay", type=float, default=1, help="Starting seconds between lookups (adapts to server health)")
+    parser.add_argument("--visible", action="store_true", help="Show the fallback browser window")
+    parser.add_argument("--no-archive", action="store_true", help="Do not keep the fetched result pages (html_archive.py)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    from summons_selenium_v2 import read_summons_from_excel, save_results, print_summary
+
+    print("NYC DOT Summons Hybrid Lookup", flush=True)
+    print("=" * 60)
+
+    summons_list = read_summons_from_excel(args.excel)
+    if not summons_list:
+        print("No summons found in Excel file")
+        return
+
+    archive = None if args.no_archive else HtmlArchive()
+    lookup = HybridLookup(headless=not args.visible, archive=archive)
+    try:
+        results = lookup.lookup_batch(summons_list, delay=args.delay)
+        save_results(results)
+        print_summary(results)
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user")
+    finally:
+        lookup.close()
+        if archive is not None:
+            archive.close()
+
+
+if __name__ == "__main__":
+    main()
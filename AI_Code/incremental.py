@@ -0,0 +1,58 @@
+"""
+Incremental batch mode - skip summons that are already settled
+Dismissed summons, and summons paid/closed with nothing owed, almost never
+change; they are carried forward from the previous results file unchanged
+(original timestamp included) and only the rest are looked up again
+"""
+
+from history_store import load_latest
+from tracking_sheet import summons_key
+from summons_record import SummonsRecord, as_record, load_records
+
+
+def is_settled(result):
+    """True for a DISMISSED summons, or one paid/closed with a zero balance"""
+    return as_record(result).is_settled()
+
+
+def split_incremental(summons_list, previous):
+    """
+    Separate summons that need a lookup from settled ones to carry forward
+
+    Args:
+        previous: Results from the last run (SummonsRecords, see load_previous())
+
+    Returns:
+        (to_look_up, carried) - carried results are flagged so they are not re-cached
+    """
+    settled = {summons_key(r.summons_number): r for r in previous
+               if r.summons_number and is_settled(r)}
+
+    to_look_up, carried = [], []
+    for summons in summons_list:
+        old = settled.get(summons_key(summons))
+        if old is None:
+            to_look_up.append(summons)
+            continue
+        result = old.to_result()
+        result['summons_number'] = summons
+        result['carried_forward'] = True
+        result['from_cache'] = True
+        carried.append(result)
+    return to_look_up, carried
+
+
+def load_previous(results_file=None):
+    """
+    Latest known results as SummonsRecords: the given file, else the lookup
+    history (a run's export only holds what changed); [] if there is none
+    """
+    if results_file:
+        print(f"Incremental: carrying settled summons forward from {results_file}")
+        return load_records(results_file)
+    previous = load_latest()
+    if not previous:
+        print("Incremental: the lookup history is empty, looking up everything")
+        return []
+    print(f"Incremental: carrying settled summons forward from the lookup history ({len(previous)} summons)")
+    return [SummonsRecord.from_result(r) for r in previous]
@@ -0,0 +1,108 @@
+"""
+Lean browsing for the Selenium engines
+Blocks images, stylesheets, fonts, media and analytics through Chrome DevTools
+(Network.setBlockedURLs) so a lookup only downloads the HTML and scripts the
+search form needs, and keeps a running tally of bytes and time saved
+"""
+
+import time
+
+
+# Resources the search form and result tables never need
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.ico', '*.webp', '*.bmp',
+    '*.css',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*siteimproveanalytics*', '*fonts.googleapis.com*', '*fonts.gstatic.com*',
+]
+
+# Chrome/Edge preference that stops image loading outright (covers images without an extension)
+NO_IMAGES_PREFS = {'profile.managed_default_content_settings.images': 2}
+
+# Bytes transferred and load time of the current document, from the Performance API
+PAGE_COST_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var bytes = nav ? nav.transferSize : 0;
+var resources = performance.getEntriesByType('resource');
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }
+var end = nav && nav.loadEventEnd ? nav.loadEventEnd : performance.now();
+return {bytes: bytes, load_ms: nav ? end - nav.startTime : 0, resources: resources.length};
+"""
+
+
+def lean_options(options):
+    """Add the no-images preference to Chrome or Edge options"""
+    options.add_experimental_option('prefs', NO_IMAGES_PREFS)
+    return options
+
+
+class LeanBrowsing:
+    def __init__(self, driver):
+        self.driver = driver
+        self.enabled = False
+        self.pages = 0
+        self.bytes = 0
+        self.load_ms = 0.0
+        self.baseline = None
+
+    def calibrate(self, url):
+        """
+        Load one page before request blocking starts, to get the per-page cost being saved against
+
+        Images are already off at this point (NO_IMAGES_PREFS is applied when
+        the browser starts), so the baseline understates a truly unblocked
+        page and the savings in summary() are a lower bound
+        """
+        try:
+            self.driver.get(url)
+            time.sleep(0.5)
+            self.baseline = self.driver.execute_script(PAGE_COST_JS)
+        except Exception as e:
+            print(f"[WARN] Lean browsing calibration failed: {str(e)[:80]}")
+
+    def enable(self):
+        """Turn on DevTools request blocking; returns False if the browser does not support it"""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+            self.enabled = True
+        except Exception as e:
+            print(f"[WARN] Lean browsing unavailable: {str(e)[:80]}")
+        return self.enabled
+
+    def measure(self):
+        """Add the cost of the page currently loaded to the run totals"""
+        if not self.enabled:
+            return None
+        try:
+            cost = self.driver.execute_script(PAGE_COST_JS)
+        except Exception:
+            return None
+        self.pages += 1
+        self.bytes += cost.get('bytes', 0)
+        self.load_ms += cost.get('load_ms', 0)
+        return cost
+
+    def summary(self):
+        """One-line report of what lean browsing saved in this run"""
+        if not self.pages:
+            return "Lean browsing: no pages measured"
+        line = (f"Lean browsing: {self.pages} pages, {self.bytes / 1024:.0f} KB transferred, "
+                f"avg load {self.load_ms / self.pages:.0f}ms")
+        if self.baseline:
+            saved_bytes = self.baseline['bytes'] * self.pages - self.bytes
+            saved_ms = self.baseline['load_ms'] * self.pages - self.load_ms
+            line += (f" | est. saved at least {max(saved_bytes, 0) / 1024:.0f} KB and "
+                     f"{max(saved_ms, 0) / 1000:.1f}s (baseline page loaded with images already off)")
+        return line
+
+
+def start_lean_browsing(driver, calibration_url=None):
+    """Enable request blocking on a new driver, measuring one full page first if a URL is given"""
+    lean = LeanBrowsing(driver)
+    if calibration_url:
+        lean.calibrate(calibration_url)
+    lean.enable()
+    return lean
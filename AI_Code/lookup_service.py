@@ -0,0 +1,175 @@
+"""
+Local lookup service - keeps warm browsers running between ad-hoc lookups
+Start it once:
+
+    python lookup_service.py --browsers 2
+
+then GET http://127.0.0.1:8765/lookup?summons=0703792522 returns the result
+JSON in about a second instead of paying a Chrome cold start every time.
+lookup_via_service() is the client used by test_single.py
+"""
+
+import argparse
+import json
+import queue
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from driver_health import driver_is_dead
+from rate_control import AdaptiveRateController, timed_lookup
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_SERVICE_URL = f'http://{DEFAULT_HOST}:{DEFAULT_PORT}'
+
+
+class BrowserPool:
+    def __init__(self, browsers=1, headless=True, lean=True):
+        """Start the browsers up front so every request finds one warm"""
+        from summons_selenium_v2 import SummonsSeleniumLookup
+
+        self.lookup_class = SummonsSeleniumLookup
+        self.headless = headless
+        self.lean = lean
+        self.idle = queue.Queue()
+        self.controller = AdaptiveRateController(initial_delay=1)
+        self.served = 0
+        self.browsers = max(1, int(browsers))
+        self._lock = threading.Lock()
+        for _ in range(self.browsers):
+            self.idle.put(self._start())
+
+    def _start(self):
+        return self.lookup_class(headless=self.headless, lean=self.lean, reuse_session=True)
+
+    def _restart(self, attempts=2):
+        """A fresh browser to replace a crashed one, or None if it will not start"""
+        for attempt in range(1, attempts + 1):
+            try:
+                return self._start()
+            except Exception as e:
+                print(f"[service] browser restart {attempt}/{attempts} failed: {str(e)[:80]}", flush=True)
+        with self._lock:
+            self.browsers -= 1
+        print(f"[service] running with {self.browsers} browser(s)", flush=True)
+        return None
+
+    def lookup(self, summons_number, timeout=60):
+        try:
+            if not self.browsers:
+                raise queue.Empty
+            browser = self.idle.get(timeout=timeout)
+        except queue.Empty:
+            return {
+                'summons_number': summons_number,
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'status': 'ERROR',
+                'error': 'No browser available (service busy)' if self.browsers else 'No browser running (restart failed)'
+            }
+
+        try:
+            result = timed_lookup(self.controller, browser.lookup_summons, summons_number)
+            if result.get('status') == 'ERROR' and driver_is_dead(browser, result):
+                print("[service] browser crashed, restarting", flush=True)
+                try:
+                    browser.close()
+                except Exception:
+                    pass
+                browser = self._restart()
+                if browser is not None:
+                    result = timed_lookup(self.controller, browser.lookup_summons, summons_number)
+        finally:
+            # Only a live browser goes back; a failed restart leaves the pool one smaller
+            if browser is not None:
+                self.idle.put(browser)
+
+        with self._lock:
+            self.served += 1
+        return result
+
+    def close(self):
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+
+
+class LookupHandler(BaseHTTPRequestHandler):
+    pool = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        if url.path == '/health':
+            self._send_json(200, {'status': 'ok' if self.pool.browsers else 'no browsers', 'served': self.pool.served,
+                                  'browsers': self.pool.browsers})
+            return
+        if url.path != '/lookup':
+            self._send_json(404, {'error': 'Use /lookup?summons=<number> or /health'})
+            return
+
+        summons = urllib.parse.parse_qs(url.query).get('summons', [''])[0].strip()
+        if not summons:
+            self._send_json(400, {'error': 'Missing summons parameter'})
+            return
+        self._send_json(200, self.pool.lookup(summons))
+
+    def log_message(self, format, *args):
+        print(f"[service] {self.address_string()} {format % args}", flush=True)
+
+
+def lookup_via_service(summons_number, service_url=DEFAULT_SERVICE_URL, timeout=60):
+    """Look up one summons through a running service; returns None if none is listening"""
+    query = urllib.parse.urlencode({'summons': summons_number})
+    try:
+        with urllib.request.urlopen(f'{service_url}/lookup?{query}', timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return None
+    except ValueError:
+        # Something else is listening on the port (or the reply was cut off)
+        print(f"[WARN] {service_url} did not answer with JSON - is it the lookup service?")
+        return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Keep warm browsers running for fast single lookups")
+    parser.add_argument("--browsers", type=int, default=1, help="Number of warm browsers to keep")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to listen on (keep it local)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--visible", action="store_true", help="Show the browser windows")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("NYC DOT Summons Lookup Service", flush=True)
+    print("=" * 60)
+    print(f"Starting {args.browsers} browser(s)...")
+    LookupHandler.pool = BrowserPool(browsers=args.browsers, headless=not args.visible)
+
+    server = ThreadingHTTPServer((args.host, args.port), LookupHandler)
+    print(f"[OK] Listening on http://{args.host}:{args.port}/lookup?summons=<number>")
+    print("Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n\nStopping service")
+    finally:
+        server.server_close()
+        LookupHandler.pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Local stand-in for the ECB ticket finder, for offline testing and benchmarks
+Serves searchHome.action and getViolationbyID.action from the recorded pages
+in fixtures/ticketfinder/, with configurable latency, error rate and throttling
+
+    python mock_ticketfinder.py --latency 0.3 --error-rate 0.05
+    set TICKETFINDER_BASE_URL=http://127.0.0.1:8766
+    python run_enhanced.py
+
+summons.json maps summons numbers to a fixture (found, found_multi_charge,
+not_found, error); any other number gets the --default page
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.parse
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "ticketfinder"
+DEFAULT_PORT = 8766
+
+# Form fields the engines send the summons number in (HTTP engines / browser form)
+SUMMONS_FIELDS = ('violationNumber', 'searchViolationObject.violationNo')
+
+
+class MockSettings:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rps=None,
+                 default_page='not_found', fixtures_dir=FIXTURES_DIR, seed=None):
+        """
+        Args:
+            latency: Seconds added to every response
+            jitter: Extra random 0..jitter seconds per response
+            error_rate: Fraction of searches answered with HTTP 500 and the error page
+            throttle_rps: Searches per second above which HTTP 429 is returned (None = never)
+            default_page: Fixture served for summons not listed in summons.json
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rps = throttle_rps
+        self.default_page = default_page
+        self.fixtures_dir = Path(fixtures_dir)
+        self.random = random.Random(seed)
+
+        self.pages = {p.stem: p.read_text(encoding='utf-8') for p in self.fixtures_dir.glob('*.html')}
+        with open(self.fixtures_dir / 'summons.json', 'r', encoding='utf-8') as f:
+            self.summons_pages = json.load(f)
+
+        self.stats = {'requests': 0, 'searches': 0, 'errors': 0, 'throttled': 0}
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def throttled(self):
+        """Record one search and say whether it is over the rate limit"""
+        with self._lock:
+            now = time.monotonic()
+            self._recent.append(now)
+            while self._recent and self._recent[0] < now - 1:
+                self._recent.popleft()
+            return self.throttle_rps is not None and len(self._recent) > self.throttle_rps
+
+    def page_for(self, summons_number):
+        """(HTTP status, html) for a summons search"""
+        if self.error_rate and self.random.random() < self.error_rate:
+            return 500, self.pages['error']
+        name = self.summons_pages.get(summons_number, self.default_page)
+        status = 500 if name == 'error' else 200
+        return status, self.pages[name].replace('{{summons}}', summons_number)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    settings = None
+    protocol_version = 'HTTP/1.1'
+
+    def _delay(self):
+        pause = self.settings.latency + self.settings.random.uniform(0, self.settings.jitter)
+        if pause > 0:
+            time.sleep(pause)
+
+    def _send_html(self, status, html):
+        body = html.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self, key):
+        with self.settings._lock:
+            self.settings.stats[key] += 1
+
+    def _search(self, params):
+        self._count('searches')
+        summons = next((params[f][0].strip() for f in SUMMONS_FIELDS if params.get(f)), '')
+        if self.settings.throttled():
+            self._count('throttled')
+            self._send_html(429, self.settings.pages['throttled'])
+            return
+        self._delay()
+        status, html = self.settings.page_for(summons)
+        if status != 200:
+            self._count('errors')
+        self._send_html(status, html)
+
+    def _route(self, params):
+        self._count('requests')
+        path = urllib.parse.urlparse(self.path).path
+        if path.endswith('/searchHome.action') or path == '/':
+            self._delay()
+            self._send_html(200, self.settings.pages['search_home'])
+        elif path.endswith('/getViolationbyID.action'):
+            self._search(params)
+        elif path == '/__stats':
+            body = json.dumps(self.settings.stats)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body.encode('utf-8'))
+        else:
+            self._send_html(404, '<html><body>Not Found</body></html>')
+
+    def do_GET(self):
+        self._route(urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+        self._route(urllib.parse.parse_qs(body))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(settings=None, host='127.0.0.1', port=0):
+    """
+    Run the mock server on a background thread
+
+    Returns:
+        (server, base_url) - call server.shutdown() when done
+    """
+    handler = type('BoundMockHandler', (MockHandler,), {'settings': settings or MockSettings()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Local stand-in for the ECB ticket finder")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of searches that return HTTP 500")
+    parser.add_argument("--throttle-rps", type=float, help="Return HTTP 429 above this many searches per second")
+    parser.add_argument("--default", default="not_found", help="Fixture for summons not in summons.json (e.g. found)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    settings = MockSettings(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                            throttle_rps=args.throttle_rps, default_page=args.default)
+
+    handler = type('BoundMockHandler', (MockHandler,), {'settings': settings})
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), handler)
+    print("Mock ECB ticket finder", flush=True)
+    print("=" * 60)
+    print(f"[OK] Listening on http://127.0.0.1:{args.port}")
+    print(f"Point the engines at it with TICKETFINDER_BASE_URL=http://127.0.0.1:{args.port}")
+    print("Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n\nStopping - {settings.stats}")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
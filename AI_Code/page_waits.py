@@ -0,0 +1,62 @@
+"""
+Wait helpers for the ticket finder result page
+Return as soon as the result (or the "No Record Available" page) is rendered
+instead of sleeping a fixed amount after every search
+"""
+
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+NOT_FOUND_MARKER = 'No Record Available'
+
+# One script call per poll: returns 'FOUND', 'NOT_FOUND' or null while still loading
+RESULT_STATE_JS = """
+if (document.readyState === 'loading') { return null; }
+if (document.querySelector('#vioContent, #infraDetails')) { return 'FOUND'; }
+var body = document.body;
+if (body && body.innerText.indexOf(arguments[0]) !== -1) { return 'NOT_FOUND'; }
+return null;
+"""
+
+
+class result_page_ready:
+    """Expected condition: the result tables or the not-found marker are on the page"""
+
+    def __call__(self, driver):
+        try:
+            return driver.execute_script(RESULT_STATE_JS, NOT_FOUND_MARKER) or False
+        except WebDriverException:
+            # Page is mid-navigation; try again on the next poll
+            return False
+
+
+def wait_for_results(driver, timeout=10, poll_frequency=0.1):
+    """
+    Wait for the result page after clicking Search
+
+    Args:
+        driver: Selenium WebDriver
+        timeout: Ceiling in seconds before giving up
+        poll_frequency: Seconds between checks
+
+    Returns:
+        (state, seconds) where state is 'FOUND', 'NOT_FOUND' or 'TIMEOUT'
+    """
+    start = time.perf_counter()
+    try:
+        state = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(result_page_ready())
+    except TimeoutException:
+        state = 'TIMEOUT'
+    return state, time.perf_counter() - start
+
+
+def latency_summary(results):
+    """Return (count, average_ms, p95_ms) of page_ready_ms values, or None if there are none"""
+    values = sorted(ms for ms in (r.get('page_ready_ms') for r in results) if ms is not None)
+    if not values:
+        return None
+    p95 = values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))]
+    return len(values), sum(values) / len(values), p95
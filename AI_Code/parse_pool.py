@@ -0,0 +1,205 @@
+"""
+Parallel parsing stage - result pages are parsed in worker processes
+Fetchers (threads pulling pages off the network, the archive or disk) put raw
+HTML on a bounded queue; a feeder groups it into chunks for a
+ProcessPoolExecutor and results come back in the order the pages were put, so
+bulk jobs use every core instead of the one that also does the fetching
+
+    python parse_pool.py dumps/*.html --workers 4
+    python parse_pool.py dumps/ --scaling
+"""
+
+import argparse
+import json
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from result_parser import parse_result_html
+
+
+CHUNK_SIZE = 32  # Pages per task - keeps inter-process overhead well below parse time
+FLUSH_SECONDS = 0.05  # Send a partial chunk when fetchers go quiet for this long
+_DONE = object()
+
+
+def parse_chunk(items):
+    """
+    Parse one chunk of pages (runs in a worker process)
+
+    Args:
+        items: (summons_number, html, extra) tuples; extra is merged into the result,
+            and html None means the page could not be fetched (extra['error'] says why)
+    """
+    results = []
+    for summons_number, html, extra in items:
+        extra = dict(extra or {})
+        if html is None:
+            result = {'summons_number': summons_number, 'status': 'ERROR',
+                      'error': extra.pop('error', 'No page')}
+        else:
+            result = parse_result_html(html, summons_number)
+        result.update(extra)
+        results.append(result)
+    return results
+
+
+class ParsePool:
+    def __init__(self, workers=None, chunk_size=CHUNK_SIZE, max_pending=None):
+        """
+        Args:
+            workers: Parser processes (default: one per CPU core)
+            chunk_size: Pages sent to a worker at a time
+            max_pending: Pages allowed to wait for a worker before put() blocks
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._pages = queue.Queue(maxsize=max_pending or self.workers * self.chunk_size * 4)
+        # Futures in submission order; bounded so a slow consumer holds back the feeder
+        self._chunks = queue.Queue(maxsize=self.workers * 4)
+        self.pages = 0
+        self._feeder = threading.Thread(target=self._feed, daemon=True)
+        self._feeder.start()
+
+    def put(self, summons_number, html, extra=None):
+        """Hand one fetched page to the parsers (safe to call from several fetcher threads)"""
+        self._pages.put((summons_number, html, extra))
+
+    def finish(self):
+        """No more pages - call once every fetcher is done"""
+        self._pages.put(_DONE)
+
+    def _submit(self, chunk):
+        self._chunks.put(self.executor.submit(parse_chunk, chunk))
+        self.pages += len(chunk)
+
+    def _feed(self):
+        chunk = []
+        while True:
+            try:
+                item = self._pages.get(timeout=FLUSH_SECONDS)
+            except queue.Empty:
+                if chunk:
+                    self._submit(chunk)
+                    chunk = []
+                continue
+            if item is _DONE:
+                break
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                self._submit(chunk)
+                chunk = []
+        if chunk:
+            self._submit(chunk)
+        self._chunks.put(_DONE)
+
+    def results(self):
+        """Yield parsed results in the order the pages were put, until finish()"""
+        while True:
+            future = self._chunks.get()
+            if future is _DONE:
+                return
+            yield from future.result()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parse_pages(pages, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Parse (summons_number, html, extra) tuples in parallel, yielding results in input order
+
+    pages is consumed on a fetcher thread, so it can be a generator that reads
+    from disk or the network while earlier pages are being parsed
+    """
+    errors = []
+    with ParsePool(workers, chunk_size) as pool:
+        def fetch():
+            try:
+                for summons_number, html, extra in pages:
+                    pool.put(summons_number, html, extra)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                pool.finish()
+
+        threading.Thread(target=fetch, daemon=True).start()
+        yield from pool.results()
+    if errors:
+        raise errors[0]
+
+
+SUMMONS_IN_NAME_RE = re.compile(r'0?\d{9}')
+
+
+def read_dump(path):
+    """(summons_number, html, extra) for a saved result page; the number comes from the file name"""
+    match = SUMMONS_IN_NAME_RE.search(path.stem)
+    summons_number = match.group(0) if match else path.stem
+    try:
+        return summons_number, path.read_text(encoding='utf-8', errors='replace'), {'source_file': str(path)}
+    except OSError as e:
+        return summons_number, None, {'source_file': str(path), 'error': str(e)}
+
+
+def find_dumps(paths):
+    files = []
+    for path in map(Path, paths):
+        files += sorted(path.rglob('*.htm*')) if path.is_dir() else [path]
+    return files
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Parse saved result pages across all CPU cores")
+    parser.add_argument("paths", nargs="+", help="HTML files or directories of them")
+    parser.add_argument("--workers", type=int, help="Parser processes (default: one per CPU core)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Pages per worker task")
+    parser.add_argument("--scaling", action="store_true", help="Time 1, 2, 4... workers instead of saving results")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    files = find_dumps(args.paths)
+    if not files:
+        print("No HTML files found")
+        return
+    print(f"Parsing {len(files)} pages...", flush=True)
+
+    if args.scaling:
+        most = args.workers or os.cpu_count() or 1
+        counts = sorted({most} | {2 ** i for i in range(8) if 2 ** i < most})
+        baseline = None
+        for workers in counts:
+            start = time.perf_counter()
+            count = sum(1 for _ in parse_pages(map(read_dump, files), workers, args.chunk_size))
+            rate = count / (time.perf_counter() - start)
+            baseline = baseline or rate
+            print(f"  {workers:>2} worker(s): {rate:8.0f} pages/s  ({rate / baseline:.1f}x)")
+        return
+
+    start = time.perf_counter()
+    results = list(parse_pages(map(read_dump, files), args.workers, args.chunk_size))
+    seconds = time.perf_counter() - start
+    print(f"[OK] {len(results)} pages in {seconds:.1f}s ({len(results) / max(seconds, 1e-9):.0f} pages/s)")
+
+    json_file = f'summons_results_parsed_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+    with open(json_file, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"JSON: {json_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,13 @@ This is Phase 4 of the Master Plan: Case Analyzer
 import pandas as pd
 from datetime import datetime
 
+from summons_record import load_records, records_frame
+
 def analyze_precedents(excel_file='../summons_results_v2_20260103_004526.xlsx'):
     """Analyze violations to find precedent cases"""
 
-    df = pd.read_excel(excel_file)
+    # Typed columns (balance_numeric, hearing_date_parsed); multi-charge summons count under their first charge
+    df = records_frame(load_records(excel_file))
 
     print('=' * 100)
     print('PRECEDENT ANALYSIS - Finding Winning Patterns')
@@ -54,20 +57,10 @@ def analyze_precedents(excel_file='../summons_results_v2_20260103_004526.xlsx'):
 
         if defaulted > 0:
             defaulted_summons = code_cases[code_cases['hearing_result'] == 'DEFAULTED']['summons_number'].tolist()
-            defaulted_balance = code_cases[code_cases['hearing_result'] == 'DEFAULTED']['balance_due'].tolist()
             print(f'  Defaulted summons: {", ".join(map(str, defaulted_summons))}')
 
             # Calculate total at risk
-            def parse_balance(val):
-                if pd.isna(val) or val == '' or val == '0.00':
-                    return 0.0
-                val_str = str(val).replace('$', '').replace(',', '').strip()
-                try:
-                    return float(val_str)
-                except:
-                    return 0.0
-
-            total_at_risk = sum(parse_balance(b) for b in defaulted_balance)
+            total_at_risk = code_cases[code_cases['hearing_result'] == 'DEFAULTED']['balance_numeric'].sum()
             if total_at_risk > 0:
                 print(f'  Total at risk: ${total_at_risk:,.2f}')
 
@@ -120,7 +113,7 @@ def analyze_precedents(excel_file='../summons_results_v2_20260103_004526.xlsx'):
             print(f'    Status: {status}')
 
             # Check if within 75-day window
-            hearing_date = pd.to_datetime(row['hearing_date'], format='%m/%d/%Y')
+            hearing_date = row['hearing_date_parsed']
             days_since = (datetime.now() - hearing_date).days
             if days_since <= 75:
                 print(f'    [URGENT] Within 75-day window ({75-days_since} days left)')
@@ -141,7 +134,7 @@ def analyze_precedents(excel_file='../summons_results_v2_20260103_004526.xlsx'):
             print('   consistency and equal application of law, these violations')
             print('   should also be dismissed."')
 
-            total_at_risk = defaulted_adg4['balance_due'].apply(lambda x: float(str(x).replace('$', '').replace(',', '').strip()) if x and str(x) not in ['nan', '0.00'] else 0).sum()
+            total_at_risk = defaulted_adg4['balance_numeric'].sum()
             print(f'\n  Potential savings if argument succeeds: ${total_at_risk:,.2f}')
 
     print('\n\n' + '=' * 100)
@@ -0,0 +1,161 @@
+"""
+Adaptive politeness controller shared by all lookup engines
+Spaces request starts by a delay that shrinks slowly while the ticket finder
+is healthy and doubles as soon as it slows down, errors, throttles (HTTP
+429/5xx) or serves a captcha-like page (AIMD, as in TCP congestion control)
+"""
+
+import threading
+import time
+
+
+# Text that suggests an anti-bot / throttle page instead of a result page
+BLOCKED_MARKERS = (
+    'captcha',
+    'access denied',
+    'request rejected',
+    'unusual traffic',
+    'too many requests',
+)
+
+
+# Error text from the local chromedriver/browser connection (a crashed or
+# closed driver), which says nothing about the ticket finder itself
+LOCAL_DRIVER_MARKERS = (
+    '127.0.0.1',
+    'localhost',
+    '[::1]',
+    'chrome not reachable',
+)
+
+
+def looks_blocked(html):
+    """True if the page looks like a captcha or throttle page"""
+    text = (html or '').lower()
+    return any(marker in text for marker in BLOCKED_MARKERS)
+
+
+def is_local_driver_error(error):
+    """True if a lookup error came from the local browser driver rather than the site"""
+    error = str(error or '').lower()
+    return any(marker in error for marker in LOCAL_DRIVER_MARKERS)
+
+
+def is_throttle_error(error):
+    """True if a lookup error means the server is overloaded or pushing back"""
+    error = str(error or '').lower()
+    if is_local_driver_error(error):
+        return False
+    if 'http 429' in error or 'http 5' in error:
+        return True
+    return any(word in error for word in ('timeout', 'timed out', 'captcha', 'connection'))
+
+
+class AdaptiveRateController:
+    def __init__(self, initial_delay=2.0, min_delay=0.5, max_delay=30.0,
+                 step=0.1, backoff=2.0, slow_factor=2.5, slow_floor=1.0, max_slow_backoffs=3):
+        """
+        Args:
+            initial_delay: Starting gap in seconds between request starts
+            min_delay: Fastest allowed pace (seconds between requests)
+            max_delay: Slowest pace after repeated back-offs
+            step: Seconds taken off the delay after each healthy response
+            backoff: Factor the delay is multiplied by on a slow/failed response
+            slow_factor: A response slower than this multiple of the typical
+                latency counts as a slowdown
+            slow_floor: Responses faster than this (seconds) never count as slow
+            max_slow_backoffs: Back-offs in a row that slowness alone may cause;
+                after that a slow response is treated as the new normal
+        """
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = min(max(initial_delay, min_delay), max_delay)
+        self.step = step
+        self.backoff = backoff
+        self.slow_factor = slow_factor
+        self.slow_floor = slow_floor
+        self.max_slow_backoffs = max_slow_backoffs
+
+        self.requests = 0
+        self.errors = 0
+        self.throttles = 0
+        self.backoffs = 0
+        self.typical_latency = None
+        self._slow_streak = 0
+        self._total_latency = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Claim the next request slot; returns seconds to wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self.delay
+            return start - now
+
+    def wait(self):
+        """Block until this thread may send its next request"""
+        pause = self.reserve()
+        if pause > 0:
+            time.sleep(pause)
+
+    def record(self, latency, ok=True, throttled=False):
+        """
+        Feed back one response
+
+        Args:
+            latency: Seconds the request took
+            ok: False if the lookup failed
+            throttled: True for HTTP 429/5xx, timeouts or captcha-like pages
+        """
+        with self._lock:
+            self.requests += 1
+            self._total_latency += latency
+            if not ok:
+                self.errors += 1
+            if throttled:
+                self.throttles += 1
+
+            slow = (self.typical_latency is not None and latency > self.slow_floor and
+                    latency > self.slow_factor * self.typical_latency)
+            self._slow_streak = self._slow_streak + 1 if slow and not throttled else 0
+
+            if throttled or (slow and self._slow_streak <= self.max_slow_backoffs):
+                self.delay = min(self.max_delay, max(self.delay, self.step) * self.backoff)
+                self.backoffs += 1
+            elif ok:
+                self.delay = max(self.min_delay, self.delay - self.step)
+
+            # Every successful response counts, slow ones too, so the typical
+            # latency follows the site when it settles at a different speed
+            if ok and not throttled:
+                if self.typical_latency is None:
+                    self.typical_latency = latency
+                else:
+                    self.typical_latency = 0.8 * self.typical_latency + 0.2 * latency
+
+    def record_result(self, result, latency):
+        """Feed back a lookup result dict (status / error as produced by the engines)"""
+        status = result.get('status')
+        throttled = ((status == 'ERROR' and is_throttle_error(result.get('error')))
+                     or is_throttle_error(result.get('escalation_reason')))
+        self.record(latency, ok=status != 'ERROR', throttled=throttled)
+
+    def summary(self):
+        """One-line description of how the run was paced"""
+        if not self.requests:
+            return "Rate control: no requests made"
+        avg = self._total_latency / self.requests
+        return (f"Rate control: {self.requests} requests, avg latency {avg:.2f}s, "
+                f"error rate {self.errors / self.requests:.0%}, {self.backoffs} back-off(s), "
+                f"final delay {self.delay:.2f}s")
+
+
+def timed_lookup(controller, lookup_fn, summons_number):
+    """Wait for a slot, run one lookup and report its outcome to the controller"""
+    controller.wait()
+    start = time.perf_counter()
+    result = lookup_fn(summons_number)
+    controller.record_result(result, time.perf_counter() - start)
+    return result
@@ -0,0 +1,230 @@
+"""
+Local SQLite cache of parsed lookup results, keyed by summons number
+Terminal cases (dismissed, paid off) are kept for a long time; pending hearings
+and open balances expire quickly so they are re-checked on the next run
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from site_config import CACHE_DIR
+from summons_record import SummonsRecord, as_record, as_result
+
+
+DEFAULT_CACHE_PATH = CACHE_DIR / "lookup_cache.sqlite"
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# How long a cached result stays fresh, by record state (seconds)
+STATE_TTLS = {
+    'terminal': 365 * DAY,   # Dismissed / paid with nothing scheduled - effectively permanent
+    'open': 3 * DAY,         # Decided with a balance owed - penalties can still be added
+    'pending': 12 * HOUR,    # Hearing scheduled or not yet decided
+    'not_found': DAY,        # May show up once the summons is entered into the system
+    'error': 0,              # Never served from cache
+}
+
+
+def record_state(result, now=None):
+    """
+    Classify a lookup result (flat dict or SummonsRecord) for caching and scheduling
+
+    Returns:
+        'terminal', 'open', 'pending', 'not_found' or 'error'
+    """
+    return as_record(result).state(now)
+
+
+class ResultCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "summons_number TEXT PRIMARY KEY, "
+            "state TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL, "
+            "record TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS discovered ("
+            "summons_number TEXT PRIMARY KEY, "
+            "query TEXT NOT NULL, "
+            "first_seen REAL NOT NULL, "
+            "last_seen REAL NOT NULL, "
+            "record TEXT NOT NULL)"
+        )
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, summons_number, max_age=None):
+        """
+        Return the cached result if it is still fresh, else None
+
+        Args:
+            max_age: Optional ceiling in seconds that overrides longer state TTLs
+        """
+        row = self.conn.execute(
+            "SELECT state, fetched_at, record FROM results WHERE summons_number = ?",
+            (str(summons_number).strip(),)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        state, fetched_at, record = row
+        ttl = STATE_TTLS.get(state, 0)
+        if max_age is not None:
+            ttl = min(ttl, max_age)
+        if time.time() - fetched_at > ttl:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        result = json.loads(record)
+        result['from_cache'] = True
+        return result
+
+    def stored(self, summons_number):
+        """Last stored result regardless of age (for scheduling) as a SummonsRecord, or None"""
+        row = self.conn.execute(
+            "SELECT record FROM results WHERE summons_number = ?",
+            (str(summons_number).strip(),)
+        ).fetchone()
+        return SummonsRecord.from_result(json.loads(row[0])) if row else None
+
+    def put(self, result):
+        """Store a lookup result, flat dict or SummonsRecord (errors are not cached)"""
+        state = record_state(result)
+        if not STATE_TTLS.get(state):
+            return
+        result = as_result(result)
+        record = {k: v for k, v in result.items() if k not in ('from_cache', 'row_number')}
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (summons_number, state, fetched_at, record) VALUES (?, ?, ?, ?)",
+            (str(result['summons_number']).strip(), state, time.time(), json.dumps(record))
+        )
+        self.conn.commit()
+
+    def put_many(self, results, fetched_at=None):
+        """
+        Store many lookup results in one transaction (errors are skipped)
+
+        Args:
+            fetched_at: Optional fetch time (epoch seconds) per result, for results
+                rebuilt from old pages; a stored row that is newer is kept
+        """
+        now = time.time()
+        rows = []
+        for idx, result in enumerate(results):
+            state = record_state(result)
+            if not STATE_TTLS.get(state):
+                continue
+            result = as_result(result)
+            record = {k: v for k, v in result.items() if k not in ('from_cache', 'row_number')}
+            when = fetched_at[idx] if fetched_at is not None else now
+            rows.append((str(result['summons_number']).strip(), state, when, json.dumps(record)))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO results (summons_number, state, fetched_at, record) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(summons_number) DO UPDATE SET "
+                "state = excluded.state, fetched_at = excluded.fetched_at, record = excluded.record "
+                "WHERE excluded.fetched_at >= results.fetched_at",
+                rows
+            )
+        return len(rows)
+
+    def record_discovered(self, rows, query):
+        """
+        Upsert summons found by a respondent / permittee / address search
+
+        Args:
+            rows: Dicts with at least 'summons_number' (the list page columns)
+            query: Description of the search that found them
+
+        Returns:
+            Summons numbers not seen by any earlier discovery search
+        """
+        now = time.time()
+        numbers = [str(row['summons_number']).strip() for row in rows]
+        known = set()
+        for start in range(0, len(numbers), 500):
+            chunk = numbers[start:start + 500]
+            known.update(r[0] for r in self.conn.execute(
+                f"SELECT summons_number FROM discovered WHERE summons_number IN ({','.join('?' * len(chunk))})",
+                chunk
+            ))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO discovered (summons_number, query, first_seen, last_seen, record) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(summons_number) DO UPDATE SET "
+                "query = excluded.query, last_seen = excluded.last_seen, record = excluded.record",
+                [(number, query, now, now, json.dumps(row)) for number, row in zip(numbers, rows)]
+            )
+        return [number for number in numbers if number not in known]
+
+    def discovered_numbers(self):
+        """Every summons number found by discovery searches, oldest first"""
+        return [r[0] for r in self.conn.execute("SELECT summons_number FROM discovered ORDER BY first_seen")]
+
+    def close(self):
+        self.conn.close()
+
+
+def cached_batch(cache, summons_list, fetch_batch, max_age=None, force=False):
+    """
+    Run a batch lookup through the cache
+
+    Args:
+        cache: ResultCache
+        summons_list: Summons numbers in sheet order
+        fetch_batch: Callable that looks up a list of summons and returns results
+        max_age: Optional ceiling in seconds on cached entries
+        force: Ignore cached entries (fresh results are still stored)
+
+    Returns:
+        SummonsRecords in the original order, with row_number matching the sheet
+        (each result is parsed once here, for the cache and everything after it)
+    """
+    cached = {}
+    if not force:
+        for summons in summons_list:
+            hit = cache.get(summons, max_age=max_age)
+            if hit is not None:
+                cached[summons] = hit
+
+    to_fetch = [s for s in summons_list if s not in cached]
+    print(f"Cache: {len(cached)} fresh, {len(to_fetch)} to look up")
+
+    fetched = {}
+    if to_fetch:
+        for result in fetch_batch(to_fetch):
+            record = as_record(result)
+            if not record.get('from_cache'):
+                cache.put(record)
+            fetched[result['summons_number']] = record
+
+    results = []
+    for idx, summons in enumerate(summons_list, 1):
+        record = as_record(cached.get(summons) or fetched.get(summons) or {
+            'summons_number': summons, 'status': 'ERROR', 'error': 'No result returned'
+        })
+        record.set_field('row_number', idx + 4)
+        results.append(record)
+    return results
+
+
+def max_age_arg(value):
+    """argparse type for --max-age: plain hours, or a number with an h/d suffix"""
+    value = str(value).strip().lower()
+    if value.endswith('d'):
+        return float(value[:-1]) * DAY
+    if value.endswith('h'):
+        return float(value[:-1]) * HOUR
+    return float(value) * HOUR
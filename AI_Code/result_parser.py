@@ -0,0 +1,152 @@
+"""
+Parser for ticket finder result pages
+Shared by the Selenium v2 engine and the HTTP/hybrid engine so both produce the same keys
+
+Two backends collect the same sections: lxml (C parser, XPath straight to the
+result tables) and BeautifulSoup's html.parser. lxml is used when installed
+"""
+
+import re
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from summons_record import SummonsRecord
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    lxml_html = None
+
+
+NOT_FOUND_MARKER = 'No Record Available'
+BUTTON_TEXT = ['Hearing Locations', 'One Click', 'How To Pay']
+RESULT_SECTION_RE = re.compile(r'id\s*=\s*["\']?(vioContent|infraDetails)\b')
+
+if lxml_html is not None:
+    # Same text as get_text(strip=True): script/style/template contents are skipped
+    _CELL_TEXT = etree.XPath('.//text()[not(ancestor::script or ancestor::style or ancestor::template)]')
+    _CASE_ROWS = etree.XPath('(//table[@id="vioContent"])[1]//tr')
+    _DETAIL_ROWS = etree.XPath('//table[@id="details"]//tr')
+    _CHARGE_ROWS = etree.XPath('((//div[@id="infraDetails"])[1]//table)[1]//tr')
+    _CELLS = etree.XPath('.//td')
+
+DEFAULT_BACKEND = 'lxml' if lxml_html is not None else 'bs4'
+
+
+def has_result_sections(html):
+    """True if the page is a real result page (details found or explicit not-found)"""
+    if not html:
+        return False
+    if NOT_FOUND_MARKER in html:
+        return True
+    return RESULT_SECTION_RE.search(html) is not None
+
+
+def collect_sections(html, backend=None):
+    """
+    Pull the raw cell text out of the result page sections
+
+    Args:
+        backend: 'lxml' or 'bs4' (default: lxml when installed)
+
+    Returns:
+        dict with 'not_found', 'case' and 'details' ([label, value] rows) and
+        'charges' (cell text of every charge row after the header)
+    """
+    if (backend or DEFAULT_BACKEND) == 'lxml':
+        return collect_sections_lxml(html)
+    return collect_sections_bs4(html)
+
+
+def _text(element):
+    return ''.join(text.strip() for text in _CELL_TEXT(element))
+
+
+def collect_sections_lxml(html):
+    """collect_sections() on the lxml tree - only the three result sections are visited"""
+    sections = {'not_found': NOT_FOUND_MARKER in html, 'case': [], 'details': [], 'charges': []}
+    if sections['not_found'] or not html.strip():
+        return sections
+
+    doc = lxml_html.document_fromstring(html)
+    for key, rows in (('case', _CASE_ROWS(doc)), ('details', _DETAIL_ROWS(doc))):
+        for row in rows:
+            cells = _CELLS(row)
+            if len(cells) >= 2:
+                sections[key].append([_text(cells[0]), _text(cells[1])])
+
+    for row in _CHARGE_ROWS(doc)[1:]:  # Skip header
+        sections['charges'].append([_text(cell) for cell in _CELLS(row)[:4]])
+
+    return sections
+
+
+def collect_sections_bs4(html):
+    """collect_sections() with BeautifulSoup's pure-Python html.parser"""
+    sections = {'not_found': NOT_FOUND_MARKER in html, 'case': [], 'details': [], 'charges': []}
+    if sections['not_found']:
+        return sections
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Case Details table (id="vioContent")
+    case_details = soup.find('table', {'id': 'vioContent'})
+    if case_details:
+        for row in case_details.find_all('tr'):
+            cells = row.find_all('td')
+            if len(cells) >= 2:
+                sections['case'].append([cells[0].get_text(strip=True), cells[1].get_text(strip=True)])
+
+    # More Details tables (all tables with id="details")
+    for table in soup.find_all('table', {'id': 'details'}):
+        for row in table.find_all('tr'):
+            cells = row.find_all('td')
+            if len(cells) >= 2:
+                sections['details'].append([cells[0].get_text(strip=True), cells[1].get_text(strip=True)])
+
+    # Explanation of Charges (even if hidden)
+    charges_div = soup.find('div', {'id': 'infraDetails'})
+    if charges_div:
+        charges_table = charges_div.find('table')
+        if charges_table:
+            for row in charges_table.find_all('tr')[1:]:  # Skip header
+                sections['charges'].append([cell.get_text(strip=True) for cell in row.find_all('td')[:4]])
+
+    return sections
+
+
+def build_record(sections, summons_number):
+    """Turn collected sections into a SummonsRecord"""
+    return SummonsRecord.from_sections(sections, summons_number, BUTTON_TEXT, NOT_FOUND_MARKER)
+
+
+def build_result(sections, summons_number):
+    """Turn collected sections into the flat result dict used by every engine"""
+    return build_record(sections, summons_number).to_result()
+
+
+def parse_record(html, summons_number, backend=None):
+    """Typed SummonsRecord for a result page (status ERROR if the page could not be read)"""
+    try:
+        return build_record(collect_sections(html, backend), summons_number)
+    except Exception as e:
+        return SummonsRecord.from_result({
+            'summons_number': summons_number,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'status': 'ERROR',
+            'error': str(e)
+        })
+
+
+def parse_result_html(html, summons_number, backend=None):
+    """Extract ALL violation details from a result page (lxml, or BeautifulSoup without it)"""
+    try:
+        return build_result(collect_sections(html, backend), summons_number)
+    except Exception as e:
+        return {
+            'summons_number': summons_number,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'status': 'ERROR',
+            'error': str(e)
+        }
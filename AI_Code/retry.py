@@ -0,0 +1,222 @@
+"""
+Retry, back-off and circuit breaker for ticket finder lookups
+Transient failures (timeouts, 5xx, stale elements, session resets) are retried
+with jittered exponential back-off; when the site is clearly down the breaker
+pauses the whole batch instead of turning every remaining summons into an ERROR
+"""
+
+import random
+import threading
+import time
+
+from rate_control import is_local_driver_error, timed_lookup
+
+
+# Error text for failures worth retrying
+RETRYABLE_MARKERS = (
+    'timeout',
+    'timed out',
+    'http 429',
+    'http 5',
+    'stale element',
+    'invalid session id',
+    'session deleted',
+    'no such window',
+    'connection',
+    'reset',
+    'not ready',
+    'captcha',
+    'no browser available',
+)
+
+
+def is_retryable(result):
+    """True if the lookup failed in a way that may succeed on another attempt"""
+    if result.get('status') != 'ERROR':
+        return False
+    error = str(result.get('error', '')).lower()
+    # A dead local driver ("connection refused" to 127.0.0.1) will not answer a retry
+    if is_local_driver_error(error):
+        return False
+    return any(marker in error for marker in RETRYABLE_MARKERS)
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=3, base_delay=2.0, max_delay=30.0):
+        """
+        Args:
+            max_attempts: Total tries per summons (1 = no retries)
+            base_delay: Back-off before the first retry (seconds)
+            max_delay: Cap on any single back-off
+        """
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt):
+        """Full-jitter exponential back-off after the given (1-based) failed attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    TRIAL_POLL = 1.0  # How often callers held back during a trial check again
+
+    def __init__(self, failure_threshold=5, cooldown=60.0, max_cooldown=600.0):
+        """
+        Closed -> open after failure_threshold failures in a row; once the
+        cooldown ends the breaker is half-open and lets exactly one trial
+        request through. The trial succeeding closes it, failing reopens it
+        with a doubled cooldown
+
+        Args:
+            failure_threshold: Consecutive retryable failures that open the breaker
+            cooldown: Seconds the batch pauses once the breaker opens
+            max_cooldown: Cap for the cooldown, which doubles each time a trial request fails
+        """
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self._trial_out = False
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Ask to send a request
+
+        Returns:
+            (seconds to wait before asking again, is_trial) - (0, False) when
+            closed, (0, True) for the one caller that sends the half-open trial
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0, False
+            pause = self.opened_at + self.cooldown - time.monotonic()
+            if pause > 0:
+                return pause, False
+            if self._trial_out:
+                return self.TRIAL_POLL, False
+            self._trial_out = True
+            return 0.0, True
+
+    def wait(self):
+        """Block while the breaker is open; returns True if this caller sends the trial request"""
+        announced = False
+        while True:
+            pause, trial = self.reserve()
+            if pause <= 0:
+                return trial
+            if not announced and pause > self.TRIAL_POLL:
+                print(f"\n[PAUSED] Ticket finder looks down - waiting {pause:.0f}s before trying again", flush=True)
+                announced = True
+            time.sleep(pause)
+
+    def record_success(self, trial=False):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.cooldown = self.base_cooldown
+            self._trial_out = False
+
+    def record_failure(self, trial=False):
+        """
+        Args:
+            trial: The failed request was the half-open trial (from reserve()/wait());
+                failures of requests sent before the breaker opened never extend the pause
+        """
+        with self._lock:
+            self.failures += 1
+            if trial:
+                # Trial request after a pause failed - stay open for longer
+                self.opened_at = time.monotonic()
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._trial_out = False
+                self.trips += 1
+            elif self.opened_at is None and self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self.trips += 1
+
+    def end_trial(self, trial=True):
+        """The trial ended without saying whether the site is back (e.g. a local error); let another go"""
+        if trial:
+            with self._lock:
+                self._trial_out = False
+
+
+def lookup_with_retry(lookup_fn, summons_number, controller, policy=None, breaker=None):
+    """
+    Run one lookup with retries and circuit breaking
+
+    Args:
+        lookup_fn: Callable taking a summons number and returning a result dict
+        controller: rate_control.AdaptiveRateController pacing the requests
+        policy: RetryPolicy (default: 3 attempts)
+        breaker: Optional CircuitBreaker shared across the batch
+
+    Returns:
+        The last result, with 'attempts' set when more than one try was needed
+    """
+    policy = policy or RetryPolicy()
+    for attempt in range(1, policy.max_attempts + 1):
+        trial = breaker.wait() if breaker is not None else False
+
+        result = timed_lookup(controller, lookup_fn, summons_number)
+
+        if not is_retryable(result):
+            if breaker is not None and result.get('status') != 'ERROR':
+                breaker.record_success()
+            elif breaker is not None:
+                breaker.end_trial(trial)
+            break
+
+        if breaker is not None:
+            breaker.record_failure(trial)
+        if attempt < policy.max_attempts:
+            time.sleep(policy.backoff(attempt))
+
+    if attempt > 1:
+        result['attempts'] = attempt
+    return result
+
+
+def past_deadline(deadline):
+    """True once a time.monotonic() deadline (None = no deadline) has passed"""
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def requeue_errors(results, lookup_fn, controller, policy=None, breaker=None, on_result=None, deadline=None):
+    """
+    Give every summons that still ended in a retryable ERROR one more round at the end of the batch
+
+    Args:
+        on_result: Optional callback for each new result (e.g. journal.record)
+        deadline: Optional time.monotonic() after which no more summons are retried
+
+    Results are replaced in place; returns the number recovered
+    """
+    failed = [i for i, r in enumerate(results) if is_retryable(r)]
+    if not failed:
+        return 0
+
+    print(f"\nRequeueing {len(failed)} failed summons...")
+    recovered = 0
+    for i in failed:
+        if past_deadline(deadline):
+            print("Time budget used up - leaving the rest as errors")
+            break
+        old = results[i]
+        result = lookup_with_retry(lookup_fn, old['summons_number'], controller, policy, breaker)
+        if 'row_number' in old:
+            result['row_number'] = old['row_number']
+        result['requeued'] = True
+        results[i] = result
+        if on_result is not None:
+            on_result(result)
+        if result.get('status') != 'ERROR':
+            recovered += 1
+
+    print(f"Recovered {recovered} of {len(failed)} on requeue")
+    return recovered
@@ -1,6 +1,6 @@
-"""Run enhanced lookup using the driver we JUST downloaded"""
+"""Run enhanced lookup using the locally cached driver"""
 import sys
-import glob
+import argparse
 sys.stdout.reconfigure(line_buffering=True)
 
 from selenium import webdriver
@@ -8,21 +8,38 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from bs4 import BeautifulSoup
 import pandas as pd
 import json
 from datetime import datetime
+from driver_resolver import start_with_driver
+from site_config import SEARCH_HOME_URL
+from page_waits import wait_for_results, latency_summary
+from result_parser import has_result_sections, parse_result_html
+from summons_record import as_record
+from result_cache import ResultCache, max_age_arg
+from change_detect import changed_results, detect_changes, has_changes, print_changes, save_changes
+from checkpoint import RunJournal
+from history_store import HistoryStore
+from html_archive import HtmlArchive
+from tracking_sheet import read_summons
+from rate_control import AdaptiveRateController
+from retry import CircuitBreaker, lookup_with_retry, requeue_errors
+
+PAGE_TIMEOUT = 10  # Seconds to wait for the result page before giving up
+
+parser = argparse.ArgumentParser(description="Enhanced batch lookup (hearing dates and charges)")
+parser.add_argument("--max-age", type=max_age_arg, help="Re-fetch cached results older than this (hours, or e.g. 12h / 2d)")
+parser.add_argument("--force", action="store_true", help="Ignore cached results and look up every summons")
+parser.add_argument("--resume", action="store_true", help="Continue the last interrupted run from its journal")
+parser.add_argument("--no-archive", action="store_true", help="Do not keep the fetched result pages (html_archive.py)")
+parser.add_argument("--full-export", action="store_true", help="Write every summons to the results file, not just new and changed ones")
+args = parser.parse_args()
 
 print("NYC DOT ENHANCED BATCH - RUNNING NOW!", flush=True)
 print("=" * 60)
 
-# Use the driver we just downloaded
-driver_path = r'C:\Users\danek\.wdm\drivers\chromedriver\win64\143.0.7499.170\chromedriver-win32\chromedriver.exe'
-print(f"Using driver: {driver_path}\n")
-
 # Read summons
-df = pd.read_excel('../ML TRACKING.xlsx', header=None)
-summons_list = df.iloc[4:, 1].dropna().astype(str).str.strip().tolist()
+summons_list = read_summons('../ML TRACKING.xlsx')
 print(f"Found {len(summons_list)} summons to process\n")
 
 # Setup browser
@@ -31,22 +48,29 @@ chrome_options.add_argument('--headless')
 chrome_options.add_argument('--disable-blink-features=AutomationControlled')
 chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
 
-service = ChromeService(executable_path=driver_path)
-driver = webdriver.Chrome(service=service, options=chrome_options)
-wait = WebDriverWait(driver, 10)
+# Cached driver - only downloads if none is found locally, or Chrome was updated past it
+driver = start_with_driver(
+    'chrome', lambda path: webdriver.Chrome(service=ChromeService(executable_path=path), options=chrome_options))
+wait = WebDriverWait(driver, PAGE_TIMEOUT)
 
 print("[OK] Chrome initialized\n")
 print("Starting lookup...")
 print("=" * 60)
 
 results = []
+cache = ResultCache()
+archive = None if args.no_archive else HtmlArchive()
+journal = RunJournal.resume_or_start(summons_list, resume=args.resume)
+controller = AdaptiveRateController(initial_delay=2)  # Paces requests to how the server is coping
+breaker = CircuitBreaker()  # Pauses the batch if the site goes down
+print(f"Journal: {journal.path.name} (if interrupted, rerun with --resume)\n")
 
-for idx, summons in enumerate(summons_list, 1):
-    print(f"[{idx}/{len(summons_list)}] {summons}", end=' ', flush=True)
 
+def lookup_one(summons):
+    """Search one summons in the browser and parse the result page"""
     try:
         # Navigate and search
-        driver.get('https://a820-ecbticketfinder.nyc.gov/searchHome.action')
+        driver.get(SEARCH_HOME_URL)
 
         summons_input = wait.until(
             lambda d: d.find_element(By.NAME, "searchViolationObject.violationNo")
@@ -57,47 +81,20 @@ for idx, summons in enumerate(summons_list, 1):
         search_button = driver.find_element(By.CSS_SELECTOR, "input[value*='Search']")
         search_button.click()
 
-        import time
-        time.sleep(2)
+        state, seconds = wait_for_results(driver, PAGE_TIMEOUT)
 
-        # Parse results
+        # Parse results - only the result sections, same keys as summons_selenium_v2
         html = driver.page_source
-        result = {'summons_number': summons, 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        if archive is not None and has_result_sections(html):
+            archive.store(summons, html, source='browser')
+        result = parse_result_html(html, summons)
+        result['page_ready_ms'] = round(seconds * 1000)
 
-        if "No Record Available" in html:
-            result['status'] = 'NOT_FOUND'
+        if result['status'] == 'NOT_FOUND':
             print("[NOT FOUND]")
+        elif result['status'] != 'SUCCESS':
+            print(f"[{result['status']}]")
         else:
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Get all tables
-            for table in soup.find_all('table'):
-                for row in table.find_all('tr'):
-                    cells = row.find_all('td')
-                    if len(cells) >= 2:
-                        label = cells[0].get_text(strip=True).replace(':', '')
-                        value = cells[1].get_text(strip=True)
-                        if label and value and len(label) < 100:
-                            key = label.lower().replace(' ', '_').replace('/', '_')
-                            if not any(btn in value for btn in ['Hearing Locations', 'One Click', 'How To Pay']):
-                                result[key] = value
-
-            # Get charges
-            charges_div = soup.find('div', {'id': 'infraDetails'})
-            if charges_div:
-                charges_table = charges_div.find('table')
-                if charges_table:
-                    charge_rows = charges_table.find_all('tr')[1:]
-                    for row in charge_rows:
-                        cells = row.find_all('td')
-                        if cells and len(cells) >= 3:
-                            result['charge_code'] = cells[0].get_text(strip=True)
-                            result['charge_section'] = cells[1].get_text(strip=True)
-                            result['charge_description'] = cells[2].get_text(strip=True)
-                            if len(cells) > 3:
-                                result['charge_face_amount'] = cells[3].get_text(strip=True)
-
-            result['status'] = 'SUCCESS'
             print(f"[FOUND]")
             if 'balance_due' in result:
                 print(f"     Balance: {result['balance_due']}", end='')
@@ -105,41 +102,103 @@ for idx, summons in enumerate(summons_list, 1):
                 print(f", Hearing: {result['hearing_date']}", end='')
             print()
 
-        results.append(result)
-        time.sleep(2)  # Be nice to server
+        return result
 
     except Exception as e:
         print(f"[ERROR: {str(e)[:50]}]")
-        results.append({'summons_number': summons, 'status': 'ERROR', 'error': str(e)})
+        return {'summons_number': summons, 'status': 'ERROR', 'error': str(e)}
+
+
+for idx, summons in enumerate(summons_list, 1):
+    print(f"[{idx}/{len(summons_list)}] {summons}", end=' ', flush=True)
+
+    # Already done earlier in this run (journal is written after every summons)
+    if summons in journal.completed:
+        print(f"[DONE {journal.completed[summons].get('status')}]")
+        results.append(journal.completed[summons])
+        continue
+
+    # Terminal cases rarely change - reuse the cached result while it is fresh
+    cached = None if args.force else cache.get(summons, max_age=args.max_age)
+    if cached:
+        print(f"[CACHED {cached.get('status')}]")
+        results.append(cached)
+        continue
+
+    result = lookup_with_retry(lookup_one, summons, controller, breaker=breaker)
+    results.append(result)
+    journal.record(result)
+    cache.put(result)
+
+
+def record_requeued(result):
+    journal.record(result)
+    cache.put(result)
+
+
+requeue_errors(results, lookup_one, controller, breaker=breaker, on_result=record_requeued)
 
 driver.quit()
+cache.close()
+if archive is not None:
+    archive.close()
+print(controller.summary())
+print(f"\nCache hits: {cache.hits} | Looked up: {len(summons_list) - cache.hits}")
 
 # Save results (to parent directory)
 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 excel_file = f'../summons_results_v2_{timestamp}.xlsx'
 json_file = f'../summons_results_v2_{timestamp}.json'
 
-pd.DataFrame(results).to_excel(excel_file, index=False)
-with open(json_file, 'w') as f:
-    json.dump(results, f, indent=2)
+# Only new and changed summons go to the history and the delta report
+records = [as_record(r) for r in results]
+history = HistoryStore()
+changes = detect_changes(history.latest(), records, summons_list)
+history.append(changed_results(changes), run_id=journal.path.stem)
+history.close()
+print_changes(changes)
+if has_changes(changes):
+    save_changes(changes, f'../summons_changes_{timestamp}.json')
+
+# Unchanged summons are already in the history and the last export
+if args.full_export:
+    exported, exported_records = results, records
+else:
+    exported = changed_results(changes)
+    exported_records = [as_record(r) for r in exported]
+if exported:
+    pd.DataFrame(exported).to_excel(excel_file, index=False)
+    with open(json_file, 'w') as f:
+        json.dump(exported, f, indent=2)
+journal.finish()
 
 print("\n" + "=" * 60)
 print("COMPLETE!")
-print(f"Results: {excel_file}")
-print(f"JSON: {json_file}")
+if exported:
+    print(f"Results: {excel_file}")
+    print(f"JSON: {json_file}")
+else:
+    print("Nothing new or changed - no results file written (--full-export writes every summons)")
+if has_changes(changes):
+    print(f"Changes: ../summons_changes_{timestamp}.json")
 print("=" * 60)
 
-# Summary
-found = sum(1 for r in results if r.get('status') == 'SUCCESS')
-not_found = sum(1 for r in results if r.get('status') == 'NOT_FOUND')
-errors = sum(1 for r in results if r.get('status') == 'ERROR')
+# Summary (of what was written)
+found = sum(1 for r in exported if r.get('status') == 'SUCCESS')
+not_found = sum(1 for r in exported if r.get('status') == 'NOT_FOUND')
+errors = sum(1 for r in exported if r.get('status') == 'ERROR')
+
+print(f"Total: {len(exported)} | Found: {found} | Not Found: {not_found} | Errors: {errors}")
 
-print(f"Total: {len(results)} | Found: {found} | Not Found: {not_found} | Errors: {errors}")
+latency = latency_summary(results)
+if latency:
+    count, avg_ms, p95_ms = latency
+    print(f"Page-ready latency ({count} lookups): avg {avg_ms:.0f} ms, p95 {p95_ms:.0f} ms")
 
-with_balance = [r for r in results if r.get('balance_due', '0') not in ['0.00', '$0.00', '0', '']]
+with_balance = [r for r in exported_records if r.balance > 0]
 if with_balance:
     print(f"\nWith Outstanding Balance: {len(with_balance)}")
     for r in with_balance[:5]:
-        print(f"  {r['summons_number']}: {r.get('balance_due', '?')}")
+        print(f"  {r.summons_number}: ${r.balance:,.2f}")
     if len(with_balance) > 5:
         print(f"  ... and {len(with_balance) - 5} more")
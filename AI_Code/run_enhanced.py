@@ -1,5 +1,7 @@
 """Run the enhanced batch lookup with hearing dates and charges"""
 import sys
+import argparse
+from datetime import datetime
 sys.stdout.reconfigure(line_buffering=True)
 
 from summons_selenium_v2 import (
@@ -8,6 +10,30 @@ from summons_selenium_v2 import (
     save_results,
     print_summary
 )
+from selenium_pool import lookup_batch_pool
+from result_cache import ResultCache, cached_batch, max_age_arg
+from change_detect import changed_results, detect_changes, has_changes, print_changes, save_changes
+from checkpoint import RunJournal
+from history_store import HistoryStore
+from html_archive import HtmlArchive
+from incremental import is_settled, load_previous, split_incremental
+from scheduler import budget_arg, budget_deadline, load_known, plan_batch, print_plan, skipped_results
+
+parser = argparse.ArgumentParser(description="Enhanced batch lookup with hearing dates and charges")
+parser.add_argument("--workers", type=int, default=1, help="Number of browsers to run in parallel")
+parser.add_argument("--max-age", type=max_age_arg, help="Re-fetch cached results older than this (hours, or e.g. 12h / 2d)")
+parser.add_argument("--force", action="store_true", help="Ignore cached results and look up every summons")
+parser.add_argument("--resume", action="store_true", help="Continue the last interrupted run from its journal")
+parser.add_argument("--incremental", action="store_true", help="Carry dismissed/paid summons forward into the output instead of looking them up")
+parser.add_argument("--budget", type=budget_arg, help="Only look up this many summons (e.g. 150) or for this long (e.g. 45m), most urgent first")
+parser.add_argument("--hearing-days", type=int, default=14, help="Hearings within this many days are looked up first")
+parser.add_argument("--lean", action="store_true", help="Block images, CSS, fonts and analytics in the browsers")
+parser.add_argument("--recycle-every", type=int, default=200, help="Restart each browser after this many lookups (0 = never)")
+parser.add_argument("--max-memory", type=int, help="Restart a browser whose processes use more than this many MB (needs psutil)")
+parser.add_argument("--reuse-session", action="store_true", help="Search from a warm page instead of reloading it per summons")
+parser.add_argument("--no-archive", action="store_true", help="Do not keep the fetched result pages (html_archive.py)")
+parser.add_argument("--full-export", action="store_true", help="Write every summons to the results file, not just new and changed ones")
+args = parser.parse_args()
 
 print("NYC DOT Summons Enhanced Batch Lookup", flush=True)
 print("=" * 60)
@@ -19,16 +45,80 @@ print()
 
 summons_list = read_summons_from_excel('ML TRACKING.xlsx')
 print(f"\nFound {len(summons_list)} summons to process")
-print(f"Estimated time: ~{len(summons_list) * 3 // 60} minutes\n")
+print(f"Estimated time: ~{len(summons_list) * 3 // 60 // max(1, args.workers)} minutes\n")
 
 # Run in headless mode for speed
 lookup = None
+cache = ResultCache()
+archive = None if args.no_archive else HtmlArchive()
+journal = RunJournal.resume_or_start(summons_list, resume=args.resume)
+previous = load_previous() if args.incremental else []
+
+
+def fetch_batch(to_fetch):
+    global lookup
+    carried = []
+    if args.incremental:
+        to_fetch, carried = split_incremental(to_fetch, previous)
+        print(f"Incremental: {len(carried)} settled summons carried forward, {len(to_fetch)} to check")
+
+    # Most urgent first, so a short or budgeted run still covers what matters
+    known = load_known(cache, summons_list=to_fetch)
+    to_fetch, skipped = plan_batch(to_fetch, known, args.budget, args.workers, args.hearing_days)
+    print_plan(to_fetch, skipped, known, args.hearing_days)
+    deadline = budget_deadline(args.budget)
+
+    pending = journal.pending(to_fetch)
+    fresh = []
+    if pending and args.workers > 1:
+        fresh = lookup_batch_pool(pending, workers=args.workers, delay=2, journal=journal, lean=args.lean,
+                                  reuse_session=args.reuse_session, recycle_every=args.recycle_every or None,
+                                  max_rss_mb=args.max_memory, archive=archive, deadline=deadline)
+    elif pending:
+        lookup = SummonsSeleniumLookup(headless=True, lean=args.lean, reuse_session=args.reuse_session,
+                                       recycle_every=args.recycle_every or None, max_rss_mb=args.max_memory,
+                                       archive=archive)
+        fresh = lookup.lookup_batch(pending, delay=2, journal=journal, deadline=deadline)
+    if deadline is not None:
+        # Summons the time budget did not reach keep their last known result
+        done = {r['summons_number'] for r in fresh} | set(journal.completed)
+        skipped += [s for s in to_fetch if s not in done]
+        to_fetch = [s for s in to_fetch if s in done]
+    # Final results come from the journal so resumed and fresh lookups are merged
+    return journal.results_for(to_fetch, fresh) + skipped_results(skipped, known) + carried
+
+
 try:
-    lookup = SummonsSeleniumLookup(headless=True)
-    results = lookup.lookup_batch(summons_list, delay=2)
+    results = cached_batch(cache, summons_list, fetch_batch, max_age=args.max_age, force=args.force)
+
+    # Only new and changed summons go to the history and the delta report
+    history = HistoryStore()
+    try:
+        changes = detect_changes(history.latest(), results, summons_list)
+        history.append(changed_results(changes), run_id=journal.path.stem)
+    finally:
+        history.close()
+    print_changes(changes)
+    if has_changes(changes):
+        # Next to the results export, which save_results() writes to the current directory
+        changes_file = f'summons_changes_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+        save_changes(changes, changes_file)
+        print(f"Changes: {changes_file}")
+
+    # New and changed summons; --incremental also carries the settled ones forward
+    # (whether they came from the previous results or the cache)
+    exported = results if args.full_export else changed_results(changes) + [
+        r for r in results if args.incremental and r.get('from_cache') and is_settled(r)]
+    if exported:
+        save_results(exported)
+    else:
+        print("\nNothing new or changed - no results file written (--full-export writes every summons)")
+    print_summary(exported)
+    journal.finish()
 
-    df, excel_file = save_results(results)
-    print_summary(results)
+except KeyboardInterrupt:
+    print(f"\n\nInterrupted - progress saved to {journal.path.name}")
+    print("Run again with --resume to continue where it stopped")
 
 except Exception as e:
     print(f"\nError: {e}")
@@ -38,5 +128,8 @@ except Exception as e:
 finally:
     if lookup:
         lookup.close()
+    if archive is not None:
+        archive.close()
+    cache.close()
 
 print("\nDone!")
@@ -1,32 +1,26 @@
 """Run enhanced lookup using cached driver (no network needed)"""
 import sys
-import glob
 sys.stdout.reconfigure(line_buffering=True)
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options
+from driver_resolver import resolve_driver
 from summons_selenium_v2 import (
+    SummonsSeleniumLookup,
     read_summons_from_excel,
     save_results,
     print_summary
 )
 
-# Import the lookup class but we'll override the __init__
-from summons_selenium_v2 import SummonsSeleniumLookup
-
 print("NYC DOT Summons Enhanced Batch Lookup (OFFLINE MODE)", flush=True)
 print("=" * 60)
 print("Using cached Chrome driver...\n")
 
 # Find cached driver
-driver_paths = glob.glob(r'C:\Users\danek/.wdm/drivers/chromedriver/win64/*/chromedriver-win32/chromedriver.exe')
-if not driver_paths:
+driver_path = resolve_driver('chrome', offline=True)
+if not driver_path:
     print("ERROR: Cached Chrome driver not found!")
     print("Please run with internet connection once to download driver.")
     sys.exit(1)
 
-driver_path = driver_paths[0]
 print(f"Found driver: {driver_path}\n")
 
 # Read summons
@@ -34,26 +28,8 @@ summons_list = read_summons_from_excel('ML TRACKING.xlsx')
 print(f"Found {len(summons_list)} summons to process")
 print(f"Estimated time: ~{len(summons_list) * 3 // 60} minutes\n")
 
-# Create lookup instance with cached driver
+# The lookup resolves the same cached driver, so no network is needed
 print("Setting up browser...", flush=True)
-chrome_options = Options()
-chrome_options.add_argument('--headless')
-chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-chrome_options.add_experimental_option('useAutomationExtension', False)
-
-service = ChromeService(executable_path=driver_path)
-
-# Monkey-patch to use our driver
-original_init = SummonsSeleniumLookup.__init__
-
-def new_init(self, headless=True):
-    from selenium.webdriver.support.ui import WebDriverWait
-    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-    self.wait = WebDriverWait(self.driver, 10)
-    print("[OK] Chrome browser initialized\n")
-
-SummonsSeleniumLookup.__init__ = new_init
 
 lookup = None
 try:
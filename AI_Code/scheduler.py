@@ -0,0 +1,214 @@
+"""
+Lookup priority scheduler - most urgent summons first
+Orders a batch by what the last known result says about each summons, so a
+run that is cut short (or capped with --budget) has already refreshed the
+upcoming hearings and open balances instead of year-old dismissed cases:
+
+    0  hearing within the next N days (soonest first)
+    1  hearing already held but no result yet, or balance still owed (largest first)
+    2  new / never found / last lookup failed
+    3  pending further out
+    4  terminal - dismissed, paid, closed
+"""
+
+import argparse
+import json
+import re
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from history_store import load_latest
+from result_cache import ResultCache
+from summons_record import SummonsRecord, as_record, as_result
+from tracking_sheet import summons_key
+
+
+PRIORITY_LABELS = {
+    0: 'hearing soon',
+    1: 'awaiting result / open balance',
+    2: 'new or unknown',
+    3: 'pending',
+    4: 'terminal',
+}
+
+DEFAULT_HEARING_DAYS = 14
+SECONDS_PER_LOOKUP = 3  # Same rough figure the batch scripts use for their time estimate
+
+
+def load_results_file(path):
+    """Results from a previous run's .json or .xlsx output"""
+    if path.endswith('.json'):
+        with open(path, 'r') as f:
+            return json.load(f)
+    df = pd.read_excel(path, dtype=str)
+    return [{k: v for k, v in row.items() if pd.notna(v)} for row in df.to_dict('records')]
+
+
+def load_known(cache=None, results_file=None, summons_list=()):
+    """
+    Last known result per summons as a SummonsRecord, keyed by summons_key()
+
+    Starts from the given results file, else the lookup history (a run's
+    export only holds what changed); the cache wins over both because it is
+    updated on every run
+    """
+    known = {}
+    previous = load_results_file(results_file) if results_file else load_latest()
+    for result in previous:
+        if 'summons_number' in result:
+            known[summons_key(result['summons_number'])] = SummonsRecord.from_result(result)
+    if cache is not None:
+        for summons in summons_list:
+            stored = cache.stored(summons)
+            if stored is not None:
+                known[summons_key(summons)] = stored
+    return known
+
+
+def priority(result, now=None, hearing_days=DEFAULT_HEARING_DAYS):
+    """(tier, tie-break) for one summons (a load_known() record); lower sorts first"""
+    if result is None:
+        return 2, 0
+
+    now = now or datetime.now()
+    record = as_record(result)
+    state = record.state(now)
+    if state == 'pending':
+        hearing_date = record.hearing_at
+        if hearing_date is None:
+            return 3, 0
+        if hearing_date < now:
+            return 1, 0
+        if hearing_date <= now + timedelta(days=hearing_days):
+            return 0, (hearing_date - now).total_seconds()
+        return 3, (hearing_date - now).total_seconds()
+    if state == 'open':
+        return 1, -record.balance
+    if state == 'terminal':
+        return 4, 0
+    return 2, 0
+
+
+def schedule(summons_list, known, hearing_days=DEFAULT_HEARING_DAYS, now=None):
+    """Summons reordered by priority; sheet order is kept within a tier"""
+    now = now or datetime.now()
+    ranked = sorted(
+        enumerate(summons_list),
+        key=lambda item: (priority(known.get(summons_key(item[1])), now, hearing_days), item[0])
+    )
+    return [summons for _, summons in ranked]
+
+
+def budget_arg(value):
+    """argparse type for --budget: a lookup count ('150') or a time ('90s', '45m', '2h')"""
+    value = str(value).strip().lower()
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)\s*([smh]?)', value)
+    if not match:
+        raise argparse.ArgumentTypeError("use a lookup count like 150 or a time like 45m / 2h")
+    number, unit = float(match.group(1)), match.group(2)
+    if not unit:
+        return ('count', int(number))
+    return ('seconds', number * {'s': 1, 'm': 60, 'h': 3600}[unit])
+
+
+def budget_count(budget, workers=1, seconds_per_lookup=SECONDS_PER_LOOKUP):
+    """Number of lookups a --budget allows (None = no limit); an estimate for a time budget"""
+    if budget is None:
+        return None
+    kind, amount = budget
+    if kind == 'count':
+        return amount
+    return int(amount * max(1, workers) / seconds_per_lookup)
+
+
+def budget_deadline(budget):
+    """time.monotonic() at which a time --budget runs out (None without one)"""
+    if budget is None or budget[0] != 'seconds':
+        return None
+    return time.monotonic() + budget[1]
+
+
+def plan_batch(summons_list, known, budget=None, workers=1, hearing_days=DEFAULT_HEARING_DAYS,
+               estimate_time=False):
+    """
+    Order a batch and cut it to a count budget
+
+    A time budget is enforced while the batch runs (see budget_deadline());
+    with estimate_time it is cut at the estimated lookup count instead (previews)
+
+    Returns:
+        (to_look_up, skipped) - both in priority order
+    """
+    ordered = schedule(summons_list, known, hearing_days)
+    if budget is not None and budget[0] == 'seconds' and not estimate_time:
+        return ordered, []
+    limit = budget_count(budget, workers)
+    if limit is None:
+        return ordered, []
+    return ordered[:limit], ordered[limit:]
+
+
+def skipped_results(skipped, known):
+    """Last known results for summons left out by the budget (marked so they are not re-cached)"""
+    results = []
+    for summons in skipped:
+        result = dict(as_result(known.get(summons_key(summons))) or {
+            'summons_number': summons, 'status': 'ERROR', 'error': 'Not looked up (over --budget)'
+        })
+        result['summons_number'] = summons
+        result['from_cache'] = True
+        result['skipped_by_budget'] = True
+        results.append(result)
+    return results
+
+
+def print_plan(to_look_up, skipped, known, hearing_days=DEFAULT_HEARING_DAYS):
+    """Summary of how many summons of each priority will be looked up"""
+    now = datetime.now()
+    counts = {}
+    for summons in to_look_up:
+        tier = priority(known.get(summons_key(summons)), now, hearing_days)[0]
+        counts[tier] = counts.get(tier, 0) + 1
+
+    print(f"Lookup plan: {len(to_look_up)} to look up, {len(skipped)} skipped by budget")
+    for tier in sorted(counts):
+        print(f"  {PRIORITY_LABELS[tier]}: {counts[tier]}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Show the order a batch lookup would use")
+    parser.add_argument("--excel", default="ML TRACKING.xlsx", help="Excel file with summons in column B from row 5")
+    parser.add_argument("--results", help="Previous results .json/.xlsx (default: the lookup history)")
+    parser.add_argument("--budget", type=budget_arg, help="Lookup count (e.g. 150) or time (e.g. 45m)")
+    parser.add_argument("--hearing-days", type=int, default=DEFAULT_HEARING_DAYS, help="Window for 'hearing soon'")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    from summons_selenium_v2 import read_summons_from_excel
+
+    summons_list = read_summons_from_excel(args.excel)
+    print(f"Using previous results: {args.results or 'lookup history'}")
+
+    cache = ResultCache()
+    try:
+        known = load_known(cache, args.results, summons_list)
+    finally:
+        cache.close()
+
+    to_look_up, skipped = plan_batch(summons_list, known, args.budget, hearing_days=args.hearing_days,
+                                     estimate_time=True)
+    print_plan(to_look_up, skipped, known, args.hearing_days)
+    for position, summons in enumerate(to_look_up, 1):
+        result = as_result(known.get(summons_key(summons))) or {}
+        tier = priority(known.get(summons_key(summons)), hearing_days=args.hearing_days)[0]
+        print(f"{position:>4}. {summons:<14} {PRIORITY_LABELS[tier]:<32} "
+              f"hearing {result.get('hearing_date', '-'):<12} balance {result.get('balance_due', '-')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Parallel Selenium lookup - several headless browsers sharing one work queue
+Each worker owns a SummonsSeleniumLookup; results are merged back in input order
+"""
+
+import queue
+import threading
+import time
+
+from driver_health import driver_is_dead
+from rate_control import AdaptiveRateController, timed_lookup
+from retry import CircuitBreaker, RetryPolicy, is_retryable, past_deadline
+from summons_selenium_v2 import SummonsSeleniumLookup
+
+
+class SeleniumPool:
+    def __init__(self, workers=3, headless=True, delay=3, max_attempts=3,
+                 lookup_class=SummonsSeleniumLookup, journal=None, controller=None,
+                 lean=False, reuse_session=False, recycle_every=200, max_rss_mb=None, archive=None,
+                 deadline=None, retry_policy=None):
+        """
+        Args:
+            workers: Number of browsers to run at once
+            headless: Run browsers without a window
+            delay: Starting seconds each worker waits between its own lookups
+            max_attempts: Times a summons is tried after a crash or transient failure
+            lookup_class: Class used to start a browser (must provide lookup_summons/close)
+            journal: Optional checkpoint.RunJournal; each result is appended as soon as it is known
+            controller: Optional AdaptiveRateController shared by all workers
+            lean: Start each browser with DevTools request blocking (see lean_browsing.py)
+            reuse_session: Each browser searches from its warm page (see session_reuse.py)
+            recycle_every: Each browser restarts itself after this many lookups
+            max_rss_mb: Each browser restarts itself when its processes use more memory than this
+            archive: Optional html_archive.HtmlArchive shared by all browsers
+            deadline: Optional time.monotonic() after which workers take no new summons;
+                summons not reached are left out of the results
+            retry_policy: Optional retry.RetryPolicy for the back-off before a transient
+                failure is requeued (default: max_attempts tries)
+        """
+        self.workers = max(1, int(workers))
+        self.headless = headless
+        self.delay = delay
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=max_attempts)
+        self.max_attempts = self.retry_policy.max_attempts
+        self.lookup_class = lookup_class
+        self.journal = journal
+        self.lean = lean
+        self.reuse_session = reuse_session
+        self.recycle_every = recycle_every
+        self.max_rss_mb = max_rss_mb
+        self.archive = archive
+        self.deadline = deadline
+        # One controller paces the whole pool, so the site sees a single request rate
+        self.controller = controller or AdaptiveRateController(initial_delay=delay / self.workers)
+        self.breaker = CircuitBreaker()
+        self.restarts = 0
+        self._lock = threading.Lock()
+
+    def _start_browser(self, worker_id):
+        for attempt in range(1, 4):
+            try:
+                options = {'recycle_every': self.recycle_every, 'max_rss_mb': self.max_rss_mb}
+                if self.lean:
+                    options['lean'] = True
+                if self.reuse_session:
+                    options['reuse_session'] = True
+                if self.archive is not None:
+                    options['archive'] = self.archive
+                return self.lookup_class(headless=self.headless, **options)
+            except Exception as e:
+                self._log(f"[worker {worker_id}] browser start failed (attempt {attempt}): {str(e)[:100]}")
+                time.sleep(attempt * 2)
+        return None
+
+    def _recycle(self, worker_id, lookup):
+        self._log(f"[worker {worker_id}] browser crashed, restarting")
+        self._close(worker_id, lookup)
+        with self._lock:
+            self.restarts += 1
+        return self._start_browser(worker_id)
+
+    def _close(self, worker_id, lookup):
+        if getattr(lookup, 'lean', None):
+            self._log(f"[worker {worker_id}] {lookup.lean.summary()}")
+        if getattr(lookup, 'health', None):
+            self._log(f"[worker {worker_id}] {lookup.health.report()}")
+        try:
+            lookup.close()
+        except Exception:
+            pass
+
+    def _log(self, message):
+        with self._lock:
+            print(message, flush=True)
+
+    def _worker(self, worker_id, work, results, total):
+        lookup = self._start_browser(worker_id)
+        if lookup is None:
+            self._log(f"[worker {worker_id}] giving up, no browser available")
+            return
+
+        try:
+            while not past_deadline(self.deadline):
+                try:
+                    idx, summons, attempt = work.get_nowait()
+                except queue.Empty:
+                    break
+
+                trial = self.breaker.wait()
+                result = timed_lookup(self.controller, lookup.lookup_summons, summons)
+
+                if result.get('status') == 'ERROR' and driver_is_dead(lookup, result):
+                    self.breaker.end_trial(trial)
+                    lookup = self._recycle(worker_id, lookup)
+                    if attempt < self.max_attempts:
+                        work.put((idx, summons, attempt + 1))
+                        if lookup is None:
+                            break
+                        continue
+                elif is_retryable(result):
+                    # Transient site failure - back off like lookup_with_retry, then send it to the back of the queue
+                    self.breaker.record_failure(trial)
+                    if attempt < self.max_attempts:
+                        time.sleep(self.retry_policy.backoff(attempt))
+                        work.put((idx, summons, attempt + 1))
+                        continue
+                elif result.get('status') != 'ERROR':
+                    self.breaker.record_success()
+                else:
+                    self.breaker.end_trial(trial)
+
+                if attempt > 1:
+                    result['attempts'] = attempt
+
+                result['row_number'] = idx + 4
+                results[idx] = result
+                if self.journal is not None:
+                    self.journal.record(result)
+                self._log(f"[{len(results)}/{total}] {summons} (worker {worker_id}): {result.get('status')}")
+
+                if lookup is None:
+                    break
+        finally:
+            if lookup is not None:
+                self._close(worker_id, lookup)
+
+    def _run_workers(self, work, results, total):
+        threads = [
+            threading.Thread(target=self._worker, args=(worker_id, work, results, total), daemon=True)
+            for worker_id in range(1, min(self.workers, work.qsize()) + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def lookup_batch(self, summons_list):
+        """Look up all summons across the pool, returning results in input order"""
+        total = len(summons_list)
+        work = queue.Queue()
+        for idx, summons in enumerate(summons_list, 1):
+            work.put((idx, summons, 1))
+
+        results = {}
+        print(f"\nStarting pooled lookup of {total} summons with {self.workers} browsers...")
+        print("=" * 60)
+        self._run_workers(work, results, total)
+
+        # Summons that still failed transiently get one more round at the end
+        failed = [idx for idx in sorted(results) if is_retryable(results[idx])]
+        if failed and not past_deadline(self.deadline):
+            print(f"\nRequeueing {len(failed)} failed summons...")
+            for idx in failed:
+                work.put((idx, results[idx]['summons_number'], 1))
+            self._run_workers(work, results, total)
+            for idx in failed:
+                results[idx]['requeued'] = True
+
+        # Anything left over means the time budget ran out, or every browser died before finishing the queue
+        left = [idx for idx in range(1, total + 1) if idx not in results]
+        if left and past_deadline(self.deadline):
+            print(f"\nTime budget used up - {len(left)} summons left for the next run")
+            left = []
+        for idx in left:
+            results[idx] = {
+                'summons_number': summons_list[idx - 1],
+                'row_number': idx + 4,
+                'status': 'ERROR',
+                'error': 'No browser available to process summons'
+            }
+
+        print(self.controller.summary())
+        if self.restarts:
+            print(f"\n[OK] Pool finished with {self.restarts} browser restart(s)")
+
+        return [results[idx] for idx in sorted(results)]
+
+
+def lookup_batch_pool(summons_list, workers=3, headless=True, delay=3, journal=None, lean=False,
+                      reuse_session=False, recycle_every=200, max_rss_mb=None, archive=None, deadline=None):
+    """Pooled equivalent of SummonsSeleniumLookup.lookup_batch"""
+    pool = SeleniumPool(workers=workers, headless=headless, delay=delay, journal=journal, lean=lean,
+                        reuse_session=reuse_session, recycle_every=recycle_every, max_rss_mb=max_rss_mb,
+                        archive=archive, deadline=deadline)
+    return pool.lookup_batch(summons_list)
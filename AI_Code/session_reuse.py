@@ -0,0 +1,94 @@
+"""
+Warm browser session for the Selenium engines
+The search page is loaded once per driver; every later summons is searched by
+POSTing that page's own form (hidden fields and cookies included) with an
+in-page fetch() and reading the response tables in the browser, so a lookup
+costs one network round trip instead of two full page renders. The page is
+only reloaded when the form is gone or the session has expired
+"""
+
+from datetime import datetime
+
+from dom_extract import COLLECT_SECTIONS_FN
+from rate_control import BLOCKED_MARKERS
+from result_parser import NOT_FOUND_MARKER, build_result
+from site_config import SEARCH_HOME_URL
+
+
+SEARCH_URL = SEARCH_HOME_URL
+SUMMONS_FIELD = "searchViolationObject.violationNo"
+NO_FORM = 'Search form not on page'
+
+# Submit the search form from inside the page and return the parsed result sections
+SESSION_SEARCH_JS = COLLECT_SECTIONS_FN + """
+var summons = arguments[0], field = arguments[1], marker = arguments[2], blockedMarkers = arguments[3];
+var keepHtml = arguments[4];
+var done = arguments[arguments.length - 1];
+
+var input = document.querySelector('[name="' + field + '"]');
+if (!input || !input.form) {
+    done({no_form: true});
+    return;
+}
+var form = input.form;
+var data = new URLSearchParams(new FormData(form));
+data.set(field, summons);
+var button = form.querySelector("input[type=submit][value*='Search']");
+if (button && button.name) { data.set(button.name, button.value); }
+
+fetch(form.action, {method: 'POST', body: data, credentials: 'same-origin'})
+    .then(function (response) {
+        return response.text().then(function (html) {
+            var doc = new DOMParser().parseFromString(html, 'text/html');
+            var lower = html.toLowerCase();
+            done({
+                http_status: response.status,
+                blocked: blockedMarkers.some(function (m) { return lower.indexOf(m) !== -1; }),
+                has_results: !!doc.querySelector('#vioContent, #infraDetails'),
+                sections: collectSections(doc, marker),
+                html: keepHtml ? html : null
+            });
+        });
+    })
+    .catch(function (e) { done({error: String(e)}); });
+"""
+
+
+def session_search(driver, summons_number, on_page=None):
+    """
+    Search one summons through the warm page
+
+    Args:
+        on_page: Optional callback given the raw HTML of a usable result page
+
+    Returns:
+        (result, None) when the response was a usable page, or (None, reason) when
+        the caller should reload the search page / fall back to a full lookup
+    """
+    out = driver.execute_async_script(SESSION_SEARCH_JS, str(summons_number), SUMMONS_FIELD,
+                                      NOT_FOUND_MARKER, list(BLOCKED_MARKERS), on_page is not None)
+    if out.get('no_form'):
+        return None, NO_FORM
+    if out.get('error'):
+        return None, f"In-page fetch failed: {out['error'][:100]}"
+
+    status = out.get('http_status')
+    if status == 429 or (status or 0) >= 500 or out.get('blocked'):
+        # Throttling is not a session problem - report it so retry/back-off handles it
+        error = 'Blocked by server (captcha or throttle page)' if out.get('blocked') else f'HTTP {status}'
+        return {
+            'summons_number': summons_number,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'status': 'ERROR',
+            'error': error
+        }, None
+    if status != 200:
+        return None, f'HTTP {status}'
+
+    sections = out['sections']
+    if not sections.get('not_found') and not out.get('has_results'):
+        return None, 'Session expired (no result sections in response)'
+
+    if on_page is not None and out.get('html'):
+        on_page(out['html'])
+    return build_result(sections, summons_number), None
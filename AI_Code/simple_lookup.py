@@ -6,14 +6,15 @@ Use this if you just want to test or lookup a few summons numbers
 import requests
 from bs4 import BeautifulSoup
 import json
+from site_config import SEARCH_HOME_URL, SEARCH_URL
 
 def lookup_summons(summons_number):
     """Look up a single summons number"""
-    url = "https://a820-ecbticketfinder.nyc.gov/getViolationbyID.action"
+    url = SEARCH_URL
 
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Referer': 'https://a820-ecbticketfinder.nyc.gov/searchHome.action',
+        'Referer': SEARCH_HOME_URL,
         'Content-Type': 'application/x-www-form-urlencoded'
     }
 
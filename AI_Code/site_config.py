@@ -0,0 +1,20 @@
+"""
+Ticket finder location and local storage shared by every lookup engine
+Set TICKETFINDER_BASE_URL to point the engines somewhere else, e.g. the local
+stand-in server (mock_ticketfinder.py):
+
+    set TICKETFINDER_BASE_URL=http://127.0.0.1:8766
+
+SUMMONS_CACHE_DIR moves the result cache, run journals and driver cache
+(default: AI_Code/.summons_cache), e.g. to keep benchmark runs separate
+"""
+
+import os
+from pathlib import Path
+
+
+BASE_URL = os.environ.get('TICKETFINDER_BASE_URL', 'https://a820-ecbticketfinder.nyc.gov').rstrip('/')
+SEARCH_HOME_URL = f'{BASE_URL}/searchHome.action'
+SEARCH_URL = f'{BASE_URL}/getViolationbyID.action'
+
+CACHE_DIR = Path(os.environ.get('SUMMONS_CACHE_DIR') or Path(__file__).resolve().parent / '.summons_cache')
@@ -6,15 +6,18 @@ Automatically queries summons information from NYC OATH website
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-import time
 import json
 from datetime import datetime
 import os
+from rate_control import AdaptiveRateController, looks_blocked
+from retry import CircuitBreaker, lookup_with_retry, requeue_errors
+from site_config import BASE_URL
+from tracking_sheet import find_summons_column, read_summons
 
 
 class SummonsLookup:
     def __init__(self):
-        self.base_url = "https://a820-ecbticketfinder.nyc.gov"
+        self.base_url = BASE_URL
         self.search_url = f"{self.base_url}/getViolationbyID.action"
         self.session = requests.Session()
         # Set headers to mimic a browser
@@ -26,24 +29,34 @@ class SummonsLookup:
             'Content-Type': 'application/x-www-form-urlencoded'
         })
 
+    def post_search(self, summons_number, timeout=30):
+        """
+        POST a search for one summons and return the raw response
+        """
+        data = {
+            'searchType': 'violationNumber',
+            'violationNumber': str(summons_number).strip(),
+            'searchBtn': 'Search'
+        }
+        return self.session.post(self.search_url, data=data, timeout=timeout)
+
     def lookup_summons(self, summons_number):
         """
         Look up a single summons by number
         """
         try:
-            # Prepare the POST data
-            data = {
-                'searchType': 'violationNumber',
-                'violationNumber': str(summons_number).strip(),
-                'searchBtn': 'Search'
-            }
-
             print(f"Looking up summons: {summons_number}")
 
             # Make the POST request
-            response = self.session.post(self.search_url, data=data, timeout=30)
+            response = self.post_search(summons_number)
 
-            if response.status_code == 200:
+            if response.status_code == 200 and looks_blocked(response.text):
+                return {
+                    'summons_number': summons_number,
+                    'status': 'ERROR',
+                    'error': 'Blocked by server (captcha or throttle page)'
+                }
+            elif response.status_code == 200:
                 return self.parse_response(response.text, summons_number)
             else:
                 return {
@@ -102,22 +115,27 @@ class SummonsLookup:
         result['status'] = 'SUCCESS'
         return result
 
-    def lookup_batch(self, summons_list, delay=2):
+    def lookup_batch(self, summons_list, delay=2, controller=None, retry_policy=None):
         """
-        Look up multiple summons with a delay between requests
+        Look up multiple summons, paced by an adaptive rate controller
+
+        Args:
+            delay: Starting delay between requests (adapts to server health)
+            controller: Optional shared AdaptiveRateController
+            retry_policy: Optional retry.RetryPolicy for transient failures
         """
+        controller = controller or AdaptiveRateController(initial_delay=delay)
+        breaker = CircuitBreaker()
         results = []
         total = len(summons_list)
 
         for idx, summons in enumerate(summons_list, 1):
             print(f"Processing {idx}/{total}: {summons}")
-            result = self.lookup_summons(summons)
+            result = lookup_with_retry(self.lookup_summons, summons, controller, retry_policy, breaker)
             results.append(result)
 
-            # Add delay to avoid overwhelming the server
-            if idx < total:
-                time.sleep(delay)
-
+        requeue_errors(results, self.lookup_summons, controller, retry_policy, breaker)
+        print(controller.summary())
         return results
 
     def save_results(self, results, output_file='summons_results.xlsx'):
@@ -148,33 +166,9 @@ def read_summons_from_excel(file_path, column_name=None):
     Returns:
         List of summons numbers
     """
-    df = pd.read_excel(file_path)
-
-    print(f"Columns found in file: {list(df.columns)}")
-
-    if column_name:
-        if column_name in df.columns:
-            summons_list = df[column_name].dropna().tolist()
-        else:
-            raise ValueError(f"Column '{column_name}' not found in Excel file")
-    else:
-        # Try to auto-detect the column with summons numbers
-        possible_columns = [col for col in df.columns if
-                          any(keyword in col.lower() for keyword in
-                              ['summons', 'violation', 'ticket', 'notice', 'number'])]
-
-        if possible_columns:
-            print(f"Auto-detected summons column: {possible_columns[0]}")
-            summons_list = df[possible_columns[0]].dropna().tolist()
-        else:
-            # Use first column
-            print("Using first column for summons numbers")
-            summons_list = df.iloc[:, 0].dropna().tolist()
-
-    # Clean the summons numbers
-    summons_list = [str(s).strip() for s in summons_list if str(s).strip() and str(s).lower() != 'nan']
-
-    return summons_list
+    # Only the header row is read to pick the column, then just that column is streamed
+    column, _ = find_summons_column(file_path, column_name)
+    return read_summons(file_path, column=column, first_row=2)
 
 
 def main():
@@ -0,0 +1,384 @@
+"""
+Typed summons record - parsed once, used everywhere
+Balances are Decimal, dates are date objects, the status is an enum and the
+charges are a list of Charge objects instead of charge_1_code, charge_2_code...
+
+The flat result dict (what the engines write to Excel, JSON, journals and the
+cache) stays the storage format: SummonsRecord.from_result() reads one and
+to_result() writes it back key for key, in the same order, so existing files
+load unchanged. The keys are a `layout` tuple shared by every record with the
+same keys and `values` lines up with it: the text of labels without a typed
+attribute, and of typed ones only when it is not in the usual form
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+from typing import List, Optional
+
+import pandas as pd
+
+
+TERMINAL_RESULTS = ('DISMISSED',)
+CLOSED_STATUS_WORDS = ('PAID', 'CLOSED', 'SATISFIED')
+
+DATE_FORMAT = '%m/%d/%Y'
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+DATE_FIELDS = ('date_issued', 'hearing_date')
+MONEY_FIELDS = ('balance_due',)
+CHARGE_KEY_RE = re.compile(r'^charge_(?:(\d+)_)?(code|section|description|face_amount)$')
+
+# Marks a value that lives in a typed attribute (keeps the key order)
+_TYPED = object()
+_CHARGES = '_charges'
+
+# Result key order, shared by every record with the same keys, and each layout's key -> position
+_LAYOUTS = {}
+_LAYOUT_INDEXES = {}
+
+
+class LookupStatus(str, Enum):
+    SUCCESS = 'SUCCESS'
+    FOUND = 'FOUND'  # batch_lookup.py
+    NOT_FOUND = 'NOT_FOUND'
+    NO_DATA = 'NO_DATA'
+    UNKNOWN = 'UNKNOWN'
+    ERROR = 'ERROR'
+
+    @classmethod
+    def parse(cls, value):
+        try:
+            return cls(str(value).strip().upper())
+        except ValueError:
+            return cls.UNKNOWN
+
+
+def parse_money(value):
+    """'$1,250.00' -> Decimal('1250.00'); None if blank or not a number"""
+    if value is None:
+        return None
+    text = str(value).replace('$', '').replace(',', '').strip()
+    if not text:
+        return None
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        return None
+
+
+def format_money(amount, zero_without_sign=True):
+    """The ticket finder's own format: '0.00' for nothing owed, '$1250.00' otherwise"""
+    if amount == 0 and zero_without_sign:
+        return f'{amount:.2f}'
+    return f'${amount:.2f}'
+
+
+def parse_date(value, fmt=DATE_FORMAT):
+    """'06/08/2026' -> date(2026, 6, 8); None if missing or malformed"""
+    try:
+        return datetime.strptime(str(value).strip(), fmt).date()
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class Charge:
+    number: int
+    code: Optional[str] = None
+    section: Optional[str] = None
+    description: Optional[str] = None
+    face_amount: Optional[Decimal] = None
+    face_text: Optional[str] = None  # Original text when it is not in the usual '$500.00' form
+
+    def flat(self, prefix):
+        out = {}
+        for name in ('code', 'section', 'description'):
+            value = getattr(self, name)
+            if value is not None:
+                out[f'{prefix}{name}'] = value
+        if self.face_text is not None:
+            out[f'{prefix}face_amount'] = self.face_text
+        elif self.face_amount is not None:
+            out[f'{prefix}face_amount'] = format_money(self.face_amount, zero_without_sign=False)
+        return out
+
+
+@dataclass(slots=True)
+class SummonsRecord:
+    summons_number: str
+    status: LookupStatus = LookupStatus.UNKNOWN
+    fetched_at: Optional[datetime] = None
+    date_issued: Optional[date] = None
+    hearing_date: Optional[date] = None
+    balance_due: Optional[Decimal] = None
+    charges: List[Charge] = field(default_factory=list)
+    numbered_charges: bool = False
+    layout: tuple = ()
+    values: tuple = ()
+
+    @classmethod
+    def from_result(cls, result):
+        """Build a record from a flat result dict (engine output or a loaded results file)"""
+        record = cls(summons_number=str(result.get('summons_number', '')).strip())
+        layout, values = [], []
+        charges = {}
+        for key, value in result.items():
+            if CHARGE_KEY_RE.match(key):
+                number, name = CHARGE_KEY_RE.match(key).groups()
+                if number is not None:
+                    record.numbered_charges = True
+                charge = charges.setdefault(int(number or 1), Charge(int(number or 1)))
+                if name == 'face_amount':
+                    charge.face_amount = parse_money(value)
+                    if charge.face_amount is None or format_money(charge.face_amount, False) != value:
+                        charge.face_text = value
+                else:
+                    setattr(charge, name, value)
+                if _CHARGES not in layout:
+                    layout.append(_CHARGES)
+                    values.append(_TYPED)
+                continue
+            if key == 'summons_number':
+                stored = _TYPED if str(value) == record.summons_number else value
+            elif key == 'status':
+                record.status = LookupStatus.parse(value)
+                stored = _TYPED if record.status.value == value else value
+            elif key == 'timestamp':
+                record.fetched_at = _parse_timestamp(value)
+                canonical = record.fetched_at is not None and record.fetched_at.strftime(TIMESTAMP_FORMAT) == value
+                stored = _TYPED if canonical else value
+            else:
+                stored = record._parse_field(key, value)
+            layout.append(key)
+            values.append(stored)
+        record.charges = [charges[n] for n in sorted(charges)]
+        record.layout = _shared_layout(layout)
+        record.values = tuple(values)
+        return record
+
+    @classmethod
+    def from_sections(cls, sections, summons_number, button_text=(), not_found_note=None):
+        """Build a record from result_parser.collect_sections() output"""
+        record = cls(summons_number=summons_number, fetched_at=datetime.now().replace(microsecond=0))
+
+        if sections['not_found']:
+            record.status = LookupStatus.NOT_FOUND
+            record.layout = _shared_layout(('summons_number', 'timestamp', 'status', 'note'))
+            record.values = (_TYPED, _TYPED, _TYPED, not_found_note)
+            return record
+
+        # Label -> value; a repeated label keeps its first place
+        scraped = {'summons_number': _TYPED, 'timestamp': _TYPED}
+        for section in ('case', 'details'):
+            for label, value in sections[section]:
+                label = label.replace(':', '')
+                if not (label and value and len(label) < 100):
+                    continue
+                # Filter out button text
+                if section == 'details' and any(btn in value for btn in button_text):
+                    continue
+                key = label.lower().replace(' ', '_').replace('/', '_')
+                scraped[key] = record._parse_field(key, value)
+
+        charge_rows = sections['charges']
+        record.numbered_charges = len(charge_rows) > 1
+        for idx, cells in enumerate(charge_rows, 1):
+            if cells and len(cells) >= 3:
+                face = parse_money(cells[3]) if len(cells) > 3 else None
+                charge = Charge(idx, cells[0], cells[1].replace('\\xa0', ' '), cells[2], face)
+                if len(cells) > 3 and (face is None or format_money(face, False) != cells[3]):
+                    charge.face_text = cells[3]
+                record.charges.append(charge)
+        if record.charges:
+            scraped[_CHARGES] = _TYPED
+
+        # Same rule as always: found if anything beyond the number and timestamp was read
+        record.layout, record.values = tuple(scraped), tuple(scraped.values())
+        record.status = LookupStatus.SUCCESS if len(record.to_result()) > 3 else LookupStatus.NO_DATA
+        scraped['status'] = _TYPED
+        record.layout, record.values = _shared_layout(scraped), tuple(scraped.values())
+        return record
+
+    def set_field(self, key, value):
+        """Store one scraped label/value, parsed when it has a typed attribute (a repeated label keeps its place)"""
+        stored = self._parse_field(key, value)
+        idx = _layout_index(self.layout).get(key)
+        if idx is None:
+            self.layout = _shared_layout(self.layout + (key,))
+            self.values += (stored,)
+        else:
+            self.values = self.values[:idx] + (stored,) + self.values[idx + 1:]
+
+    def _parse_field(self, key, value):
+        """Set the typed attribute for a date/money label; returns what to keep in `values`"""
+        if key in DATE_FIELDS:
+            parsed = parse_date(value)
+            canonical = parsed is not None and parsed.strftime(DATE_FORMAT) == value
+        elif key in MONEY_FIELDS:
+            parsed = parse_money(value)
+            canonical = parsed is not None and format_money(parsed) == value
+        else:
+            return value
+        setattr(self, key, parsed)
+        # Keep the original text only when writing the parsed value back would change it
+        return _TYPED if canonical else value
+
+    def to_result(self):
+        """The flat result dict, exactly as the engines have always written it"""
+        result = {}
+        for key, value in zip(self.layout, self.values):
+            if value is not _TYPED:
+                result[key] = value
+            elif key == _CHARGES:
+                for charge in self.charges:
+                    prefix = f'charge_{charge.number}_' if self.numbered_charges else 'charge_'
+                    result.update(charge.flat(prefix))
+            elif key == 'summons_number':
+                result[key] = self.summons_number
+            elif key == 'status':
+                result[key] = self.status.value
+            elif key == 'timestamp':
+                result[key] = self.fetched_at.strftime(TIMESTAMP_FORMAT)
+            elif key in DATE_FIELDS:
+                result[key] = getattr(self, key).strftime(DATE_FORMAT)
+            else:
+                result[key] = format_money(getattr(self, key))
+        return result
+
+    def has(self, key):
+        """True if the result had this key (typed or not)"""
+        return key in _layout_index(self.layout)
+
+    def get(self, key, default=None):
+        """Untyped label by its result key (e.g. 'hearing_result', 'respondent_name')"""
+        idx = _layout_index(self.layout).get(key)
+        if idx is None or self.values[idx] is _TYPED:
+            return default
+        return self.values[idx]
+
+    @property
+    def found(self):
+        return self.status in (LookupStatus.SUCCESS, LookupStatus.FOUND)
+
+    @property
+    def balance(self):
+        """Balance owed as Decimal (0 when missing)"""
+        return self.balance_due if self.balance_due is not None else Decimal(0)
+
+    @property
+    def hearing_at(self):
+        """Hearing date as a datetime at midnight (for comparing with now)"""
+        return datetime.combine(self.hearing_date, time()) if self.hearing_date else None
+
+    @property
+    def hearing_result(self):
+        return str(self.get('hearing_result', '')).strip().upper()
+
+    @property
+    def notice_status(self):
+        return str(self.get('status_of_summons_notice', '')).strip().upper()
+
+    @property
+    def closed(self):
+        return any(word in self.notice_status for word in CLOSED_STATUS_WORDS)
+
+    def state(self, now=None):
+        """
+        Classify for caching and scheduling
+
+        Returns:
+            'terminal', 'open', 'pending', 'not_found' or 'error'
+        """
+        if self.status == LookupStatus.NOT_FOUND:
+            return 'not_found'
+        if not self.found:
+            return 'error'
+
+        now = now or datetime.now()
+        hearing_at = self.hearing_at
+        upcoming = hearing_at is not None and hearing_at >= now
+
+        if self.hearing_result in TERMINAL_RESULTS:
+            return 'terminal'
+        if upcoming:
+            return 'pending'
+        if self.closed:
+            return 'terminal'
+        if not self.hearing_result or self.hearing_result == 'RESCHEDULED':
+            return 'pending'
+        if self.has('balance_due') and self.balance == 0:
+            return 'terminal'
+        return 'open'
+
+    def is_settled(self):
+        """DISMISSED, or paid/closed with a zero balance"""
+        if not self.found:
+            return False
+        if self.hearing_result in TERMINAL_RESULTS:
+            return True
+        return self.closed and self.has('balance_due') and self.balance == 0
+
+
+def _shared_layout(keys):
+    keys = tuple(keys)
+    layout = _LAYOUTS.get(keys)
+    if layout is None:
+        layout = _LAYOUTS[keys] = keys
+        _LAYOUT_INDEXES[layout] = {key: idx for idx, key in enumerate(layout)}
+    return layout
+
+
+def _layout_index(layout):
+    index = _LAYOUT_INDEXES.get(layout)
+    return index if index is not None else _LAYOUT_INDEXES[_shared_layout(layout)]
+
+
+def _parse_timestamp(value):
+    try:
+        return datetime.strptime(str(value).strip(), TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def as_record(result):
+    """SummonsRecord for either a record or a flat result dict"""
+    return result if isinstance(result, SummonsRecord) else SummonsRecord.from_result(result)
+
+
+def as_result(result):
+    """Flat result dict for either a record or a flat result dict"""
+    return result.to_result() if isinstance(result, SummonsRecord) else result
+
+
+def load_records(path):
+    """Records from a results .json/.xlsx file"""
+    from scheduler import load_results_file
+    return [SummonsRecord.from_result(r) for r in load_results_file(path)]
+
+
+def records_frame(records):
+    """
+    DataFrame for the analyzers: the flat result columns plus typed ones, so
+    nothing has to re-parse dates or balances
+
+    Added columns: hearing_date_parsed (datetime64), date_issued_parsed,
+    balance_numeric (float) and, for multi-charge summons, charge_code /
+    charge_description of the first charge
+    """
+    rows = []
+    for record in records:
+        row = record.to_result()
+        row['hearing_date_parsed'] = record.hearing_at
+        row['date_issued_parsed'] = datetime.combine(record.date_issued, time()) if record.date_issued else None
+        row['balance_numeric'] = float(record.balance)
+        if record.charges and 'charge_code' not in row:
+            row['charge_code'] = record.charges[0].code
+            row['charge_description'] = record.charges[0].description
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    for column in ('hearing_date_parsed', 'date_issued_parsed'):
+        if column in df:
+            df[column] = pd.to_datetime(df[column])
+    return df
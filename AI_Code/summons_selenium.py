@@ -4,7 +4,6 @@ Automates the manual process of looking up summons on the NYC website
 """
 
 import pandas as pd
-import time
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -15,19 +14,46 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 import json
+from driver_resolver import start_with_driver
+from rate_control import AdaptiveRateController
+from retry import CircuitBreaker, lookup_with_retry, requeue_errors
+from page_waits import wait_for_results, latency_summary
+from lean_browsing import lean_options, start_lean_browsing
+from dom_extract import extract_results_js
+from driver_health import DriverHealth
+from site_config import SEARCH_HOME_URL
+from tracking_sheet import read_summons_from_excel
 
 
 class SummonsSeleniumLookup:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, page_timeout=10, lean=False, extract_mode='elements',
+                 recycle_every=200, max_rss_mb=None):
         """
         Initialize the browser
 
         Args:
             headless: If True, runs browser in background without opening window
+            page_timeout: Ceiling in seconds to wait for the search form or results
+            lean: Block images, CSS, fonts and analytics via DevTools and report what it saved
+            extract_mode: 'elements' walks the tables with find_elements (original
+                behaviour), 'js' collects them with one injected script
+            recycle_every: Restart the browser after this many lookups (None = never)
+            max_rss_mb: Restart the browser when its processes use more memory than this
         """
+        self.headless = headless
+        self.page_timeout = page_timeout
+        self.use_lean = lean
+        self.extract_mode = extract_mode
+        self.health = DriverHealth(recycle_every=recycle_every, max_rss_mb=max_rss_mb)
+        self.lean = None
+        self._start_driver()
+
+    def _start_driver(self):
+        """Start Chrome (or Edge as a fallback) with the options chosen in __init__"""
+        headless = self.headless
+        lean = self.use_lean
+        page_timeout = self.page_timeout
         chrome_options = Options()
 
         if headless:
@@ -37,16 +63,16 @@ class SummonsSeleniumLookup:
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        if lean:
+            lean_options(chrome_options)
 
         # Initialize the driver
         print("Setting up browser driver...")
         try:
             # Try to use cached driver first to avoid network issues
-            import os
-            os.environ['WDM_LOCAL'] = '1'  # Use local cache
-            service = ChromeService(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.wait = WebDriverWait(self.driver, 10)
+            self.driver = start_with_driver(
+                'chrome', lambda path: webdriver.Chrome(service=ChromeService(path), options=chrome_options))
+            self.wait = WebDriverWait(self.driver, page_timeout)
             print("[OK] Chrome browser initialized")
         except Exception as e:
             print(f"Chrome failed: {str(e)[:100]}")
@@ -57,26 +83,65 @@ class SummonsSeleniumLookup:
                     edge_options.add_argument('--headless')
                 edge_options.add_argument('--disable-blink-features=AutomationControlled')
                 edge_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+                if lean:
+                    lean_options(edge_options)
 
-                service = EdgeService(EdgeChromiumDriverManager().install())
-                self.driver = webdriver.Edge(service=service, options=edge_options)
-                self.wait = WebDriverWait(self.driver, 10)
+                self.driver = start_with_driver(
+                    'edge', lambda path: webdriver.Edge(service=EdgeService(path), options=edge_options))
+                self.wait = WebDriverWait(self.driver, page_timeout)
                 print("[OK] Edge browser initialized")
             except Exception as e2:
                 raise Exception(f"Could not initialize any browser. Chrome error: {str(e)[:100]}, Edge error: {str(e2)[:100]}")
 
+        # A hung page load should fail and trigger a restart, not block for minutes
+        self.driver.set_page_load_timeout(page_timeout * 3)
+
+        if lean and self.lean is None:
+            self.lean = start_lean_browsing(self.driver, SEARCH_HOME_URL)
+        elif lean:
+            # Restarted browser - keep the run's totals and baseline
+            self.lean.driver = self.driver
+            self.lean.enable()
+
+    def restart(self, reason):
+        """
+        Replace the browser with a fresh one
+        """
+        print(f"[restarting browser: {reason}]", end=' ', flush=True)
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.health.recycled(reason)
+        try:
+            self._start_driver()
+        except Exception as e:
+            # Next lookup fails with a dead-driver error and tries again
+            print(f"[restart failed: {str(e)[:100]}]", end=' ')
+
     def lookup_summons(self, summons_number):
         """
-        Look up a single summons number
+        Look up a single summons number, restarting the browser when it
+        crashes, hangs or grows past the memory ceiling
+        """
+        result = self.lookup_page(summons_number)
+        reason = self.health.check(self, result)
+        if reason:
+            self.restart(reason)
+            if result.get('status') == 'ERROR':
+                result = self.lookup_page(summons_number)
+                self.health.check(self, result)
+        return result
+
+    def lookup_page(self, summons_number):
+        """
+        One lookup with the current browser
         """
         try:
             # Navigate to the search page
-            url = "https://a820-ecbticketfinder.nyc.gov/searchHome.action"
+            url = SEARCH_HOME_URL
             self.driver.get(url)
 
-            # Wait for page to load
-            time.sleep(1)
-
             # Find the summons number input field
             # Try different possible selectors
             summons_input = None
@@ -130,13 +195,22 @@ class SummonsSeleniumLookup:
                 }
 
             # Click search
+            if self.lean:
+                self.lean.measure()
             search_button.click()
 
             # Wait for results to load
-            time.sleep(2)
+            state, seconds = wait_for_results(self.driver, self.page_timeout)
+            if self.lean:
+                self.lean.measure()
 
             # Extract the results
-            return self.extract_results(summons_number)
+            result = self.extract_results(summons_number)
+            result['page_ready_ms'] = round(seconds * 1000)
+            if state == 'TIMEOUT' and result.get('status') != 'SUCCESS':
+                result['status'] = 'ERROR'
+                result['error'] = f'Result page not ready after {self.page_timeout}s'
+            return result
 
         except Exception as e:
             return {
@@ -149,6 +223,12 @@ class SummonsSeleniumLookup:
         """
         Extract violation details from the results page
         """
+        if self.extract_mode == 'js':
+            try:
+                return extract_results_js(self.driver, summons_number)
+            except Exception as e:
+                print(f"[JS extraction failed, reading elements: {str(e)[:60]}]", end=' ')
+
         result = {
             'summons_number': summons_number,
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -198,14 +278,19 @@ class SummonsSeleniumLookup:
             result['error'] = str(e)
             return result
 
-    def lookup_batch(self, summons_list, delay=3):
+    def lookup_batch(self, summons_list, delay=3, journal=None, controller=None, retry_policy=None):
         """
         Look up multiple summons numbers
 
         Args:
             summons_list: List of summons numbers
-            delay: Seconds to wait between lookups (default 3)
+            delay: Starting seconds between lookups (default 3); adapts to server health
+            journal: Optional checkpoint.RunJournal; each result is appended as soon as it is known
+            controller: Optional shared rate_control.AdaptiveRateController
+            retry_policy: Optional retry.RetryPolicy for transient failures
         """
+        controller = controller or AdaptiveRateController(initial_delay=delay)
+        breaker = CircuitBreaker()
         results = []
         total = len(summons_list)
 
@@ -215,7 +300,7 @@ class SummonsSeleniumLookup:
         for idx, summons in enumerate(summons_list, 1):
             print(f"[{idx}/{total}] Processing: {summons}", end=' ')
 
-            result = self.lookup_summons(summons)
+            result = lookup_with_retry(self.lookup_summons, summons, controller, retry_policy, breaker)
             result['row_number'] = idx + 4  # Excel row number (assuming data starts at row 5)
 
             if result.get('status') == 'SUCCESS':
@@ -228,11 +313,15 @@ class SummonsSeleniumLookup:
                 print(f"[ERROR] {result.get('error', 'UNKNOWN ERROR')}")
 
             results.append(result)
-
-            # Add delay between requests
-            if idx < total:
-                time.sleep(delay)
-
+            if journal is not None:
+                journal.record(result)
+
+        requeue_errors(results, self.lookup_summons, controller, retry_policy, breaker,
+                       on_result=journal.record if journal is not None else None)
+        print(controller.summary())
+        if self.lean:
+            print(self.lean.summary())
+        print(self.health.report())
         return results
 
     def close(self):
@@ -242,20 +331,6 @@ class SummonsSeleniumLookup:
             print("\n[OK] Browser closed")
 
 
-def read_summons_from_excel(file_path='ML TRACKING.xlsx'):
-    """
-    Read summons from column B, starting at row 5
-    """
-    print(f"Reading summons from {file_path}...")
-    df = pd.read_excel(file_path, header=None)
-
-    # Column B is index 1, row 5 is index 4
-    summons_list = df.iloc[4:, 1].dropna().astype(str).str.strip().tolist()
-
-    print(f"Found {len(summons_list)} summons")
-    return summons_list
-
-
 def save_results(results, filename_prefix='summons_results'):
     """
     Save results to Excel and JSON
@@ -299,6 +374,12 @@ def print_summary(results):
         for r in active:
             print(f"  {r['summons_number']}: ${r.get('balance_due', 'unknown')}")
 
+    # Show how long result pages actually took to render
+    latency = latency_summary(results)
+    if latency:
+        count, avg_ms, p95_ms = latency
+        print(f"\nPage-ready latency ({count} lookups): avg {avg_ms:.0f} ms, p95 {p95_ms:.0f} ms")
+
 
 def main():
     """
@@ -15,15 +15,54 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from bs4 import BeautifulSoup
 import json
+from driver_resolver import start_with_driver
+from rate_control import AdaptiveRateController
+from retry import CircuitBreaker, lookup_with_retry, past_deadline, requeue_errors
+from result_parser import has_result_sections, parse_result_html
+from dom_extract import extract_results_js
+from page_waits import wait_for_results, latency_summary
+from lean_browsing import lean_options, start_lean_browsing
+from driver_health import DriverHealth
+from session_reuse import SEARCH_URL, SUMMONS_FIELD, NO_FORM, session_search
+from summons_record import LookupStatus, as_record, as_result
+from tracking_sheet import read_summons_from_excel
 
 
 class SummonsSeleniumLookup:
-    def __init__(self, headless=False):
-        """Initialize the browser"""
+    def __init__(self, headless=False, page_timeout=10, lean=False, extract_mode='js', reuse_session=False,
+                 recycle_every=200, max_rss_mb=None, archive=None):
+        """Initialize the browser
+
+        Args:
+            headless: Run the browser without a window
+            page_timeout: Ceiling in seconds to wait for the search form or results
+            lean: Block images, CSS, fonts and analytics via DevTools and report what it saved
+            extract_mode: 'js' reads the result tables with one injected script,
+                'html' parses the full page_source with result_parser
+            reuse_session: Keep the search page loaded and submit later searches
+                from inside it (one round trip each), reloading only when the session expires
+            recycle_every: Restart the browser after this many lookups (None = never)
+            max_rss_mb: Restart the browser when its processes use more memory than this
+            archive: Optional html_archive.HtmlArchive; every result page is stored in it
+                (the page source is then read and parsed instead of using 'js' extraction)
+        """
+        self.headless = headless
+        self.page_timeout = page_timeout
+        self.use_lean = lean
+        self.extract_mode = extract_mode
+        self.reuse_session = reuse_session
+        self.session_stats = {'reused': 0, 'reloads': 0}
+        self.health = DriverHealth(recycle_every=recycle_every, max_rss_mb=max_rss_mb)
+        self.archive = archive
+        self.lean = None
+        self._start_driver()
+
+    def _start_driver(self):
+        """Start Chrome (or Edge as a fallback) with the options chosen in __init__"""
+        headless = self.headless
+        lean = self.use_lean
+        page_timeout = self.page_timeout
         chrome_options = Options()
 
         if headless:
@@ -32,14 +71,14 @@ class SummonsSeleniumLookup:
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        if lean:
+            lean_options(chrome_options)
 
         print("Setting up browser driver...")
         try:
-            import os
-            os.environ['WDM_LOCAL'] = '1'
-            service = ChromeService(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.wait = WebDriverWait(self.driver, 10)
+            self.driver = start_with_driver(
+                'chrome', lambda path: webdriver.Chrome(service=ChromeService(path), options=chrome_options))
+            self.wait = WebDriverWait(self.driver, page_timeout)
             print("[OK] Chrome browser initialized")
         except Exception as e:
             print(f"Chrome failed: {str(e)[:100]}")
@@ -50,35 +89,116 @@ class SummonsSeleniumLookup:
                     edge_options.add_argument('--headless')
                 edge_options.add_argument('--disable-blink-features=AutomationControlled')
                 edge_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+                if lean:
+                    lean_options(edge_options)
 
-                service = EdgeService(EdgeChromiumDriverManager().install())
-                self.driver = webdriver.Edge(service=service, options=edge_options)
-                self.wait = WebDriverWait(self.driver, 10)
+                self.driver = start_with_driver(
+                    'edge', lambda path: webdriver.Edge(service=EdgeService(path), options=edge_options))
+                self.wait = WebDriverWait(self.driver, page_timeout)
                 print("[OK] Edge browser initialized")
             except Exception as e2:
                 raise Exception(f"Could not initialize any browser. Chrome error: {str(e)[:100]}, Edge error: {str(e2)[:100]}")
 
+        # A hung page load should fail and trigger a restart, not block for minutes
+        self.driver.set_page_load_timeout(page_timeout * 3)
+
+        if lean and self.lean is None:
+            self.lean = start_lean_browsing(self.driver, SEARCH_URL)
+        elif lean:
+            # Restarted browser - keep the run's totals and baseline
+            self.lean.driver = self.driver
+            self.lean.enable()
+
+    def restart(self, reason):
+        """Replace the browser with a fresh one"""
+        print(f"[restarting browser: {reason}]", end=' ', flush=True)
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.health.recycled(reason)
+        try:
+            self._start_driver()
+        except Exception as e:
+            # Next lookup fails with a dead-driver error and tries again
+            print(f"[restart failed: {str(e)[:100]}]", end=' ')
+
+    def warm_session(self):
+        """Load the search page that later in-page searches are submitted from"""
+        self.driver.get(SEARCH_URL)
+        self.wait.until(EC.presence_of_element_located((By.NAME, SUMMONS_FIELD)))
+        self.driver.set_script_timeout(self.page_timeout)
+        if self.lean:
+            self.lean.measure()
+
+    def session_lookup(self, summons_number):
+        """Search from the warm page; returns None when a full page lookup is needed"""
+        start = time.perf_counter()
+        try:
+            on_page = None
+            if self.archive is not None:
+                on_page = lambda html: self.archive.store(summons_number, html, source='session')
+            result, reason = session_search(self.driver, summons_number, on_page)
+            if reason == NO_FORM:
+                self.warm_session()
+                result, reason = session_search(self.driver, summons_number, on_page)
+        except Exception as e:
+            result, reason = None, f'In-page search failed: {str(e)[:100]}'
+
+        if result is None:
+            self.session_stats['reloads'] += 1
+            print(f"[session reload: {reason}]", end=' ')
+            return None
+
+        self.session_stats['reused'] += 1
+        result['page_ready_ms'] = round((time.perf_counter() - start) * 1000)
+        return result
+
     def lookup_summons(self, summons_number):
-        """Look up a single summons number"""
+        """Look up a single summons number, restarting the browser when it crashes, hangs or grows too large"""
+        result = self.lookup_page(summons_number)
+        reason = self.health.check(self, result)
+        if reason:
+            self.restart(reason)
+            if result.get('status') == 'ERROR':
+                result = self.lookup_page(summons_number)
+                self.health.check(self, result)
+        return result
+
+    def lookup_page(self, summons_number):
+        """One lookup with the current browser"""
+        if self.reuse_session:
+            result = self.session_lookup(summons_number)
+            if result is not None:
+                return result
+
         try:
-            url = "https://a820-ecbticketfinder.nyc.gov/searchHome.action"
+            url = SEARCH_URL
             self.driver.get(url)
-            time.sleep(1)
 
             # Find and fill summons input
             summons_input = self.wait.until(
-                EC.presence_of_element_located((By.NAME, "searchViolationObject.violationNo"))
+                EC.presence_of_element_located((By.NAME, SUMMONS_FIELD))
             )
             summons_input.clear()
             summons_input.send_keys(str(summons_number))
 
             # Click search button
             search_button = self.driver.find_element(By.CSS_SELECTOR, "input[value*='Search']")
+            if self.lean:
+                self.lean.measure()
             search_button.click()
 
-            time.sleep(2)
+            state, seconds = wait_for_results(self.driver, self.page_timeout)
+            if self.lean:
+                self.lean.measure()
 
-            return self.extract_results(summons_number)
+            result = self.extract_results(summons_number)
+            result['page_ready_ms'] = round(seconds * 1000)
+            if state == 'TIMEOUT' and result.get('status') != 'SUCCESS':
+                result['status'] = 'ERROR'
+                result['error'] = f'Result page not ready after {self.page_timeout}s'
+            return result
 
         except Exception as e:
             return {
@@ -88,97 +208,41 @@ class SummonsSeleniumLookup:
             }
 
     def extract_results(self, summons_number):
-        """Extract ALL violation details using BeautifulSoup"""
-        result = {
-            'summons_number': summons_number,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+        """Extract ALL violation details (one execute_script call, or page_source + the HTML parser)"""
+        if self.extract_mode == 'js':
+            # The archive gets the fetched page from the same script call, so archiving costs no extra round trip
+            on_page = None
+            if self.archive is not None:
+                on_page = lambda html: self.archive.store(summons_number, html, source='browser')
+            try:
+                return extract_results_js(self.driver, summons_number, on_page=on_page)
+            except Exception as e:
+                print(f"[JS extraction failed, using page source: {str(e)[:60]}]", end=' ')
 
         try:
-            # Get full page source
             html = self.driver.page_source
+        except Exception as e:
+            return {
+                'summons_number': summons_number,
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'status': 'ERROR',
+                'error': str(e)
+            }
 
-            # Check for "No Record Available"
-            if "No Record Available" in html:
-                result['status'] = 'NOT_FOUND'
-                result['note'] = 'No Record Available'
-                return result
-
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Extract from Case Details table (id="vioContent")
-            case_details = soup.find('table', {'id': 'vioContent'})
-            if case_details:
-                rows = case_details.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 2:
-                        label = cells[0].get_text(strip=True).replace(':', '')
-                        value = cells[1].get_text(strip=True)
-                        if label and value and len(label) < 100:
-                            key = label.lower().replace(' ', '_').replace('/', '_')
-                            result[key] = value
-
-            # Extract from More Details table (all tables with id="details")
-            details_tables = soup.find_all('table', {'id': 'details'})
-            for table in details_tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 2:
-                        label = cells[0].get_text(strip=True).replace(':', '')
-                        value = cells[1].get_text(strip=True)
-                        if label and value and len(label) < 100:
-                            key = label.lower().replace(' ', '_').replace('/', '_')
-                            # Filter out button text
-                            if not any(btn in value for btn in ['Hearing Locations', 'One Click', 'How To Pay']):
-                                result[key] = value
-
-            # Extract Explanation of Charges (even if hidden)
-            charges_div = soup.find('div', {'id': 'infraDetails'})
-            if charges_div:
-                charges_table = charges_div.find('table')
-                if charges_table:
-                    # Get headers
-                    headers = []
-                    header_row = charges_table.find('tr')
-                    if header_row:
-                        headers = [th.get_text(strip=True).lower().replace(' ', '_')
-                                 for th in header_row.find_all('th')]
-
-                    # Get charge data
-                    charge_rows = charges_table.find_all('tr')[1:]  # Skip header
-                    for idx, row in enumerate(charge_rows, 1):
-                        cells = row.find_all('td')
-                        if cells and len(cells) >= 3:
-                            # Create prefixed keys for each charge
-                            prefix = f"charge_{idx}_" if len(charge_rows) > 1 else "charge_"
-
-                            if len(cells) > 0:
-                                result[f'{prefix}code'] = cells[0].get_text(strip=True)
-                            if len(cells) > 1:
-                                result[f'{prefix}section'] = cells[1].get_text(strip=True).replace('\\xa0', ' ')
-                            if len(cells) > 2:
-                                result[f'{prefix}description'] = cells[2].get_text(strip=True)
-                            if len(cells) > 3:
-                                result[f'{prefix}face_amount'] = cells[3].get_text(strip=True)
-
-            # Set status
-            if len(result) > 3:
-                result['status'] = 'SUCCESS'
-            else:
-                result['status'] = 'NO_DATA'
-
-            return result
+        if self.archive is not None and has_result_sections(html):
+            self.archive.store(summons_number, html, source='browser')
+        return parse_result_html(html, summons_number)
 
-        except Exception as e:
-            result['status'] = 'ERROR'
-            result['error'] = str(e)
-            return result
+    def lookup_batch(self, summons_list, delay=3, journal=None, controller=None, retry_policy=None, deadline=None):
+        """
+        Look up multiple summons numbers
 
-    def lookup_batch(self, summons_list, delay=3):
-        """Look up multiple summons numbers"""
+        Args:
+            deadline: Optional time.monotonic() after which no new summons are started;
+                summons not reached are left out of the results
+        """
+        controller = controller or AdaptiveRateController(initial_delay=delay)
+        breaker = CircuitBreaker()
         results = []
         total = len(summons_list)
 
@@ -186,9 +250,12 @@ class SummonsSeleniumLookup:
         print("=" * 60)
 
         for idx, summons in enumerate(summons_list, 1):
+            if past_deadline(deadline):
+                print(f"\nTime budget used up - {total - idx + 1} summons left for the next run")
+                break
             print(f"[{idx}/{total}] Processing: {summons}", end=' ')
 
-            result = self.lookup_summons(summons)
+            result = lookup_with_retry(self.lookup_summons, summons, controller, retry_policy, breaker)
             result['row_number'] = idx + 4
 
             if result.get('status') == 'SUCCESS':
@@ -203,10 +270,18 @@ class SummonsSeleniumLookup:
                 print(f"[ERROR] {result.get('error', 'UNKNOWN ERROR')}")
 
             results.append(result)
-
-            if idx < total:
-                time.sleep(delay)
-
+            if journal is not None:
+                journal.record(result)
+
+        requeue_errors(results, self.lookup_summons, controller, retry_policy, breaker,
+                       on_result=journal.record if journal is not None else None, deadline=deadline)
+        print(controller.summary())
+        if self.lean:
+            print(self.lean.summary())
+        print(self.health.report())
+        if self.reuse_session:
+            print(f"Session reuse: {self.session_stats['reused']} in-page searches, "
+                  f"{self.session_stats['reloads']} full page lookups")
         return results
 
     def close(self):
@@ -216,18 +291,10 @@ class SummonsSeleniumLookup:
             print("\n[OK] Browser closed")
 
 
-def read_summons_from_excel(file_path='ML TRACKING.xlsx'):
-    """Read summons from column B, starting at row 5"""
-    print(f"Reading summons from {file_path}...")
-    df = pd.read_excel(file_path, header=None)
-    summons_list = df.iloc[4:, 1].dropna().astype(str).str.strip().tolist()
-    print(f"Found {len(summons_list)} summons")
-    return summons_list
-
-
 def save_results(results, filename_prefix='summons_results_v2'):
-    """Save results to Excel and JSON"""
+    """Save results (flat dicts or SummonsRecords) to Excel and JSON"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    results = [as_result(r) for r in results]
 
     df = pd.DataFrame(results)
     excel_file = f'{filename_prefix}_{timestamp}.xlsx'
@@ -247,23 +314,27 @@ def print_summary(results):
     print("\n" + "=" * 60)
     print("SUMMARY")
     print("=" * 60)
-    print(f"Total processed: {len(results)}")
-    print(f"Found: {sum(1 for r in results if r.get('status') == 'SUCCESS')}")
-    print(f"Not found: {sum(1 for r in results if r.get('status') == 'NOT_FOUND')}")
-    print(f"Errors: {sum(1 for r in results if r.get('status') == 'ERROR')}")
+    records = [as_record(r) for r in results]
+    print(f"Total processed: {len(records)}")
+    print(f"Found: {sum(1 for r in records if r.status == LookupStatus.SUCCESS)}")
+    print(f"Not found: {sum(1 for r in records if r.status == LookupStatus.NOT_FOUND)}")
+    print(f"Errors: {sum(1 for r in records if r.status == LookupStatus.ERROR)}")
 
-    active = [r for r in results if r.get('status') == 'SUCCESS' and
-              'balance_due' in r and
-              r['balance_due'] not in ['0.00', '$0.00', '0']]
+    active = [r for r in records if r.status == LookupStatus.SUCCESS and r.balance > 0]
 
     if active:
         print(f"\n[WARNING] ACTIVE SUMMONS WITH BALANCE ({len(active)}):")
         for r in active[:10]:  # Show first 10
-            hearing = r.get('hearing_date', 'No date')
-            print(f"  {r['summons_number']}: ${r.get('balance_due', 'unknown')} - Hearing: {hearing}")
+            hearing = r.hearing_date.strftime('%m/%d/%Y') if r.hearing_date else r.get('hearing_date', 'No date')
+            print(f"  {r.summons_number}: ${r.balance:,.2f} - Hearing: {hearing}")
         if len(active) > 10:
             print(f"  ... and {len(active) - 10} more")
 
+    latency = latency_summary(results)
+    if latency:
+        count, avg_ms, p95_ms = latency
+        print(f"\nPage-ready latency ({count} lookups): avg {avg_ms:.0f} ms, p95 {p95_ms:.0f} ms")
+
 
 def main():
     """Main function"""
@@ -0,0 +1,45 @@
+"""Tests for change detection between runs (python -m pytest AI_Code)"""
+
+import unittest
+
+from change_detect import changed_results, detect_changes, has_changes
+
+
+def result(summons, **fields):
+    return {'summons_number': summons, 'status': 'SUCCESS', 'timestamp': '2026-01-03 00:45:26',
+            'hearing_result': 'IN VIOLATION', 'hearing_date': '01/05/2026', 'balance_due': '$500.00', **fields}
+
+
+class DetectChangesTest(unittest.TestCase):
+    def setUp(self):
+        self.previous = [result('0000000001'), result('0000000002'), result('0000000003')]
+
+    def test_new_changed_and_unchanged(self):
+        report = detect_changes(self.previous, [
+            result('0000000001', timestamp='2026-02-01 09:00:00'),
+            result('0000000002', balance_due='$750.00'),
+            result('0000000004'),
+        ])
+        self.assertEqual(report['unchanged'], 1)
+        self.assertEqual([r['summons_number'] for r in report['new']], ['0000000004'])
+        self.assertEqual(report['changed'][0]['fields'], {'balance_due': ['$500.00', '$750.00']})
+        self.assertEqual([r['summons_number'] for r in changed_results(report)], ['0000000004', '0000000002'])
+
+    def test_cached_and_errored_results_are_unchecked(self):
+        report = detect_changes(self.previous, [
+            result('0000000001', balance_due='$0.00', from_cache=True),
+            {'summons_number': '0000000002', 'status': 'ERROR', 'error': 'timeout'},
+        ])
+        self.assertEqual(report['unchecked'], 2)
+        self.assertFalse(has_changes(report))
+
+    def test_gone_only_against_the_sheet(self):
+        results = [result('0000000001')]
+        # A partial export says nothing about the summons it leaves out
+        self.assertEqual(detect_changes(self.previous, results)['disappeared'], [])
+        gone = detect_changes(self.previous, results, ['0000000001', '0000000002'])['disappeared']
+        self.assertEqual([r['summons_number'] for r in gone], ['0000000003'])
+
+
+if __name__ == '__main__':
+    unittest.main()
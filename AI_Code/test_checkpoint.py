@@ -0,0 +1,53 @@
+"""Tests for the crash-safe run journal and --resume (python -m pytest AI_Code)"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from checkpoint import RunJournal
+
+SUMMONS = ['0000000001', '0000000002', '0000000003']
+
+
+class RunJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.runs_dir = Path(self.tmp.name)
+
+    def interrupted_run(self):
+        journal = RunJournal.start(SUMMONS, self.runs_dir, script='run_enhanced')
+        journal.record({'summons_number': '0000000001', 'status': 'SUCCESS'})
+        journal.record({'summons_number': '0000000002', 'status': 'ERROR', 'error': 'timeout'})
+        return journal
+
+    def test_resume_skips_completed_and_retries_errors(self):
+        self.interrupted_run()
+        journal = RunJournal.resume_or_start(SUMMONS, resume=True, runs_dir=self.runs_dir, script='run_enhanced')
+        self.assertEqual(journal.pending(SUMMONS), ['0000000002', '0000000003'])
+
+    def test_cut_off_last_line_is_ignored(self):
+        path = self.interrupted_run().path
+        with path.open('a', encoding='utf-8') as f:
+            f.write('{"type": "result", "result": {"summons_nu')
+        journal = RunJournal(path)
+        self.assertEqual(list(journal.completed), ['0000000001'])
+        journal.record({'summons_number': '0000000003', 'status': 'NOT_FOUND'})
+        self.assertEqual(list(RunJournal(path).completed), ['0000000001', '0000000003'])
+
+    def test_finished_or_other_runs_are_not_resumed(self):
+        self.interrupted_run().finish()
+        self.assertIsNone(RunJournal.latest_unfinished(SUMMONS, self.runs_dir, script='run_enhanced'))
+        self.interrupted_run()
+        self.assertIsNone(RunJournal.latest_unfinished(SUMMONS, self.runs_dir, script='run_NOW'))
+        self.assertIsNone(RunJournal.latest_unfinished(SUMMONS[:2], self.runs_dir, script='run_enhanced'))
+
+    def test_results_in_sheet_order(self):
+        journal = self.interrupted_run()
+        results = journal.results_for(SUMMONS, fresh=[{'summons_number': '0000000003', 'status': 'SUCCESS'}])
+        self.assertEqual([r['status'] for r in results], ['SUCCESS', 'ERROR', 'SUCCESS'])
+        self.assertEqual([r['row_number'] for r in results], [5, 6, 7])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for driver resolution after a browser update (python -m pytest AI_Code)"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import driver_resolver
+from driver_resolver import resolve_driver, start_with_driver
+
+
+class RefreshTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.cache_path = root / 'drivers.json'
+        self.stale = self.add_driver(root, '120.0.6099.109')
+        self.downloaded = str(root / 'downloaded' / 'chromedriver')
+        Path(self.downloaded).parent.mkdir()
+        Path(self.downloaded).write_text('')
+        self.download = mock.Mock(return_value=self.downloaded)
+        patches = [
+            mock.patch.dict(os.environ, {'CHROMEDRIVER_PATH': ''}),
+            mock.patch.object(driver_resolver, 'wdm_driver_dirs', return_value=[root / 'drivers']),
+            mock.patch.object(driver_resolver.shutil, 'which', return_value=None),
+            mock.patch.object(driver_resolver, 'browser_major_version', return_value=131),
+            mock.patch.object(driver_resolver, '_download_driver', self.download),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def add_driver(self, root, version):
+        path = root / 'drivers' / 'chromedriver' / 'linux64' / version / 'chromedriver'
+        path.parent.mkdir(parents=True)
+        path.write_text('')
+        return str(path)
+
+    def test_plain_resolve_reuses_local_driver(self):
+        self.assertEqual(resolve_driver('chrome', cache_path=self.cache_path), self.stale)
+        self.download.assert_not_called()
+
+    def test_refresh_downloads_when_local_driver_is_for_an_older_browser(self):
+        resolve_driver('chrome', cache_path=self.cache_path)
+        self.assertEqual(resolve_driver('chrome', refresh=True, cache_path=self.cache_path), self.downloaded)
+        # The new driver is remembered for the next start
+        self.assertEqual(resolve_driver('chrome', cache_path=self.cache_path), self.downloaded)
+
+    def test_refresh_reuses_a_matching_local_driver(self):
+        matching = self.add_driver(Path(self.tmp.name), '131.0.6778.85')
+        self.assertEqual(resolve_driver('chrome', refresh=True, cache_path=self.cache_path), matching)
+        self.download.assert_not_called()
+
+    def test_failed_start_retries_with_matching_driver(self):
+        def start(path):
+            if path == self.stale:
+                raise RuntimeError('This version of ChromeDriver only supports Chrome version 120')
+            return path
+
+        self.assertEqual(start_with_driver('chrome', start, cache_path=self.cache_path), self.downloaded)
+
+    def test_failure_with_the_right_driver_is_not_retried(self):
+        self.add_driver(Path(self.tmp.name), '131.0.6778.85')
+        start = mock.Mock(side_effect=RuntimeError('chrome crashed'))
+        with self.assertRaisesRegex(RuntimeError, 'chrome crashed'):
+            start_with_driver('chrome', start, cache_path=self.cache_path)
+        self.assertEqual(start.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
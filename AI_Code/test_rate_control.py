@@ -0,0 +1,47 @@
+"""Tests for the adaptive rate controller (python -m pytest AI_Code)"""
+
+import unittest
+
+from rate_control import AdaptiveRateController
+
+
+class AdaptiveRateControllerTest(unittest.TestCase):
+    def test_healthy_responses_speed_up(self):
+        controller = AdaptiveRateController(initial_delay=2.0, min_delay=0.5)
+        for _ in range(30):
+            controller.record(0.3)
+        self.assertEqual(controller.delay, 0.5)
+        self.assertEqual(controller.backoffs, 0)
+
+    def test_throttle_backs_off(self):
+        controller = AdaptiveRateController(initial_delay=1.0)
+        controller.record(0.3, ok=False, throttled=True)
+        self.assertEqual(controller.delay, 2.0)
+        self.assertEqual(controller.throttles, 1)
+
+    def test_slow_response_backs_off(self):
+        controller = AdaptiveRateController(initial_delay=1.0)
+        for _ in range(5):
+            controller.record(0.3)
+        controller.record(3.0)
+        self.assertEqual(controller.backoffs, 1)
+
+    def test_settles_when_site_stays_slower(self):
+        controller = AdaptiveRateController(initial_delay=1.0)
+        for _ in range(20):
+            controller.record(0.3)
+        for _ in range(200):
+            controller.record(3.0)
+        self.assertLessEqual(controller.backoffs, controller.max_slow_backoffs)
+        self.assertAlmostEqual(controller.typical_latency, 3.0, places=2)
+        self.assertEqual(controller.delay, controller.min_delay)
+
+    def test_repeated_throttling_still_reaches_max_delay(self):
+        controller = AdaptiveRateController(initial_delay=1.0, max_delay=30.0)
+        for _ in range(20):
+            controller.record(0.3, ok=False, throttled=True)
+        self.assertEqual(controller.delay, 30.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
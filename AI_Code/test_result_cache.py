@@ -0,0 +1,75 @@
+"""Tests for the lookup cache and its per-state TTLs (python -m pytest AI_Code)"""
+
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import result_cache
+from result_cache import DAY, HOUR, ResultCache, record_state
+
+
+def result(summons, **fields):
+    return {'summons_number': summons, 'status': 'SUCCESS', **fields}
+
+
+PAST = (datetime.now() - timedelta(days=30)).strftime('%m/%d/%Y')
+SOON = (datetime.now() + timedelta(days=30)).strftime('%m/%d/%Y')
+
+RESULTS = {
+    'terminal': result('0000000001', hearing_date=PAST, hearing_result='DISMISSED', balance_due='0.00'),
+    'open': result('0000000002', hearing_date=PAST, hearing_result='IN VIOLATION', balance_due='$500.00'),
+    'pending': result('0000000003', hearing_date=SOON),
+    'not_found': {'summons_number': '0000000004', 'status': 'NOT_FOUND'},
+    'error': {'summons_number': '0000000005', 'status': 'ERROR', 'error': 'timeout'},
+}
+
+
+class RecordStateTest(unittest.TestCase):
+    def test_states(self):
+        for state, res in RESULTS.items():
+            with self.subTest(state=state):
+                self.assertEqual(record_state(res), state)
+
+    def test_paid_off_is_terminal(self):
+        paid = result('0000000006', hearing_date=PAST, hearing_result='IN VIOLATION',
+                      status_of_summons_notice='PAID IN FULL', balance_due='0.00')
+        self.assertEqual(record_state(paid), 'terminal')
+
+
+class CacheTtlTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = ResultCache(Path(self.tmp.name) / 'cache.sqlite')
+        self.addCleanup(self.cache.close)
+        self.now = time.time()
+        self.cache.put_many(RESULTS.values(), fetched_at=[self.now] * len(RESULTS))
+
+    def fresh_after(self, seconds, max_age=None):
+        with mock.patch.object(result_cache.time, 'time', return_value=self.now + seconds):
+            return {state: self.cache.get(res['summons_number'], max_age=max_age) is not None
+                    for state, res in RESULTS.items()}
+
+    def test_expiry_by_state(self):
+        self.assertEqual(self.fresh_after(HOUR), {
+            'terminal': True, 'open': True, 'pending': True, 'not_found': True, 'error': False})
+        self.assertEqual(self.fresh_after(2 * DAY), {
+            'terminal': True, 'open': True, 'pending': False, 'not_found': False, 'error': False})
+        self.assertEqual(self.fresh_after(30 * DAY), {
+            'terminal': True, 'open': False, 'pending': False, 'not_found': False, 'error': False})
+
+    def test_max_age_caps_long_ttls(self):
+        self.assertFalse(self.fresh_after(2 * DAY, max_age=DAY)['terminal'])
+
+    def test_hit_is_marked_and_stored_ignores_age(self):
+        with mock.patch.object(result_cache.time, 'time', return_value=self.now):
+            self.assertTrue(self.cache.get('0000000002')['from_cache'])
+        self.assertIsNone(self.cache.stored('0000000005'))
+        self.assertEqual(self.cache.stored('0000000003').state(), 'pending')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Tests for retry classification, the circuit breaker and pool retries (python -m pytest AI_Code)"""
+
+import unittest
+from unittest import mock
+
+import selenium_pool
+from rate_control import AdaptiveRateController
+from retry import CircuitBreaker, RetryPolicy, is_retryable
+from selenium_pool import SeleniumPool
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def open_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=0.0)
+        breaker.record_failure()
+        breaker.record_failure()
+        return breaker
+
+    def test_in_flight_failures_do_not_extend_cooldown(self):
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=60.0)
+        for _ in range(10):
+            breaker.record_failure()
+        self.assertEqual(breaker.cooldown, 60.0)
+        self.assertEqual(breaker.trips, 1)
+
+    def test_half_open_allows_one_trial(self):
+        breaker = self.open_breaker()
+        self.assertEqual(breaker.reserve(), (0.0, True))
+        pause, trial = breaker.reserve()
+        self.assertGreater(pause, 0)
+        self.assertFalse(trial)
+
+    def test_failed_trial_doubles_cooldown(self):
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0.0)
+        breaker.record_failure()
+        breaker.cooldown = 1.0
+        breaker.opened_at -= 1.0
+        _, trial = breaker.reserve()
+        breaker.record_failure(trial)
+        self.assertEqual(breaker.cooldown, 2.0)
+
+    def test_successful_trial_closes(self):
+        breaker = self.open_breaker()
+        _, trial = breaker.reserve()
+        breaker.record_success(trial)
+        self.assertEqual(breaker.reserve(), (0.0, False))
+
+
+class RetryableTest(unittest.TestCase):
+    def test_site_connection_errors_are_retryable(self):
+        error = "HTTPSConnectionPool(host='a820-ecbticketfinder.nyc.gov', port=443): Connection reset by peer"
+        self.assertTrue(is_retryable({'status': 'ERROR', 'error': error}))
+
+    def test_dead_local_driver_is_not_retryable(self):
+        error = "HTTPConnectionPool(host='localhost', port=52114): Max retries exceeded (Connection refused)"
+        self.assertFalse(is_retryable({'status': 'ERROR', 'error': error}))
+
+
+class FlakyLookup:
+    """Times out on the first try of each summons"""
+    tried = set()
+
+    def __init__(self, headless=True, **options):
+        self.driver = mock.Mock(current_url='about:blank')
+
+    def lookup_summons(self, summons):
+        if summons not in FlakyLookup.tried:
+            FlakyLookup.tried.add(summons)
+            return {'summons_number': summons, 'status': 'ERROR', 'error': 'Timed out waiting for results'}
+        return {'summons_number': summons, 'status': 'SUCCESS'}
+
+    def close(self):
+        pass
+
+
+class PoolRetryTest(unittest.TestCase):
+    def test_pool_backs_off_before_requeueing(self):
+        FlakyLookup.tried = set()
+        policy = RetryPolicy(max_attempts=3, base_delay=2.0)
+        pool = SeleniumPool(workers=1, delay=0, lookup_class=FlakyLookup, retry_policy=policy,
+                            controller=AdaptiveRateController(initial_delay=0.0, min_delay=0.0))
+        with mock.patch.object(selenium_pool.time, 'sleep') as sleep, \
+                mock.patch.object(policy, 'backoff', return_value=1.5) as backoff:
+            results = pool.lookup_batch(['0000000001', '0000000002'])
+        self.assertEqual([r['status'] for r in results], ['SUCCESS', 'SUCCESS'])
+        self.assertEqual([r['attempts'] for r in results], [2, 2])
+        self.assertEqual(backoff.call_args_list, [mock.call(1), mock.call(1)])
+        sleep.assert_has_calls([mock.call(1.5), mock.call(1.5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
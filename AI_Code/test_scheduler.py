@@ -0,0 +1,92 @@
+"""Tests for lookup ordering and --budget (python -m pytest AI_Code)"""
+
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import selenium_pool
+from rate_control import AdaptiveRateController
+from scheduler import budget_arg, budget_deadline, plan_batch, priority, schedule, skipped_results
+from selenium_pool import SeleniumPool
+from summons_record import SummonsRecord
+
+
+def record(summons, **fields):
+    return SummonsRecord.from_result({'summons_number': summons, 'status': 'SUCCESS', **fields})
+
+
+class ScheduleTest(unittest.TestCase):
+    def setUp(self):
+        soon = (datetime.now() + timedelta(days=3)).strftime('%m/%d/%Y')
+        later = (datetime.now() + timedelta(days=60)).strftime('%m/%d/%Y')
+        self.known = {
+            '1': record('0000000001', hearing_result='DISMISSED', balance_due='0.00'),
+            '2': record('0000000002', hearing_date=later),
+            '3': record('0000000003', hearing_result='IN VIOLATION', balance_due='$500.00'),
+            '4': record('0000000004', hearing_date=soon),
+            '5': record('0000000005', hearing_result='DEFAULTED', balance_due='$1250.00'),
+        }
+        self.sheet = ['0000000001', '0000000002', '0000000003', '0000000004', '0000000005', '0000000006']
+
+    def test_most_urgent_first(self):
+        # Hearing soon, then open balances (largest first), new, later hearing, dismissed
+        self.assertEqual(schedule(self.sheet, self.known), [
+            '0000000004', '0000000005', '0000000003', '0000000006', '0000000002', '0000000001'])
+
+    def test_unknown_summons_is_tier_two(self):
+        self.assertEqual(priority(None), (2, 0))
+
+    def test_count_budget_cuts_the_plan(self):
+        to_look_up, skipped = plan_batch(self.sheet, self.known, budget_arg('2'))
+        self.assertEqual(to_look_up, ['0000000004', '0000000005'])
+        self.assertEqual(len(skipped), 4)
+
+    def test_time_budget_is_not_cut_up_front(self):
+        to_look_up, skipped = plan_batch(self.sheet, self.known, budget_arg('10m'))
+        self.assertEqual(len(to_look_up), 6)
+        self.assertEqual(skipped, [])
+
+    def test_time_budget_preview_estimates_the_cut(self):
+        to_look_up, _ = plan_batch(self.sheet, self.known, budget_arg('6s'), estimate_time=True)
+        self.assertEqual(len(to_look_up), 2)
+
+    def test_budget_deadline(self):
+        self.assertIsNone(budget_deadline(None))
+        self.assertIsNone(budget_deadline(budget_arg('150')))
+        self.assertAlmostEqual(budget_deadline(budget_arg('2m')), time.monotonic() + 120, delta=1)
+
+    def test_skipped_keep_last_known_result(self):
+        skipped = skipped_results(['0000000003', '0000000006'], self.known)
+        self.assertEqual(skipped[0]['balance_due'], '$500.00')
+        self.assertEqual(skipped[1]['status'], 'ERROR')
+        self.assertTrue(all(r['from_cache'] and r['skipped_by_budget'] for r in skipped))
+
+
+class FakeLookup:
+    calls = 0
+
+    def __init__(self, headless=True, **options):
+        self.driver = mock.Mock(current_url='about:blank')
+
+    def lookup_summons(self, summons):
+        FakeLookup.calls += 1
+        return {'summons_number': summons, 'status': 'SUCCESS'}
+
+    def close(self):
+        pass
+
+
+class PoolDeadlineTest(unittest.TestCase):
+    def test_pool_stops_taking_summons_after_the_deadline(self):
+        FakeLookup.calls = 0
+        pool = SeleniumPool(workers=1, delay=0, lookup_class=FakeLookup, deadline=0.0,
+                            controller=AdaptiveRateController(initial_delay=0.0, min_delay=0.0))
+        # The deadline passes once three lookups are done
+        with mock.patch.object(selenium_pool, 'past_deadline', lambda deadline: FakeLookup.calls >= 3):
+            results = pool.lookup_batch([f'000000000{n}' for n in range(1, 9)])
+        self.assertEqual([r['summons_number'] for r in results], ['0000000001', '0000000002', '0000000003'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,19 @@
 """Quick test of a single summons"""
 from summons_selenium import SummonsSeleniumLookup
+from lookup_service import lookup_via_service
 import json
 
 print("Testing with summons: 0703792522")
+
+# A running lookup_service.py answers in about a second with a warm browser
+result = lookup_via_service('0703792522')
+if result is not None:
+    print("\n" + "=" * 60)
+    print("RESULT (from lookup service):")
+    print("=" * 60)
+    print(json.dumps(result, indent=2))
+    raise SystemExit
+
 print("Opening browser...")
 
 lookup = SummonsSeleniumLookup(headless=False)
@@ -0,0 +1,148 @@
+"""Tests for SummonsRecord round trips and parsing (python -m pytest AI_Code)"""
+
+import unittest
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from result_parser import BUTTON_TEXT, NOT_FOUND_MARKER, collect_sections, parse_result_html
+from scheduler import load_results_file
+from summons_record import LookupStatus, SummonsRecord
+
+HERE = Path(__file__).parent
+SAMPLE_RESULTS = HERE.parent / 'summons_results_v2_20260103_004526.xlsx'
+FIXTURES = HERE / 'fixtures' / 'ticketfinder'
+
+
+def old_build_result(sections, summons_number):
+    """The flat dict builder from before SummonsRecord (without the timestamp)"""
+    result = {'summons_number': summons_number}
+
+    if sections['not_found']:
+        result['status'] = 'NOT_FOUND'
+        result['note'] = NOT_FOUND_MARKER
+        return result
+
+    for label, value in sections['case']:
+        label = label.replace(':', '')
+        if label and value and len(label) < 100:
+            result[label.lower().replace(' ', '_').replace('/', '_')] = value
+
+    for label, value in sections['details']:
+        label = label.replace(':', '')
+        if label and value and len(label) < 100:
+            if not any(btn in value for btn in BUTTON_TEXT):
+                result[label.lower().replace(' ', '_').replace('/', '_')] = value
+
+    charge_rows = sections['charges']
+    for idx, cells in enumerate(charge_rows, 1):
+        if cells and len(cells) >= 3:
+            prefix = f"charge_{idx}_" if len(charge_rows) > 1 else "charge_"
+            result[f'{prefix}code'] = cells[0]
+            result[f'{prefix}section'] = cells[1].replace('\\xa0', ' ')
+            result[f'{prefix}description'] = cells[2]
+            if len(cells) > 3:
+                result[f'{prefix}face_amount'] = cells[3]
+
+    # The old builder counted the timestamp too
+    result['status'] = 'SUCCESS' if len(result) > 2 else 'NO_DATA'
+    return result
+
+
+def new_build_result(sections, summons_number):
+    record = SummonsRecord.from_sections(sections, summons_number, BUTTON_TEXT, NOT_FOUND_MARKER)
+    result = record.to_result()
+    del result['timestamp']
+    return result
+
+
+def sections(case=(), details=(), charges=(), not_found=False):
+    return {'not_found': not_found, 'case': list(case), 'details': list(details), 'charges': list(charges)}
+
+
+class RoundTripTest(unittest.TestCase):
+    def assertRoundTrip(self, result):
+        back = SummonsRecord.from_result(result).to_result()
+        self.assertEqual(list(back.items()), list(result.items()))
+
+    @unittest.skipUnless(SAMPLE_RESULTS.exists(), 'sample results file not present')
+    def test_sample_results_file(self):
+        results = load_results_file(str(SAMPLE_RESULTS))
+        self.assertTrue(results)
+        for result in results:
+            self.assertRoundTrip(result)
+
+    def test_fixture_pages(self):
+        for page in ('found.html', 'found_multi_charge.html', 'not_found.html'):
+            with self.subTest(page=page):
+                result = parse_result_html((FIXTURES / page).read_text(encoding='utf-8'), '0000000001')
+                self.assertRoundTrip(result)
+
+    def test_non_canonical_text_is_kept(self):
+        self.assertRoundTrip({
+            'summons_number': ' 0000000001', 'timestamp': 'yesterday', 'status': 'success',
+            'hearing_date': '6/8/2026', 'balance_due': '$1,250.00', 'charge_face_amount': 'N/A'})
+
+    def test_typed_attributes(self):
+        record = SummonsRecord.from_result({
+            'summons_number': '0000000001', 'status': 'SUCCESS', 'hearing_date': '06/08/2026',
+            'balance_due': '$1250.00', 'charge_1_code': 'A1', 'charge_1_face_amount': '$500.00',
+            'charge_2_code': 'B2', 'hearing_result': 'IN VIOLATION'})
+        self.assertEqual(record.status, LookupStatus.SUCCESS)
+        self.assertEqual(record.hearing_date, date(2026, 6, 8))
+        self.assertEqual(record.balance_due, Decimal('1250.00'))
+        self.assertEqual([c.code for c in record.charges], ['A1', 'B2'])
+        self.assertEqual(record.charges[0].face_amount, Decimal('500.00'))
+        self.assertEqual(record.get('hearing_result'), 'IN VIOLATION')
+        self.assertIsNone(record.get('balance_due'))
+        self.assertTrue(record.has('balance_due'))
+
+    def test_records_with_the_same_keys_share_a_layout(self):
+        first = SummonsRecord.from_result({'summons_number': '1', 'status': 'SUCCESS', 'note': 'a'})
+        second = SummonsRecord.from_result({'summons_number': '2', 'status': 'SUCCESS', 'note': 'b'})
+        self.assertIs(first.layout, second.layout)
+
+    def test_set_field(self):
+        record = SummonsRecord.from_result({'summons_number': '0000000001', 'status': 'SUCCESS'})
+        record.set_field('row_number', 7)
+        record.set_field('balance_due', '0.00')
+        record.set_field('row_number', 8)
+        self.assertEqual(record.balance_due, Decimal('0.00'))
+        self.assertEqual(record.to_result(), {
+            'summons_number': '0000000001', 'status': 'SUCCESS', 'row_number': 8, 'balance_due': '0.00'})
+
+
+class FromSectionsTest(unittest.TestCase):
+    def assertParity(self, collected):
+        self.assertEqual(list(new_build_result(collected, '0000000001').items()),
+                         list(old_build_result(collected, '0000000001').items()))
+
+    def test_fixture_pages(self):
+        for page in ('found.html', 'found_multi_charge.html', 'not_found.html', 'search_home.html'):
+            with self.subTest(page=page):
+                self.assertParity(collect_sections((FIXTURES / page).read_text(encoding='utf-8')))
+
+    def test_repeated_label_keeps_first_place_and_last_value(self):
+        self.assertParity(sections(
+            case=[('Hearing Date:', '06/08/2026'), ('Respondent:', 'ACME')],
+            details=[('Hearing Date:', '07/01/2026'), ('Balance Due:', '$1,250.00')]))
+
+    def test_button_text_and_long_labels_are_dropped(self):
+        self.assertParity(sections(
+            case=[('x' * 120, 'long'), ('Empty:', ''), ('Issuing Agency:', 'DOT')],
+            details=[('Hearing Location:', 'Hearing Locations'), ('Hearing Result:', 'DEFAULTED')]))
+
+    def test_charges(self):
+        self.assertParity(sections(charges=[['A1', '24-01\\xa0(a)', 'Work without permit', '$500.00']]))
+        self.assertParity(sections(charges=[['A1', '1', 'One', 'N/A'], ['B2', '2', 'Two'], ['short']]))
+
+    def test_nothing_read_is_no_data(self):
+        self.assertParity(sections())
+        self.assertEqual(new_build_result(sections(), '0000000001')['status'], 'NO_DATA')
+
+    def test_not_found(self):
+        self.assertParity(sections(not_found=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
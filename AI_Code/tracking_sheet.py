@@ -0,0 +1,176 @@
+"""
+Tracking sheet reader - summons numbers from ML TRACKING.xlsx (column B, row 5 down)
+Streams just the one column in openpyxl read-only mode instead of loading the
+whole workbook into a DataFrame, normalizes and dedupes the numbers, and
+caches the list in .summons_cache/sheets/ keyed on the file's mtime/size (and
+content hash when those change), so an unchanged sheet loads instantly
+
+    python tracking_sheet.py "../ML TRACKING.xlsx"
+    python tracking_sheet.py "Summons & Violations Tracking.xlsx" --sheet DOT --no-cache
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from site_config import CACHE_DIR
+
+
+TRACKING_FILE = 'ML TRACKING.xlsx'
+SUMMONS_COLUMN = 2  # B
+FIRST_ROW = 5
+SUMMONS_DIGITS = 10  # Excel drops the leading zero when a number is typed in as a number
+SHEET_CACHE_DIR = CACHE_DIR / 'sheets'
+HEADER_KEYWORDS = ('summons', 'violation', 'ticket', 'notice', 'number')
+
+
+def summons_key(value):
+    """Normalise a summons number so '0703792522', 703792522 and '703792522.0' match"""
+    text = str(value).strip()
+    if text.endswith('.0'):
+        text = text[:-2]
+    return text.lstrip('0') or text
+
+
+def normalize_summons(value):
+    """Summons number as text ('0703792522'); None for blank cells"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int):
+        return str(value).zfill(SUMMONS_DIGITS)
+    text = str(value).strip()
+    if text.endswith('.0') and text[:-2].isdigit():
+        text = text[:-2]
+    return text if text and text.lower() != 'nan' else None
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _open_sheet(path, sheet=None):
+    # Imported here so a cached read never pays for openpyxl
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    return workbook, workbook[sheet] if sheet else workbook.worksheets[0]
+
+
+def stream_column(path, column=SUMMONS_COLUMN, first_row=FIRST_ROW, sheet=None):
+    """Yield the raw values of one column (1-based, 2 = B) from first_row down"""
+    workbook, worksheet = _open_sheet(path, sheet)
+    try:
+        for (value,) in worksheet.iter_rows(min_row=first_row, min_col=column, max_col=column, values_only=True):
+            yield value
+    finally:
+        workbook.close()
+
+
+def find_summons_column(path, column_name=None, sheet=None):
+    """
+    Locate the summons column from the header row (row 1) only
+
+    Returns:
+        (column number, header) - the named column, else the first header that
+        looks like a summons/violation number, else the first column
+    """
+    workbook, worksheet = _open_sheet(path, sheet)
+    try:
+        headers = next(worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    finally:
+        workbook.close()
+    headers = [str(h) if h is not None else '' for h in headers]
+    print(f"Columns found in file: {headers}")
+
+    if column_name:
+        if column_name not in headers:
+            raise ValueError(f"Column '{column_name}' not found in Excel file")
+        return headers.index(column_name) + 1, column_name
+    for idx, header in enumerate(headers, 1):
+        if any(keyword in header.lower() for keyword in HEADER_KEYWORDS):
+            print(f"Auto-detected summons column: {header}")
+            return idx, header
+    print("Using first column for summons numbers")
+    return 1, headers[0] if headers else None
+
+
+def read_summons(path=TRACKING_FILE, column=SUMMONS_COLUMN, first_row=FIRST_ROW, sheet=None, use_cache=True):
+    """
+    Normalized, deduplicated summons numbers from one column of a workbook (sheet order kept)
+
+    Args:
+        column: 1-based column number (2 = B)
+        first_row: First row holding a summons number
+        sheet: Sheet name (default: the first sheet)
+        use_cache: Reuse the list read last time if the file has not changed
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = json.dumps([str(path.resolve()), sheet, column, first_row])
+    cache_file = SHEET_CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    cached = None
+    if use_cache and cache_file.exists():
+        try:
+            cached = json.loads(cache_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            cached = None
+    if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+        return cached['summons']
+
+    # Touched or copied but not edited: same content, same list
+    content_hash = _file_hash(path)
+    if cached and cached['sha256'] == content_hash:
+        summons_list = cached['summons']
+    else:
+        summons_list, seen = [], set()
+        for value in stream_column(path, column, first_row, sheet):
+            summons = normalize_summons(value)
+            if summons is None or summons_key(summons) in seen:
+                continue
+            seen.add(summons_key(summons))
+            summons_list.append(summons)
+
+    if use_cache:
+        SHEET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps({'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                                          'sha256': content_hash, 'summons': summons_list}), encoding='utf-8')
+    return summons_list
+
+
+def read_summons_from_excel(file_path=TRACKING_FILE):
+    """Read summons from column B, starting at row 5"""
+    print(f"Reading summons from {file_path}...")
+    summons_list = read_summons(file_path)
+    print(f"Found {len(summons_list)} summons")
+    return summons_list
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="List the summons numbers in a tracking workbook")
+    parser.add_argument("excel", nargs="?", default=TRACKING_FILE, help="Workbook (default: ML TRACKING.xlsx)")
+    parser.add_argument("--sheet", help="Sheet name (default: the first sheet)")
+    parser.add_argument("--column", type=int, default=SUMMONS_COLUMN, help="Column number, 2 = B")
+    parser.add_argument("--first-row", type=int, default=FIRST_ROW, help="First row with a summons number")
+    parser.add_argument("--no-cache", action="store_true", help="Read the sheet even if it has not changed")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+    summons_list = read_summons(args.excel, args.column, args.first_row, args.sheet, use_cache=not args.no_cache)
+    print(f"{len(summons_list)} summons in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for summons in summons_list:
+        print(summons)
+
+
+if __name__ == "__main__":
+    main()